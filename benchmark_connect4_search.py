@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import time
+
+from games.connect4.players.connect4_29344_v1 import connect4_29344_v1
+from games.connect4.state import Connect4State
+
+"""
+Gets random positions (that are not finished) reached by playing random moves from the empty board
+"""
+def get_positions(num_positions, min_plies, max_plies, seed):
+    generator = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        state = Connect4State()
+        for _ in range(generator.randint(min_plies, max_plies)):
+            state.update(generator.choice(state.get_possible_actions()))
+            if state.is_finished():
+                break
+        if not state.is_finished():
+            positions.append(state)
+    return positions
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the search of connect4_29344_v1 in one process with its '
+                                                 'parallel search of the root moves, at a fixed depth.')
+
+    parser.add_argument('--depth', type=int, default=9, help='Depth of the searches. Defaults to 9.')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Number of processes of the parallel search (0 uses all CPUs). Defaults to 0.')
+    parser.add_argument('--positions', type=int, default=20, help='Number of positions searched. Defaults to 20.')
+    parser.add_argument('--min-plies', type=int, default=2,
+                        help='Minimum number of random moves played to reach a position. Defaults to 2.')
+    parser.add_argument('--max-plies', type=int, default=12,
+                        help='Maximum number of random moves played to reach a position. Defaults to 12.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the positions. Defaults to 0.')
+
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count()
+    if workers < 2:
+        parser.error("The parallel search needs at least 2 workers.")
+    positions = get_positions(args.positions, args.min_plies, args.max_plies, args.seed)
+
+    serial = connect4_29344_v1('serial', depth=args.depth, opening_book=None)
+    parallel = connect4_29344_v1('parallel', depth=args.depth, opening_book=None, workers=workers)
+    # the worker processes are started before the clock runs
+    parallel.get_executor().submit(int).result()
+
+    serial_time = parallel_time = 0.0
+    mismatches = 0
+    for state in positions:
+        start_time = time.time()
+        _action, serial_score = serial.search_to_depth(state, args.depth)
+        serial_time += time.time() - start_time
+
+        start_time = time.time()
+        _action, parallel_score, _depth = parallel.search(state)
+        parallel_time += time.time() - start_time
+        # both searches are exact at the same depth, so they find the same value
+        mismatches += serial_score != parallel_score
+
+    print(f"Searched {len(positions)} positions to depth {args.depth}")
+    print(f"1 process: {serial_time:.2f}s | {serial.nodes} nodes")
+    print(f"{workers} processes: {parallel_time:.2f}s | {parallel.nodes} nodes")
+    print(f"Speedup: {serial_time / parallel_time:.2f}x | Different values: {mismatches}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm
+
+from games.connect4.opening_book import OpeningBook
+from games.connect4.players.connect4_29344_v1 import connect4_29344_v1
+from games.connect4.state import Connect4State
+from games.connect4.zobrist import ZobristKeys
+
+"""
+Gets all positions (that are not finished) reachable in up to the given number of plies from the empty board,
+without repeating the transpositions nor the mirror images of positions already found
+"""
+def get_opening_positions(num_rows, num_cols, plies):
+    positions = {}
+    frontier = [Connect4State(num_rows, num_cols)]
+    for ply in range(plies + 1):
+        next_frontier = []
+        for state in frontier:
+            key, _mirrored = state.get_canonical_key()
+            if key in positions or state.is_finished():
+                continue
+            positions[key] = state
+            if ply < plies:
+                for action in state.get_possible_actions():
+                    next_state = state.clone()
+                    next_state.update(action)
+                    next_frontier.append(next_state)
+        frontier = next_frontier
+    return list(positions.values())
+
+"""
+Searches a position with the minimax player and returns its book entry: (canonical key, (value, best move, depth)),
+with the move mirrored if the key is the one of the mirror image
+"""
+def search_position(args):
+    state, depth, time_budget, tt_size_bits = args
+    player = connect4_29344_v1('book', depth=depth, tt_size_bits=tt_size_bits, time_budget=time_budget,
+                               opening_book=None)
+    if time_budget is None:
+        # the whole root is searched to the given depth, without the time limit of a move in a game
+        best_action, best_score = player.search_to_depth(state, depth)
+        searched_depth = depth
+    else:
+        best_action, best_score, searched_depth = player.search(state)
+    key, mirrored = state.get_canonical_key()
+    best_col = ZobristKeys.mirror_col(best_action.get_col(), state.get_num_cols(), mirrored)
+    return key, (best_score, best_col, searched_depth)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the connect 4 opening book by searching the opening '
+                                                 'positions offline.')
+
+    parser.add_argument('--output', default=OpeningBook.DEFAULT_PATH,
+                        help='Path of the book to write. Defaults to the book shipped at the root of the repository.')
+    parser.add_argument('--num-rows', type=int, default=6, help='Number of rows of the board. Defaults to 6.')
+    parser.add_argument('--num-cols', type=int, default=7, help='Number of cols of the board. Defaults to 7.')
+    parser.add_argument('--plies', type=int, default=4,
+                        help='Search all positions with up to this number of checkers. Defaults to 4.')
+    parser.add_argument('--depth', type=int, default=8, help='Depth of the search of each position. Defaults to 8.')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Search each position by iterative deepening for this number of seconds instead of to '
+                             'a fixed depth.')
+    parser.add_argument('--tt-size-bits', type=int, default=20,
+                        help='The transposition table of the search has 2 ** bits entries. Defaults to 20.')
+    parser.add_argument('--import-pickle', default=None,
+                        help='Also search the positions of a legacy minimax cache, such as connect4_cache.pkl, which '
+                             'are rebuilt from the grids it holds.')
+    parser.add_argument('--extend', action=argparse.BooleanOptionalAction, default=False,
+                        help='Keep the entries of the existing book, replacing the ones that are searched again.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes searching positions (0 uses all CPUs). Defaults to 1.')
+
+    args = parser.parse_args()
+
+    entries = {}
+    if args.extend and os.path.exists(args.output):
+        book = OpeningBook(args.output)
+        if book.get_num_rows() != args.num_rows or book.get_num_cols() != args.num_cols:
+            parser.error(f"The book at {args.output} is for another board size.")
+        entries.update(book.get_entries())
+        book.close()
+
+    positions = get_opening_positions(args.num_rows, args.num_cols, args.plies)
+    if args.import_pickle is not None:
+        imported = OpeningBook.import_pickle(args.import_pickle, args.num_rows, args.num_cols)
+        print(f"Imported {len(imported)} positions from {args.import_pickle}")
+        keys = {state.get_canonical_key()[0] for state in positions}
+        for state in imported:
+            key, _mirrored = state.get_canonical_key()
+            if key not in keys:
+                keys.add(key)
+                positions.append(state)
+
+    tasks = [(state, args.depth, args.time_budget, args.tt_size_bits) for state in positions]
+    workers = args.workers or os.cpu_count()
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(tqdm(executor.map(search_position, tasks, chunksize=8), total=len(tasks),
+                                desc='Searching positions'))
+    else:
+        results = [search_position(task) for task in tqdm(tasks, desc='Searching positions')]
+
+    entries.update(results)
+    OpeningBook.write(args.output, args.num_rows, args.num_cols, entries)
+    print(f"Wrote {len(entries)} positions to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+from itertools import combinations, permutations
+
+import numpy as np
+from tqdm import tqdm
+
+from games.hlpoker.buckets import ROUND_NAMES, BucketTable, HandIndexer
+from games.hlpoker.card import NUM_CARDS
+from games.hlpoker.equity import HandEvaluator
+
+"""
+Gets a hand of each index of a round (up to suit isomorphism), as arrays of the private cards and of the board cards
+by index: every private hand on one board of each class of boards that only differ by their suits. The boards are
+enumerated in Python, which is only fast enough for the flop (1755 classes of boards)
+"""
+def get_representatives(board_size):
+    indexer = HandIndexer.get(board_size)
+    suit_permutations = list(permutations(range(4)))
+    boards = {}
+    for board in combinations(range(NUM_CARDS), board_size):
+        key = min(tuple(sorted(card & ~3 | permutation[card & 3] for card in board))
+                  for permutation in suit_permutations)
+        boards.setdefault(key, board)
+
+    private_cards = np.zeros((len(indexer), 2), dtype=np.uint8)
+    board_cards = np.zeros((len(indexer), board_size), dtype=np.uint8)
+    found = np.zeros(len(indexer), dtype=bool)
+    for board in tqdm(boards.values(), desc='Indexing hands'):
+        rest = [card for card in range(NUM_CARDS) if card not in board]
+        for private in combinations(rest, 2):
+            index = indexer.index(private, board)
+            if not found[index]:
+                found[index] = True
+                private_cards[index] = private
+                board_cards[index] = board
+    return private_cards, board_cards
+
+"""
+Computes the equity distribution of hands: their equity against random opponent hands on random runouts (the cards
+still to come), sorted, so the euclidean distance between two hands is the one between the quantiles of their
+distributions
+:returns: float32 array (number of hands, number of runouts)
+"""
+def compute_features(private_cards, board_cards, num_runouts, num_opponents, random):
+    evaluator = HandEvaluator.get()
+    num_hands = len(private_cards)
+    missing = 5 - board_cards.shape[1]
+
+    # a random order of the deck for each runout, with the known cards last
+    known = np.hstack([private_cards, board_cards]).astype(np.int64)
+    keys = random.random((num_hands, num_runouts, NUM_CARDS))
+    np.put_along_axis(keys, np.repeat(known[:, np.newaxis], num_runouts, axis=1), 2.0, axis=2)
+    runouts = np.argsort(keys, axis=2)[:, :, :missing]
+    boards = np.concatenate([np.repeat(board_cards[:, np.newaxis], num_runouts, axis=1), runouts], axis=2)
+    privates = np.repeat(private_cards[:, np.newaxis], num_runouts, axis=1)
+
+    # the opponent hands are dealt from other orders of the deck without the known cards and the runout, as many
+    # as needed for the opponents
+    per_deck = (NUM_CARDS - 7) // 2
+    num_decks = -(-num_opponents // per_deck)
+    keys = random.random((num_hands, num_runouts, num_decks, NUM_CARDS))
+    dealt = np.concatenate([privates, boards], axis=2).astype(np.int64)
+    np.put_along_axis(keys, np.repeat(dealt[:, :, np.newaxis], num_decks, axis=2), 2.0, axis=3)
+    opponents = np.argsort(keys, axis=3)[:, :, :, :2 * per_deck]
+    opponents = opponents.reshape(num_hands, num_runouts, num_decks * per_deck, 2)[:, :, :num_opponents]
+
+    values = evaluator.evaluate(np.concatenate([privates, boards], axis=2).reshape(-1, 7))
+    values = values.reshape(num_hands, num_runouts, 1)
+    opponent_boards = np.repeat(boards[:, :, np.newaxis], num_opponents, axis=2)
+    opponent_values = evaluator.evaluate(np.concatenate([opponents, opponent_boards], axis=3).reshape(-1, 7))
+    opponent_values = opponent_values.reshape(num_hands, num_runouts, num_opponents)
+
+    equities = ((values < opponent_values) + 0.5 * (values == opponent_values)).mean(axis=2)
+    return np.sort(equities, axis=1).astype(np.float32)
+
+"""
+Clusters the features by k-means (k-means++ seeding on a sample, then Lloyd iterations)
+:returns: the cluster of each row, numbered by increasing mean of the centroids (from the weakest hands)
+"""
+def cluster(features, num_clusters, num_iterations, random, chunk_size):
+    sample = features[random.choice(len(features), size=min(len(features), 50 * num_clusters), replace=False)]
+    centroids = [sample[random.integers(len(sample))]]
+    distances = ((sample - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, num_clusters):
+        centroids.append(sample[random.choice(len(sample), p=distances / distances.sum())])
+        distances = np.minimum(distances, ((sample - centroids[-1]) ** 2).sum(axis=1))
+    centroids = np.array(centroids)
+
+    labels = np.zeros(len(features), dtype=np.int64)
+    for _ in tqdm(range(num_iterations), desc='Clustering'):
+        for start in range(0, len(features), chunk_size):
+            chunk = features[start:start + chunk_size]
+            distances = (centroids ** 2).sum(axis=1) - 2 * chunk @ centroids.T
+            labels[start:start + chunk_size] = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=num_clusters)
+        for dim in range(features.shape[1]):
+            sums = np.bincount(labels, weights=features[:, dim], minlength=num_clusters)
+            # an empty cluster keeps its centroid
+            centroids[counts > 0, dim] = sums[counts > 0] / counts[counts > 0]
+
+    order = np.argsort(centroids.mean(axis=1))
+    ranks = np.empty(num_clusters, dtype=np.int64)
+    ranks[order] = np.arange(num_clusters)
+    return ranks[labels]
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the table of the postflop buckets of the flop of hold\'em by '
+                                                 'clustering the hands on their equity distributions.')
+
+    parser.add_argument('--round', choices=['flop'], default='flop',
+                        help='Round of the table. Only the flop can be built: the turn and the river have too many '
+                             'hands, and HLPokerPlayer.get_bucket buckets them by their equity instead. Defaults to '
+                             'flop.')
+    parser.add_argument('--output', default=None,
+                        help='Path of the table to write. Defaults to the table of the round at the root of the '
+                             'repository.')
+    parser.add_argument('--buckets', type=int, default=50, help='Number of buckets. Defaults to 50.')
+    parser.add_argument('--runouts', type=int, default=32,
+                        help='Runouts sampled for the equity distribution of each hand. Defaults to 32.')
+    parser.add_argument('--opponents', type=int, default=64,
+                        help='Opponent hands sampled for the equity of each runout. Defaults to 64.')
+    parser.add_argument('--iterations', type=int, default=20, help='Iterations of k-means. Defaults to 20.')
+    parser.add_argument('--chunk-size', type=int, default=1024,
+                        help='Hands whose equities are computed at once. Defaults to 1024.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the sampling and the clustering. Defaults to 0.')
+
+    args = parser.parse_args()
+
+    board_size = {name: board_size for board_size, name in ROUND_NAMES.items()}[args.round]
+    if args.runouts < 1 or args.opponents < 1:
+        parser.error("At least a runout and an opponent are needed.")
+    output = args.output or BucketTable.get_default_path(board_size)
+    random = np.random.default_rng(args.seed)
+
+    private_cards, board_cards = get_representatives(board_size)
+    features = np.zeros((len(private_cards), args.runouts), dtype=np.float32)
+    for start in tqdm(range(0, len(features), args.chunk_size), desc='Computing equities'):
+        end = start + args.chunk_size
+        features[start:end] = compute_features(private_cards[start:end], board_cards[start:end], args.runouts,
+                                               args.opponents, random)
+
+    buckets = cluster(features, args.buckets, args.iterations, random, args.chunk_size)
+    BucketTable.write(output, board_size, args.buckets, buckets)
+    print(f"Wrote the buckets of {len(buckets)} {args.round} hands to {output}")
+
+if __name__ == "__main__":
+    main()
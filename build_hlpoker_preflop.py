@@ -0,0 +1,68 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from tqdm import tqdm
+
+from games.hlpoker.equity import COMBO_INDEXES, COMBOS, EquityCalculator
+from games.hlpoker.preflop import NUM_CLASSES, PreflopTable, get_class_hands
+
+"""
+Computes the equities of a class: against a random hand and against each of the next classes (the ones before it
+are given by their own rows, and a class against itself has an equity of 0.5)
+"""
+def compute_class(args):
+    hand_class, num_trials, random_trials, seed = args
+    # any hand of the class will do, as the ranges of the opponents hold all the hands of their class
+    hand = get_class_hands(hand_class)[0]
+
+    equity = EquityCalculator(random_trials, seed).get_equity(hand, [])
+
+    calculator = EquityCalculator(num_trials, seed)
+    head_to_head = []
+    for other_class in range(hand_class + 1, NUM_CLASSES):
+        opponent_range = np.zeros(len(COMBOS))
+        for first, second in get_class_hands(other_class):
+            opponent_range[COMBO_INDEXES[first, second]] = 1.0
+        head_to_head.append(calculator.get_equity(hand, [], opponent_range))
+    return hand_class, equity, head_to_head
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the hold\'em preflop equity table of the 169 classes of '
+                                                 'starting hands by Monte Carlo.')
+
+    parser.add_argument('--output', default=PreflopTable.DEFAULT_PATH,
+                        help='Path of the table to write. Defaults to the table shipped at the root of the repository.')
+    parser.add_argument('--trials', type=int, default=20000,
+                        help='Monte Carlo trials of each head-to-head equity. Defaults to 20000.')
+    parser.add_argument('--random-trials', type=int, default=200000,
+                        help='Monte Carlo trials of each equity against a random hand. Defaults to 200000.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the trials. Defaults to 0.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes computing classes (0 uses all CPUs). Defaults to 1.')
+
+    args = parser.parse_args()
+
+    tasks = [(hand_class, args.trials, args.random_trials, args.seed + hand_class) for hand_class in range(NUM_CLASSES)]
+    workers = args.workers or os.cpu_count()
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(tqdm(executor.map(compute_class, tasks), total=len(tasks), desc='Computing classes'))
+    else:
+        results = [compute_class(task) for task in tqdm(tasks, desc='Computing classes')]
+
+    equities = [0.0] * NUM_CLASSES
+    head_to_head = [[0.5] * NUM_CLASSES for _ in range(NUM_CLASSES)]
+    for hand_class, equity, row in results:
+        equities[hand_class] = equity
+        for other_class, other_equity in enumerate(row, hand_class + 1):
+            head_to_head[hand_class][other_class] = other_equity
+            head_to_head[other_class][hand_class] = 1.0 - other_equity
+
+    PreflopTable.write(args.output, equities, head_to_head)
+    print(f"Wrote the equities of {NUM_CLASSES} classes to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import numpy as np
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard import BitboardLayout
+from games.connect4.result import Connect4Result
+from games.connect4.solver import Connect4Solver
+from games.connect4.state import Connect4State
+
+
+class Connect4Batch:
+    """
+    A batch of independent connect 4 games advanced in lockstep with NumPy, for self-play and rollouts.
+
+    Each game (slot) is stored as packed bitboards (see BitboardLayout) in uint64 arrays: the cells of each player and
+    the cells of both. A step plays one move in every slot that is not finished, so the legal moves, the drops and the
+    win checks are a few array operations (masks and shifts) for the whole batch instead of a loop per game.
+    All slots start from the same position (the empty board or a given state) and the moves of each slot are kept, so
+    any slot can be turned back into a Connect4State with get_state.
+
+    The bitboards must fit in 64 bits, so (num_rows + 1) * num_cols must be 64 or less (the 6x7 board takes 49).
+    """
+
+    """
+    the winner of a slot that is not finished or ended in a draw
+    """
+    NO_WINNER = -1
+
+    """
+    the column of the moves of a slot after it finished
+    """
+    NO_MOVE = -1
+
+    """
+    :param batch_size: the number of games
+    :param origin: the state all games start from (not finished), or None for the empty board
+    :param seed: seed of the random moves of play_random and playout
+    """
+    def __init__(self, batch_size: int, num_rows: int = 6, num_cols: int = 7, origin: Connect4State = None,
+                 seed=None):
+        if origin is not None:
+            num_rows, num_cols = origin.get_num_rows(), origin.get_num_cols()
+            if origin.is_finished():
+                raise ValueError("The games of a batch can't start from a finished state")
+        if (num_rows + 1) * num_cols > 64:
+            raise ValueError(f"A {num_rows}x{num_cols} board doesn't fit in 64 bit bitboards")
+
+        self.__batch_size = batch_size
+        self.__layout = BitboardLayout.get(num_rows, num_cols)
+        self.__origin = origin.clone() if origin is not None else Connect4State(num_rows, num_cols)
+        self.__random = np.random.default_rng(seed)
+
+        """
+        the masks of the layout as arrays, by column, and the bit of each cell, by row and col (row 0 at the top)
+        """
+        self.__column_masks = np.array(self.__layout.column_masks, dtype=np.uint64)
+        self.__bottom_masks = np.array(self.__layout.bottom_masks, dtype=np.uint64)
+        self.__top_masks = np.array(self.__layout.top_masks, dtype=np.uint64)
+        self.__cell_bits = np.array([[self.__layout.get_bit(row, col) for col in range(num_cols)]
+                                     for row in range(num_rows)], dtype=np.uint64)
+        self.__directions = [np.uint64(shift) for shift in self.__layout.directions]
+
+        self.reset()
+
+    """
+    starts all games again from the origin
+    """
+    def reset(self):
+        current, mask = Connect4Solver.get_position(self.__origin)
+        acting_player = self.__origin.get_acting_player()
+        origin_positions = [0, 0]
+        origin_positions[acting_player] = current
+        origin_positions[1 - acting_player] = current ^ mask
+
+        """
+        the cells of each player and of both players, by slot
+        """
+        self.__positions = np.tile(np.array(origin_positions, dtype=np.uint64), (self.__batch_size, 1))
+        self.__mask = np.full(self.__batch_size, mask, dtype=np.uint64)
+
+        """
+        the player to move in the slots that are not finished (the same for all of them, as they move in lockstep)
+        """
+        self.__acting_player = acting_player
+
+        """
+        if each slot is finished and its winner (NO_WINNER for a draw)
+        """
+        self.__finished = np.zeros(self.__batch_size, dtype=bool)
+        self.__winners = np.full(self.__batch_size, Connect4Batch.NO_WINNER, dtype=np.int8)
+
+        """
+        the columns played in each slot since the origin, NO_MOVE after it finished, and the number of steps played
+        """
+        empty_cells = self.__layout.num_rows * self.__layout.num_cols - bin(mask).count('1')
+        self.__moves = np.full((self.__batch_size, empty_cells), Connect4Batch.NO_MOVE, dtype=np.int8)
+        self.__num_steps = 0
+
+    def __len__(self):
+        return self.__batch_size
+
+    def get_num_rows(self):
+        return self.__layout.num_rows
+
+    def get_num_cols(self):
+        return self.__layout.num_cols
+
+    def get_acting_player(self) -> int:
+        return self.__acting_player
+
+    def get_num_steps(self) -> int:
+        return self.__num_steps
+
+    """
+    gets the bitboards of the slots, an array (batch size, 2) with the cells of each player
+    """
+    def get_bitboards(self):
+        return self.__positions.copy()
+
+    """
+    gets the boards of the slots as an int8 array (batch size, num rows, num cols), with the index of the player in
+    each cell or Connect4State.EMPTY_CELL, laid out as Connect4State.get_grid
+    """
+    def get_grids(self):
+        bits = self.__cell_bits[np.newaxis]
+        player0 = (self.__positions[:, 0, np.newaxis, np.newaxis] >> bits) & np.uint64(1)
+        player1 = (self.__positions[:, 1, np.newaxis, np.newaxis] >> bits) & np.uint64(1)
+        grids = np.full(player0.shape, Connect4State.EMPTY_CELL, dtype=np.int8)
+        grids[player0 == 1] = 0
+        grids[player1 == 1] = 1
+        return grids
+
+    """
+    gets the legal moves of the slots, a bool array (batch size, num cols); a finished slot has none
+    """
+    def get_legal_moves(self):
+        return ((self.__mask[:, np.newaxis] & self.__top_masks[np.newaxis]) == 0) & ~self.__finished[:, np.newaxis]
+
+    """
+    gets if each slot is finished, a bool array
+    """
+    def get_finished(self):
+        return self.__finished.copy()
+
+    def is_finished(self) -> bool:
+        return bool(self.__finished.all())
+
+    """
+    gets the winner of each slot, an int8 array with the index of the winner or NO_WINNER
+    """
+    def get_winners(self):
+        return self.__winners.copy()
+
+    """
+    gets the result of a player in each slot that is finished, an int8 array with the values of Connect4Result
+    (DRAW for the slots that are not finished)
+    """
+    def get_results(self, pos: int):
+        results = np.full(self.__batch_size, Connect4Result.DRAW.value, dtype=np.int8)
+        results[self.__winners == pos] = Connect4Result.WIN.value
+        results[self.__winners == 1 - pos] = Connect4Result.LOOSE.value
+        return results
+
+    """
+    plays a move in every slot that is not finished
+    :param cols: int array (batch size) with the column to play in each slot; the columns of finished slots are ignored
+    """
+    def play(self, cols):
+        active = ~self.__finished
+        cols = np.where(active, cols, 0)
+        if ((cols < 0) | (cols >= self.__layout.num_cols))[active].any() or \
+                not self.get_legal_moves()[np.arange(self.__batch_size), cols][active].all():
+            raise ValueError("Every slot that is not finished must be given a legal move")
+        self.__drop(cols, active)
+
+    """
+    plays a random legal move in every slot that is not finished
+    """
+    def play_random(self):
+        legal = self.get_legal_moves()
+        # the legal column with the highest random score, in each slot
+        scores = self.__random.random(legal.shape)
+        scores[~legal] = -1.0
+        self.__drop(scores.argmax(axis=1), ~self.__finished)
+
+    """
+    plays random moves until all games are finished
+    :returns: the winner of each slot (see get_winners)
+    """
+    def playout(self):
+        while not self.__finished.all():
+            self.play_random()
+        return self.get_winners()
+
+    # drops the checkers of the acting player in the given columns of the active slots
+    def __drop(self, cols, active):
+        if not active.any():
+            raise ValueError("All games of the batch are finished")
+        player = self.__acting_player
+        mask = self.__mask
+        drops = (mask + self.__bottom_masks[cols]) & self.__column_masks[cols]
+        drops[~active] = 0
+
+        position = self.__positions[:, player] | drops
+        self.__positions[:, player] = position
+        mask |= drops
+
+        # 4 in a row in any direction, with the shifts of BitboardLayout.has_four
+        wins = np.zeros(self.__batch_size, dtype=bool)
+        for shift in self.__directions:
+            pairs = position & (position >> shift)
+            wins |= (pairs & (pairs >> (shift + shift))) != 0
+        wins &= active
+
+        self.__winners[wins] = player
+        self.__moves[:, self.__num_steps] = np.where(active, cols, Connect4Batch.NO_MOVE)
+        self.__finished |= wins | (mask == np.uint64(self.__layout.board_mask))
+        self.__num_steps += 1
+        self.__acting_player = 1 - player
+
+    """
+    gets the game of a slot as a state of the same type as the origin (a Connect4State by default), by replaying its
+    moves on a copy of the origin
+    """
+    def get_state(self, index: int) -> Connect4State:
+        state = self.__origin.clone()
+        for col in self.__moves[index, :self.__num_steps]:
+            if col == Connect4Batch.NO_MOVE:
+                break
+            state.update(Connect4Action(int(col)))
+        return state
@@ -0,0 +1,102 @@
+class BitboardLayout:
+    """
+    Bit layout of a connect 4 board with any number of rows and cols, stored in (arbitrary width) python ints.
+    The board is stored column by column from the bottom up, with an extra always-empty bit on top of each column,
+    so the bit of (row, col) is col * (num_rows + 1) + row, with row 0 at the bottom.
+    The extra bit keeps lines from wrapping around columns, so 4 in a row in any direction can be found with shifts.
+    """
+
+    """
+    the layouts already built, by (num_rows, num_cols)
+    """
+    __layouts = {}
+
+    @staticmethod
+    def get(num_rows: int, num_cols: int):
+        key = (num_rows, num_cols)
+        if key not in BitboardLayout.__layouts:
+            BitboardLayout.__layouts[key] = BitboardLayout(num_rows, num_cols)
+        return BitboardLayout.__layouts[key]
+
+    def __init__(self, num_rows: int, num_cols: int):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        """
+        number of bits used by each column, including the extra bit
+        """
+        self.column_bits = num_rows + 1
+
+        """
+        the shifts between neighbour cells: vertical, horizontal and both diagonals
+        """
+        self.directions = (1, self.column_bits, self.column_bits - 1, self.column_bits + 1)
+
+        """
+        masks of the cells of each column, of its bottom cell and of its top cell
+        """
+        self.column_masks = [((1 << num_rows) - 1) << (col * self.column_bits) for col in range(num_cols)]
+        self.bottom_masks = [1 << (col * self.column_bits) for col in range(num_cols)]
+        self.top_masks = [1 << (col * self.column_bits + num_rows - 1) for col in range(num_cols)]
+
+        """
+        masks of the bottom cells and of all cells of the board
+        """
+        self.bottom_mask = sum(self.bottom_masks)
+        self.board_mask = self.bottom_mask * ((1 << num_rows) - 1)
+
+        """
+        the mask of all the bits of the first column (including the extra bit), and the shifts that move each column
+        to the place of its mirror image
+        """
+        self.__column_bits_mask = (1 << self.column_bits) - 1
+        self.__mirror_shifts = [(num_cols - 1 - 2 * col) * self.column_bits for col in range(num_cols)]
+
+    """
+    checks if a bitboard holds 4 in a row in any direction
+    """
+    def has_four(self, bitboard: int) -> bool:
+        for shift in self.directions:
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    """
+    gets the empty cells where the checkers of a bitboard would make 4 in a row
+    :param position: the cells of a player
+    :param mask: the cells of both players
+    """
+    def get_winning_cells(self, position: int, mask: int) -> int:
+        # vertical
+        cells = (position << 1) & (position << 2) & (position << 3)
+
+        # horizontal and both diagonals, with the empty cell at any of the 4 places of the line
+        for shift in self.directions[1:]:
+            pair = (position << shift) & (position << 2 * shift)
+            cells |= pair & (position << 3 * shift)
+            cells |= pair & (position >> shift)
+            pair = (position >> shift) & (position >> 2 * shift)
+            cells |= pair & (position << shift)
+            cells |= pair & (position >> 3 * shift)
+
+        return cells & (self.board_mask ^ mask)
+
+    """
+    gets the mirror image of a bitboard (the board flipped left to right); the columns are moved whole, extra bit
+    included, so the sum of two bitboards without carries between columns (e.g. cells of a player + cells of both)
+    can be mirrored as well
+    """
+    def mirror(self, bitboard: int) -> int:
+        mirrored = 0
+        column_bits, column_mask = self.column_bits, self.__column_bits_mask
+        for col, shift in enumerate(self.__mirror_shifts):
+            column = bitboard & (column_mask << col * column_bits)
+            mirrored |= column << shift if shift >= 0 else column >> -shift
+        return mirrored
+
+    """
+    gets the bit index of a cell, where row 0 is the top row (as in Connect4State.get_grid)
+    """
+    def get_bit(self, row: int, col: int) -> int:
+        return col * self.column_bits + (self.num_rows - 1 - row)
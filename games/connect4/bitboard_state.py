@@ -0,0 +1,201 @@
+from typing import Optional
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard import BitboardLayout
+from games.connect4.result import Connect4Result
+from games.connect4.state import Connect4State
+from games.connect4.zobrist import ZobristKeys
+from games.state import State
+
+
+class Connect4BitboardState(Connect4State):
+    """
+    A Connect4State backed by bitboards: one int per player with the cells they hold, plus the height of each column.
+    Dropping a checker, checking for a winner and cloning take a constant number of int operations, instead of
+    scanning the whole grid. The public Connect4State API is kept, so players work with either state; get_grid builds
+    the grid on demand.
+    """
+
+    def __init__(self, num_rows: int = 6, num_cols: int = 7):
+        # Connect4State.__init__ is not called, it would build the grid this state replaces
+        State.__init__(self)
+
+        if num_rows < 4:
+            raise Exception("the number of rows must be 4 or over")
+        if num_cols < 4:
+            raise Exception("the number of cols must be 4 or over")
+
+        """
+        the bit layout for the dimensions of the board
+        """
+        self.__layout = BitboardLayout.get(num_rows, num_cols)
+
+        """
+        the cells held by each player
+        """
+        self.__positions = [0, 0]
+
+        """
+        the bit index of the next free cell of each column
+        """
+        self.__heights = [col * self.__layout.column_bits for col in range(num_cols)]
+
+        """
+        counts the number of turns in the current game
+        """
+        self.__turns_count = 1
+
+        """
+        the index of the current acting player
+        """
+        self.__acting_player = 0
+
+        """
+        determine if a winner was found already
+        """
+        self.__has_winner = False
+
+        """
+        determine if the game was adjudicated before its end, and the index of the winner (None for a draw)
+        """
+        self.__adjudicated = False
+        self.__adjudicated_winner = None
+
+        """
+        the zobrist keys for the dimensions of the board, the key of the current position and the key of its mirror
+        image
+        """
+        self.__zobrist = ZobristKeys.get(num_rows, num_cols)
+        self.__zobrist_key = self.__zobrist.empty
+        self.__zobrist_mirrored_key = self.__zobrist.empty
+
+        """
+        the read-only copy of the grid given once the state is frozen, built on first use
+        """
+        self.__frozen_grid = None
+
+    """
+    builds the grid from the bitboards; a frozen state gives a read-only copy (a tuple of row tuples), built once and
+    shared by all the calls
+    """
+    def get_grid(self):
+        if self.is_frozen() and self.__frozen_grid is not None:
+            return self.__frozen_grid
+
+        grid = [[Connect4State.EMPTY_CELL for _i in range(self.__layout.num_cols)]
+                for _j in range(self.__layout.num_rows)]
+        for player in (0, 1):
+            position = self.__positions[player]
+            for row in range(self.__layout.num_rows):
+                for col in range(self.__layout.num_cols):
+                    if position >> self.__layout.get_bit(row, col) & 1:
+                        grid[row][col] = player
+        if self.is_frozen():
+            self.__frozen_grid = tuple(tuple(row) for row in grid)
+            return self.__frozen_grid
+        return grid
+
+    """
+    gets the bitboards of both players (see get_heights for the bit index of the next free cell of each column)
+    """
+    def get_bitboards(self):
+        return self.__positions[0], self.__positions[1]
+
+    def get_heights(self):
+        return self.__heights.copy()
+
+    def get_layout(self):
+        return self.__layout
+
+    def get_zobrist_key(self) -> int:
+        return self.__zobrist_key
+
+    def get_mirrored_zobrist_key(self) -> int:
+        return self.__zobrist_mirrored_key
+
+    def validate_action(self, action: Connect4Action) -> bool:
+        col = action.get_col()
+
+        # valid column
+        if col < 0 or col >= self.__layout.num_cols:
+            return False
+
+        # full column
+        if self.__heights[col] >= col * self.__layout.column_bits + self.__layout.num_rows:
+            return False
+
+        return True
+
+    def update(self, action: Connect4Action):
+        self.check_mutable("updated")
+        col = action.get_col()
+
+        # drop the checker
+        height = self.__heights[col]
+        self.__positions[self.__acting_player] |= 1 << height
+        self.__heights[col] += 1
+
+        row = self.__layout.num_rows - 1 - (height - col * self.__layout.column_bits)
+        self.__zobrist_key ^= self.__zobrist.cells[self.__acting_player][row][col]
+        self.__zobrist_mirrored_key ^= self.__zobrist.cells[self.__acting_player][row][self.__layout.num_cols - 1 - col]
+
+        # determine if there is a winner
+        self.__has_winner = self.__layout.has_four(self.__positions[self.__acting_player])
+
+        # switch to next player
+        self.__acting_player = 1 if self.__acting_player == 0 else 0
+
+        self.__turns_count += 1
+
+    def __is_full(self):
+        return self.__turns_count > (self.__layout.num_cols * self.__layout.num_rows)
+
+    """
+    ends the game before it is played out, with a known result
+    :param winner: the index of the winning player, or None for a draw
+    """
+    def adjudicate(self, winner: Optional[int]):
+        self.check_mutable("adjudicated")
+        self.__adjudicated = True
+        self.__adjudicated_winner = winner
+
+    def is_finished(self) -> bool:
+        return self.__has_winner or self.__is_full() or self.__adjudicated
+
+    def get_acting_player(self) -> int:
+        return self.__acting_player
+
+    def clone(self):
+        # the constructor is skipped, the layout is shared and the rest are ints
+        cloned_state = Connect4BitboardState.__new__(Connect4BitboardState)
+        State.__init__(cloned_state)
+        cloned_state.__layout = self.__layout
+        cloned_state.__positions = self.__positions.copy()
+        cloned_state.__heights = self.__heights.copy()
+        cloned_state.__turns_count = self.__turns_count
+        cloned_state.__acting_player = self.__acting_player
+        cloned_state.__has_winner = self.__has_winner
+        cloned_state.__adjudicated = self.__adjudicated
+        cloned_state.__adjudicated_winner = self.__adjudicated_winner
+        cloned_state.__zobrist = self.__zobrist
+        cloned_state.__zobrist_key = self.__zobrist_key
+        cloned_state.__zobrist_mirrored_key = self.__zobrist_mirrored_key
+        cloned_state.__frozen_grid = None
+        return cloned_state
+
+    def get_result(self, pos):
+        if self.__adjudicated:
+            if self.__adjudicated_winner is None:
+                return Connect4Result.DRAW.value
+            return Connect4Result.WIN.value if pos == self.__adjudicated_winner else Connect4Result.LOOSE.value
+        if self.__has_winner:
+            return Connect4Result.LOOSE.value if pos == self.__acting_player else Connect4Result.WIN.value
+        if self.__is_full():
+            return Connect4Result.DRAW.value
+        return None
+
+    def get_num_rows(self):
+        return self.__layout.num_rows
+
+    def get_num_cols(self):
+        return self.__layout.num_cols
@@ -0,0 +1,168 @@
+from array import array
+
+from games.connect4.state import Connect4State
+
+
+class WindowTable:
+    """
+    All the windows of 4 cells in a row (across, up and down and both diagonals) of a connect 4 board, and the windows
+    each cell belongs to. A 6x7 board has 69 windows and each cell is in at most 13 of them.
+    """
+
+    """
+    the tables already built, by (num_rows, num_cols)
+    """
+    __tables = {}
+
+    @staticmethod
+    def get(num_rows: int, num_cols: int):
+        key = (num_rows, num_cols)
+        if key not in WindowTable.__tables:
+            WindowTable.__tables[key] = WindowTable(num_rows, num_cols)
+        return WindowTable.__tables[key]
+
+    def __init__(self, num_rows: int, num_cols: int):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        """
+        the cells (row, col) of each window
+        """
+        self.windows = []
+        for row_step, col_step in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+            for row in range(num_rows):
+                for col in range(num_cols):
+                    end_row, end_col = row + 3 * row_step, col + 3 * col_step
+                    if 0 <= end_row < num_rows and end_col < num_cols:
+                        self.windows.append([(row + i * row_step, col + i * col_step) for i in range(4)])
+
+        """
+        the indexes of the windows of each cell, by row and col
+        """
+        self.cell_windows = [[[] for _col in range(num_cols)] for _row in range(num_rows)]
+        for index, window in enumerate(self.windows):
+            for row, col in window:
+                self.cell_windows[row][col].append(index)
+
+
+class Connect4Evaluator:
+    """
+    Incremental evaluation of connect 4 positions, from the number of checkers of each player in every window of 4 cells
+    (see WindowTable). A window held by a single player scores for that player according to how many checkers it has,
+    and a window with checkers of both players can no longer be completed, so it scores nothing. Each checker in the
+    center column (both middle columns on boards of even width, so mirror images score the same) also scores for its
+    owner.
+
+    Checkers are added with make() and removed with unmake(), so a search can keep one evaluator in step with the
+    moves it tries. Both only update the windows of the cell played, and evaluate() returns a running total, so a
+    position is scored in O(windows of the last cell) instead of scanning the board.
+    """
+
+    """
+    default score of a window with 0, 1, 2, 3 and 4 checkers of a single player, and of a checker in the center column
+    """
+    WINDOW_SCORES = (0, 1, 5, 20, 1000)
+    CENTER_SCORE = 3
+
+    def __init__(self, num_rows: int = 6, num_cols: int = 7, window_scores: tuple = WINDOW_SCORES,
+                 center_score: int = CENTER_SCORE):
+        self.__table = WindowTable.get(num_rows, num_cols)
+
+        """
+        the score of a checker of player 0 in each column: the center score in the columns at a (doubled) distance of at
+        most 1 from the middle of the board, (num_cols - 1) / 2
+        """
+        self.__col_scores = [center_score if abs(2 * col - (num_cols - 1)) <= 1 else 0 for col in range(num_cols)]
+
+        """
+        the score of a window for player 0, by 5 * (checkers of player 0) + (checkers of player 1)
+        """
+        self.__window_values = [0] * 25
+        for own in range(5):
+            self.__window_values[5 * own] = window_scores[own]
+            self.__window_values[own] = -window_scores[own]
+
+        self.reset()
+
+    """
+    empties the board
+    """
+    def reset(self):
+        num_windows = len(self.__table.windows)
+
+        """
+        5 * (checkers of player 0) + (checkers of player 1) in each window
+        """
+        self.__windows = array('b', bytes(num_windows))
+
+        """
+        the score of the position for player 0
+        """
+        self.__score = 0
+
+        """
+        the number of checkers in each column and the moves made so far (col, player), to be undone by unmake()
+        """
+        self.__heights = [0] * self.__table.num_cols
+        self.__moves = []
+
+    """
+    sets the evaluator to the position of a state
+    """
+    def set_state(self, state: Connect4State):
+        self.reset()
+        grid = state.get_grid()
+        # the checkers are added from the bottom up, as they were played
+        for row in range(self.__table.num_rows - 1, -1, -1):
+            for col in range(self.__table.num_cols):
+                if grid[row][col] != Connect4State.EMPTY_CELL:
+                    self.make(col, grid[row][col])
+
+    """
+    drops a checker of a player in a column
+    """
+    def make(self, col: int, player: int):
+        row = self.__table.num_rows - 1 - self.__heights[col]
+        self.__heights[col] += 1
+        self.__moves.append((col, player))
+        self.__update(row, col, 5 if player == 0 else 1)
+        self.__score += self.__col_scores[col] if player == 0 else -self.__col_scores[col]
+
+    """
+    removes the last checker dropped
+    """
+    def unmake(self):
+        col, player = self.__moves.pop()
+        self.__heights[col] -= 1
+        row = self.__table.num_rows - 1 - self.__heights[col]
+        self.__update(row, col, -5 if player == 0 else -1)
+        self.__score -= self.__col_scores[col] if player == 0 else -self.__col_scores[col]
+
+    def __update(self, row, col, step):
+        windows = self.__windows
+        values = self.__window_values
+        score = self.__score
+        for index in self.__table.cell_windows[row][col]:
+            counts = windows[index]
+            score -= values[counts]
+            counts += step
+            score += values[counts]
+            windows[index] = counts
+        self.__score = score
+
+    """
+    gets the score of the current position for a player
+    """
+    def evaluate(self, player: int) -> int:
+        return self.__score if player == 0 else -self.__score
+
+    """
+    checks if a player has 4 in a row, in the windows of the last checker dropped
+    """
+    def last_move_wins(self) -> bool:
+        if len(self.__moves) == 0:
+            return False
+        col, player = self.__moves[-1]
+        row = self.__table.num_rows - self.__heights[col]
+        full = 20 if player == 0 else 4
+        return any(self.__windows[index] == full for index in self.__table.cell_windows[row][col])
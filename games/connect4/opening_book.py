@@ -0,0 +1,200 @@
+import mmap
+import os
+import pickle
+import pickletools
+import struct
+
+from games.connect4.action import Connect4Action
+from games.connect4.state import Connect4State
+from games.connect4.zobrist import ZobristKeys
+
+
+class OpeningBook:
+    """
+    Read-only book of connect 4 positions searched offline, keyed by their canonical zobrist key (see
+    ZobristKeys.get_canonical), so a position and its mirror image share an entry and the moves are stored for the
+    position of the key.
+
+    The file is a small header followed by fixed-size records sorted by key, so it is memory mapped instead of loaded
+    and a lookup is a binary search over the records: O(log n) and nothing is read at startup but the header.
+    Each record holds the value of the position for the player to move, the best move and the depth it was searched
+    to. The records without a move (written by older builders) are skipped when the book is read, as they can't be
+    played.
+    """
+
+    MAGIC = b'C4BK'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHHI')
+    RECORD = struct.Struct('<Qfbb')
+    KEY = struct.Struct('<Q')
+
+    NO_MOVE = -1
+
+    """
+    the book shipped at the root of the repository
+    """
+    DEFAULT_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                                 'connect4_book.bin'))
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.__open()
+
+    def __open(self):
+        with open(self.__path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.__num_rows, self.__num_cols, self.__num_entries = \
+            OpeningBook.HEADER.unpack_from(self.__map, 0)
+        if magic != OpeningBook.MAGIC or version != OpeningBook.VERSION:
+            raise ValueError(f"{self.__path} is not a connect 4 opening book (version {OpeningBook.VERSION})")
+
+    def __len__(self):
+        return self.__num_entries
+
+    def get_num_rows(self):
+        return self.__num_rows
+
+    def get_num_cols(self):
+        return self.__num_cols
+
+    """
+    looks up a position by its canonical zobrist key
+    :returns: (value, best move, depth), or None if the position is not in the book or has no move
+    """
+    def lookup(self, key: int):
+        low, high = 0, self.__num_entries
+        while low < high:
+            middle = (low + high) // 2
+            offset = OpeningBook.HEADER.size + middle * OpeningBook.RECORD.size
+            middle_key = OpeningBook.KEY.unpack_from(self.__map, offset)[0]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                entry = OpeningBook.RECORD.unpack_from(self.__map, offset)[1:]
+                return None if entry[1] == OpeningBook.NO_MOVE else entry
+        return None
+
+    """
+    gets the best move stored for a state, or None if it has none
+    """
+    def get_move(self, state):
+        if state.get_num_rows() != self.__num_rows or state.get_num_cols() != self.__num_cols:
+            return None
+        key, mirrored = state.get_canonical_key()
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        return ZobristKeys.mirror_col(entry[1], self.__num_cols, mirrored)
+
+    def close(self):
+        self.__map.close()
+
+    # memory maps cannot be pickled, so a book sent to a worker process maps the file again
+    def __getstate__(self):
+        return {'path': self.__path}
+
+    def __setstate__(self, state):
+        self.__path = state['path']
+        self.__open()
+
+    """
+    writes a book
+    :param entries: dictionary {canonical zobrist key: (value, best move, depth)}
+    """
+    @staticmethod
+    def write(path: str, num_rows: int, num_cols: int, entries: dict):
+        with open(path, 'wb') as file:
+            file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, num_rows, num_cols,
+                                               len(entries)))
+            for key in sorted(entries):
+                value, move, depth = entries[key]
+                file.write(OpeningBook.RECORD.pack(key, value, move, depth))
+
+    """
+    reads the entries of an existing book with a move, e.g. to extend it
+    :returns: dictionary {canonical zobrist key: (value, best move, depth)}
+    """
+    def get_entries(self):
+        entries = {}
+        for index in range(self.__num_entries):
+            key, value, move, depth = OpeningBook.RECORD.unpack_from(
+                self.__map, OpeningBook.HEADER.size + index * OpeningBook.RECORD.size)
+            if move != OpeningBook.NO_MOVE:
+                entries[key] = (value, move, depth)
+        return entries
+
+    """
+    imports the positions of the legacy minimax cache, a pickled dictionary {((grid rows), acting player): value}, to
+    be searched for the book (the cache holds no moves, so its values alone can't be played).
+    The file was cut short while being written, so the pickle is recovered up to its last complete batch of items:
+    the framing opcodes (whose lengths no longer match the data) are dropped and the stream is closed right after the
+    last SETITEMS. Each grid is turned back into a state by replaying its checkers in an order the game allows; the
+    grids that can't be reached this way and the finished positions are left out.
+    :returns: list of Connect4State
+    """
+    @staticmethod
+    def import_pickle(path: str, num_rows: int = 6, num_cols: int = 7):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        opcodes = []
+        try:
+            for opcode, _arg, position in pickletools.genops(data):
+                opcodes.append((opcode.name, position))
+        except ValueError:
+            # the data ends in the middle of the pickle
+            pass
+
+        recovered = bytearray()
+        end = 0
+        for index, (name, position) in enumerate(opcodes):
+            if name == 'STOP':
+                break
+            if name == 'FRAME':
+                continue
+            next_position = opcodes[index + 1][1] if index + 1 < len(opcodes) else len(data)
+            recovered += data[position:next_position]
+            if name in ('SETITEM', 'SETITEMS'):
+                end = len(recovered)
+        if end == 0:
+            return []
+        cache = pickle.loads(bytes(recovered[:end]) + pickle.STOP)
+
+        states = []
+        for grid, _player in cache:
+            if len(grid) != num_rows or len(grid[0]) != num_cols:
+                continue
+            num_checkers = sum(cell >= 0 for row in grid for cell in row)
+            state = OpeningBook.__replay_grid(grid, Connect4State(num_rows, num_cols), [0] * num_cols, num_checkers,
+                                              set())
+            if state is not None and not state.is_finished():
+                states.append(state)
+        return states
+
+    # plays the checkers of a grid from a state, each player dropping one of its own checkers on top of a column in
+    # turn, or returns None if there is no such order; the column heights that lead nowhere are kept in failed
+    @staticmethod
+    def __replay_grid(grid, state, heights, num_checkers, failed):
+        if num_checkers == 0:
+            return state
+        if tuple(heights) in failed:
+            return None
+        player = state.get_acting_player()
+        for col in range(len(heights)):
+            row = len(grid) - 1 - heights[col]
+            if row >= 0 and grid[row][col] == player:
+                next_state = state.clone()
+                next_state.update(Connect4Action(col))
+                # only the last checker may end the game
+                if next_state.is_finished() and num_checkers > 1:
+                    continue
+                heights[col] += 1
+                found = OpeningBook.__replay_grid(grid, next_state, heights, num_checkers - 1, failed)
+                heights[col] -= 1
+                if found is not None:
+                    return found
+        failed.add(tuple(heights))
+        return None
@@ -1,5 +1,6 @@
 from abc import ABC
 
+from games.connect4.action import Connect4Action
 from games.connect4.result import Connect4Result
 from games.player import Player
 
@@ -21,6 +22,28 @@ class Connect4Player(Player, ABC):
         """
         self.__num_games = 0
 
+        """
+        the opening book of the player (see OpeningBook), if it uses one
+        """
+        self.__opening_book = None
+
+    def set_opening_book(self, opening_book):
+        self.__opening_book = opening_book
+
+    def get_opening_book(self):
+        return self.__opening_book
+
+    """
+    gets the move of the opening book for a state, or None if the player has no book or the state is not in it
+    """
+    def get_book_action(self, state):
+        if self.__opening_book is None:
+            return None
+        col = self.__opening_book.get_move(state)
+        if col is None or not state.validate_action(Connect4Action(col)):
+            return None
+        return Connect4Action(col)
+
     def print_stats(self):
         pass
 
@@ -1,177 +1,513 @@
-from games.connect4.player import Connect4Player
-from games.connect4.state import Connect4State
-from games.connect4.action import Connect4Action
-from games.state import State
-import time
-
-class connect4_29344_v1(Connect4Player):
-    def __init__(self, name, depth=4):
-        super().__init__(name)
-        self.depth = depth
-        self.memo = {}
-
-    def heuristic(self, state: Connect4State):
-        score = 0
-        grid = self.get_grid(state)
-        if grid is None:
-            raise AttributeError("O estado do jogo não possui o atributo 'grid'.")
-
-        player = self.get_current_player(state)
-        opponent = 1 if player == 0 else 0
-
-        def count_pattern(pattern, row_str):
-            return row_str.count(pattern)
-
-        for row in grid:
-            row_str = ''.join(str(cell) for cell in row)
-            score += 5 * count_pattern(str(player) * 2, row_str)
-            score += 10 * count_pattern(str(player) * 3, row_str)
-            score += 100 * count_pattern(str(player) * 4, row_str)
-            score -= 5 * count_pattern(str(opponent) * 2, row_str)
-            score -= 10 * count_pattern(str(opponent) * 3, row_str)
-            score -= 100 * count_pattern(str(opponent) * 4, row_str)
-
-        center_col = len(grid[0]) // 2
-        for row in grid:
-            if row[center_col] == player:
-                score += 3
-        return score
-
-    def get_grid(self, state):
-        if hasattr(state, 'grid'):
-            return state.grid
-        elif hasattr(state, '_Connect4State__grid'):
-            return state._Connect4State__grid
-        else:
-            print("Atributos do estado:", state.__dict__)
-            return None
-
-    def get_current_player(self, state):
-        if hasattr(state, 'current_player'):
-            return state.current_player
-        elif hasattr(state, '_Connect4State__acting_player'):
-            return state._Connect4State__acting_player
-        else:
-            raise AttributeError("O estado do jogo não possui o atributo 'current_player'.")
-
-    def simulate_result(self, state: Connect4State, action):
-        grid = self.get_grid(state)
-        if grid is None:
-            raise AttributeError("O estado do jogo não possui o atributo 'grid'.")
-
-        action_column = action._Connect4Action__col #obtém a coluna da ação 
-        new_grid = [row.copy() for row in grid]
-
-        for row in reversed(new_grid): #Percorre as linhas da nova grade de baixo para cima
-            if row[action_column] == -1:
-                row[action_column] = self.get_current_player(state) #Quando encontra essa célula vazia, coloca a peça do jogador atual nessa posição e interrompe 
-                break
-
-        new_state = Connect4State(state._Connect4State__num_rows, state._Connect4State__num_cols)
-        new_state._Connect4State__grid = new_grid
-        new_state._Connect4State__turns_count = state._Connect4State__turns_count + 1
-        new_state._Connect4State__acting_player = 1 - self.get_current_player(state)
-        new_state._Connect4State__has_winner = self.check_winner(new_grid, self.get_current_player(state))
-
-        return new_state
-
-    def check_winner(self, grid, player):
-        def check_line(line):
-            return any(line[i:i+4] == [player] * 4 for i in range(len(line) - 3))
-
-        for row in grid:
-            if check_line(row):
-                return True
-
-        for col in range(len(grid[0])):
-            column = [row[col] for row in grid]
-            if check_line(column):
-                return True
-
-        for row in range(len(grid) - 3):
-            for col in range(len(grid[0]) - 3):
-                if all(grid[row + i][col + i] == player for i in range(4)):
-                    return True
-                if all(grid[row + 3 - i][col + i] == player for i in range(4)):
-                    return True
-
-        return False
-
-    def minimax(self, state: Connect4State, depth, alpha, beta, maximizing_player):
-        state_tuple = self.state_to_tuple(state) #converte o estado do jogo em uma tupla para que possa ser usada como chave no dicionário
-        if state_tuple in self.memo:
-            return self.memo[state_tuple]
-
-        if depth == 0 or self.is_game_over(state):
-            eval = self.heuristic(state) # calcula a avaliação heurística do estado atual.
-            self.memo[state_tuple] = eval #armazena o valor calculado no memo
-            return eval
-
-        if maximizing_player:
-            max_eval = float('-inf')
-            #ordena as ações possíveis com base na avaliação heurística e simula o resultado
-            for action in sorted(state.get_possible_actions(), key=lambda a: self.heuristic(self.simulate_result(state, a)), reverse=True):
-                #chama recursivamente o método minimax com a profundidade reduzida
-                eval = self.minimax(self.simulate_result(state, action), depth - 1, alpha, beta, False)
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            self.memo[state_tuple] = max_eval
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for action in sorted(state.get_possible_actions(), key=lambda a: self.heuristic(self.simulate_result(state, a))):
-                eval = self.minimax(self.simulate_result(state, action), depth - 1, alpha, beta, True)
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            self.memo[state_tuple] = min_eval
-            return min_eval
-
-    def is_game_over(self, state: Connect4State):
-        grid = self.get_grid(state)
-        if grid is None:
-            raise AttributeError("O estado do jogo não possui o atributo 'grid'.")
-
-        if self.check_winner(grid, self.get_current_player(state)):
-            return True
-
-        return all(cell != Connect4State.EMPTY_CELL for row in grid for cell in row)
-
-    def get_action(self, state: Connect4State):
-        start_time = time.time()
-        best_score = float('-inf') #inicializa a melhor pontuação com um valor muito baixo
-        best_action = None
-        possible_actions = state.get_possible_actions()
-
-        #Para cada ação possível, calcula a heurística do estado resultante simulado
-        actions_with_heuristic = [(action, self.heuristic(self.simulate_result(state, action))) for action in possible_actions]
-        sorted_actions = sorted(actions_with_heuristic, key=lambda x: x[1], reverse=True)
-
-        for action, _ in sorted_actions:
-            #simula o resultado e chama recursivamente o método minimax com a profundidade reduzida
-            eval = self.minimax(self.simulate_result(state, action), self.depth - 1, float('-inf'), float('inf'), False)
-            if eval > best_score:
-                best_score = eval
-                best_action = action
-            if time.time() - start_time > 1:
-                break
-        return best_action
-
-    def state_to_tuple(self, state):
-        grid = self.get_grid(state)
-        return tuple(tuple(row) for row in grid), self.get_current_player(state)
-
-    def event_action(self, pos, action, state):
-        pass
-
-    def event_end_game(self, state):
-        pass
-
-    def event_new_game(self):
-        pass
-
-    def event_result(self, pos: int, result):
-        pass
\ No newline at end of file
+from games.connect4.player import Connect4Player
+from games.connect4.state import Connect4State
+from games.connect4.action import Connect4Action
+from games.connect4.evaluation import Connect4Evaluator
+from games.connect4.opening_book import OpeningBook
+from games.connect4.transposition import TranspositionTable
+from games.connect4.zobrist import ZobristKeys
+from games.state import State
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import weakref
+
+
+class SearchAborted(Exception):
+    """
+    lançada durante a pesquisa quando o orçamento de tempo ou de nós da jogada acaba
+    """
+    pass
+
+
+class connect4_29344_v1(Connect4Player):
+    # o jogador não faz nada com os eventos dos jogos
+    SUBSCRIBED_EVENTS = ()
+
+    # chave juntada à chave zobrist dos nós em que este jogador maximiza, já que o valor de uma posição depende disso
+    MAXIMIZING_KEY = 0x9E3779B97F4A7C15
+
+    # de quantos em quantos nós o relógio e o orçamento de nós são consultados durante a pesquisa
+    BUDGET_CHECK_INTERVAL = 256
+
+    # profundidade mínima das entradas da tabela de transposição que os processos da pesquisa paralela devolvem
+    EXPORT_MIN_DEPTH = 2
+
+    # tamanho máximo (em bits) da tabela de transposição dos processos da pesquisa paralela, que é esvaziada e
+    # exportada a cada jogada da raiz pesquisada, por isso uma tabela grande custaria mais do que poupa
+    WORKER_TT_SIZE_BITS = 16
+
+    """
+    :param depth: profundidade fixa da pesquisa, quando não há orçamento de tempo
+    :param tt_size_bits: a tabela de transposição tem 2 ** tt_size_bits entradas
+    :param time_budget: segundos por jogada; se indicado, a pesquisa é feita por aprofundamento iterativo até o tempo
+    acabar ou até ao fim do jogo, e devolve a melhor jogada da última profundidade pesquisada por completo
+    :param opening_book: caminho do livro de aberturas (ver OpeningBook), ou None para não usar nenhum
+    :param node_budget: nós por jogada; tal como time_budget faz aprofundamento iterativo, mas o resultado não depende
+    da velocidade da máquina, por isso a pesquisa é determinística (também com workers)
+    :param workers: número de processos da pesquisa; com mais de um, as jogadas da raiz de cada iteração são
+    pesquisadas em paralelo e as tabelas de transposição dos processos são juntadas à deste jogador
+    """
+    def __init__(self, name, depth=4, tt_size_bits=18, time_budget=None, opening_book=OpeningBook.DEFAULT_PATH,
+                 node_budget=None, workers=1):
+        super().__init__(name)
+        self.depth = depth
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.workers = workers
+        self.tt_size_bits = tt_size_bits
+        #o livro só é usado se existir
+        if opening_book is not None and os.path.exists(opening_book):
+            self.set_opening_book(OpeningBook(opening_book))
+        # tabela de transposição de tamanho fixo, partilhada por todos os jogos deste jogador
+        self.tt = TranspositionTable(tt_size_bits)
+
+        # instante (time.time()) e número de nós em que a pesquisa da jogada atual tem de parar (None sem orçamento)
+        self.deadline = None
+        self.node_limit = None
+
+        # processos da pesquisa paralela, criados na primeira pesquisa com workers > 1
+        self.executor = None
+
+        # estatísticas da pesquisa: nós visitados, tempo gasto, jogadas pesquisadas e soma das profundidades completas
+        self.nodes = 0
+        self.search_time = 0.0
+        self.num_searches = 0
+        self.total_depth = 0
+        self.book_hits = 0
+
+        # avaliador incremental, acompanha as jogadas da pesquisa (criado para as dimensões do tabuleiro)
+        self.evaluator = None
+        self.evaluator_size = None
+
+        # ordenação das jogadas: jogadas killer por ply, histórico de cortes por jogador e coluna, distância ao centro
+        self.killers = None
+        self.history = None
+        self.center_distance = None
+
+        # estatísticas dos cortes: total e quantos aconteceram logo na primeira jogada tentada
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    """
+    avalia um estado do zero, para um jogador (por omissão o que vai jogar); durante a pesquisa é usado o avaliador
+    incremental, que só atualiza as janelas da última jogada
+    """
+    def heuristic(self, state: Connect4State, player=None):
+        if player is None:
+            player = self.get_current_player(state)
+        evaluator = Connect4Evaluator(state.get_num_rows(), state.get_num_cols())
+        evaluator.set_state(state)
+        return evaluator.evaluate(player)
+
+    def get_grid(self, state):
+        return state.get_grid()
+
+    def get_current_player(self, state):
+        return state.get_acting_player()
+
+    def simulate_result(self, state: Connect4State, action):
+        #joga a ação numa cópia do estado, que também atualiza a chave zobrist
+        new_state = state.clone()
+        new_state.update(action)
+        return new_state
+
+    def minimax(self, state: Connect4State, depth, alpha, beta, maximizing_player, ply=1):
+        self.nodes += 1
+        if self.nodes % self.BUDGET_CHECK_INTERVAL == 0 and self.is_out_of_budget():
+            raise SearchAborted()
+
+        #chave zobrist canónica do estado (partilhada com a sua imagem ao espelho), atualizada a cada jogada
+        key, mirrored = self.get_key(state, maximizing_player)
+        tt_value = self.tt.probe(key, depth, alpha, beta)
+        if tt_value is not None:
+            return tt_value
+
+        if depth == 0 or self.is_game_over(state):
+            #avaliação do estado atual, sempre do ponto de vista deste jogador (o que maximiza), para que profundidades
+            #pares e ímpares deem valores comparáveis; o avaliador já está atualizado com as jogadas até aqui
+            player = self.get_current_player(state) if maximizing_player else 1 - self.get_current_player(state)
+            eval = self.evaluator.evaluate(player)
+            self.tt.store(key, eval, depth, TranspositionTable.EXACT) #armazena o valor calculado na tabela
+            return eval
+
+        alpha_orig, beta_orig = alpha, beta
+        best_col = TranspositionTable.NO_MOVE
+        if maximizing_player:
+            max_eval = float('-inf')
+            #ordena as ações possíveis: jogada da tabela de transposição, vitórias e melhor avaliação primeiro
+            for index, action in enumerate(self.order_actions(state, key, mirrored, ply)):
+                #chama recursivamente o método minimax com a profundidade reduzida
+                eval = self.minimax(self.play(state, action), depth - 1, alpha, beta, False, ply + 1)
+                self.evaluator.unmake()
+                if eval > max_eval:
+                    max_eval = eval
+                    best_col = action.get_col()
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    self.record_cutoff(state, action, depth, ply, index)
+                    break
+            self.store(key, max_eval, depth, alpha_orig, beta_orig, self.canonical_col(state, best_col, mirrored))
+            return max_eval
+        else:
+            min_eval = float('inf')
+            for index, action in enumerate(self.order_actions(state, key, mirrored, ply)):
+                eval = self.minimax(self.play(state, action), depth - 1, alpha, beta, True, ply + 1)
+                self.evaluator.unmake()
+                if eval < min_eval:
+                    min_eval = eval
+                    best_col = action.get_col()
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    self.record_cutoff(state, action, depth, ply, index)
+                    break
+            self.store(key, min_eval, depth, alpha_orig, beta_orig, self.canonical_col(state, best_col, mirrored))
+            return min_eval
+
+    """
+    regista um corte beta: a jogada passa a ser uma jogada killer deste ply e ganha pontos no histórico do jogador,
+    para ser tentada mais cedo noutros nós
+    """
+    def record_cutoff(self, state: Connect4State, action, depth, ply, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        col = action.get_col()
+        killers = self.killers[ply]
+        if killers[0] != col:
+            killers[1] = killers[0]
+            killers[0] = col
+        self.history[self.get_current_player(state)][col] += depth * depth
+
+    def store(self, key, value, depth, alpha, beta, best_col):
+        #o valor só é exato se ficou dentro da janela (alpha, beta) com que o nó foi pesquisado
+        if value <= alpha:
+            bound = TranspositionTable.UPPER
+        elif value >= beta:
+            bound = TranspositionTable.LOWER
+        else:
+            bound = TranspositionTable.EXACT
+        self.tt.store(key, value, depth, bound, best_col)
+
+    def is_game_over(self, state: Connect4State):
+        #o estado sabe se já há um vencedor ou se o tabuleiro está cheio
+        return state.is_finished()
+
+    def get_action(self, state: Connect4State):
+        #as posições do livro de aberturas já foram pesquisadas offline, mais a fundo
+        book_action = self.get_book_action(state)
+        if book_action is not None:
+            self.book_hits += 1
+            return book_action
+
+        best_action, _, _ = self.search(state)
+        return best_action
+
+    """
+    pesquisa a melhor jogada para o jogador a jogar
+    :returns: a melhor jogada, o seu valor (do ponto de vista do jogador a jogar) e a profundidade pesquisada
+    """
+    def search(self, state: Connect4State):
+        start_time = time.time()
+        self.start_search(state)
+
+        if self.workers > 1:
+            best_action, best_score, depth = self.search_parallel(state, start_time)
+        elif self.time_budget is None and self.node_budget is None:
+            (best_action, best_score), depth = self.search_fixed_depth(state), self.depth
+        else:
+            best_action, best_score, depth = self.search_iterative_deepening(state, start_time)
+
+        self.search_time += time.time() - start_time
+        self.num_searches += 1
+        self.total_depth += depth
+        return best_action, best_score, depth
+
+    def search_fixed_depth(self, state: Connect4State):
+        start_time = time.time()
+        best_score = float('-inf') #inicializa a melhor pontuação com um valor muito baixo
+        best_action = None
+
+        for action in self.order_root_actions(state):
+            #simula o resultado e chama recursivamente o método minimax com a profundidade reduzida
+            eval = self.minimax(self.play(state, action), self.depth - 1, float('-inf'), float('inf'), False)
+            self.evaluator.unmake()
+            if eval > best_score:
+                best_score = eval
+                best_action = action
+            if time.time() - start_time > 1:
+                break
+        return best_action, best_score
+
+    """
+    pesquisa com profundidades 1, 2, 3, ... até acabar o orçamento (de tempo ou de nós) ou chegar ao fim do jogo,
+    começando cada iteração pela melhor jogada da anterior; uma iteração interrompida é descartada
+    :returns: a melhor jogada, o seu valor e a profundidade da última iteração completa
+    """
+    def search_iterative_deepening(self, state: Connect4State, start_time):
+        self.deadline = None if self.time_budget is None else start_time + self.time_budget
+        self.node_limit = None if self.node_budget is None else self.nodes + self.node_budget
+        sorted_actions = self.order_root_actions(state)
+        best_action, best_score, completed_depth = sorted_actions[0], float('-inf'), 0
+        empty_cells = sum(cell == Connect4State.EMPTY_CELL for row in self.get_grid(state) for cell in row)
+
+        try:
+            for depth in range(1, empty_cells + 1):
+                best_action, best_score = self.search_root(state, sorted_actions, depth)
+                completed_depth = depth
+                #a melhor jogada desta iteração é a primeira a ser pesquisada na seguinte
+                sorted_actions.remove(best_action)
+                sorted_actions.insert(0, best_action)
+                if self.is_out_of_budget():
+                    break
+        except SearchAborted:
+            pass
+        finally:
+            self.deadline = None
+            self.node_limit = None
+
+        return best_action, best_score, completed_depth
+
+    """
+    pesquisa com aprofundamento iterativo em que, em cada iteração, a primeira jogada da raiz (a melhor da iteração
+    anterior) é pesquisada primeiro com a janela completa e o seu valor passa a ser o alpha das outras jogadas, que são
+    pesquisadas em paralelo pelos processos do executor: como na pesquisa sequencial, as jogadas que não o superam são
+    cortadas cedo. O alpha só depende da primeira jogada, por isso o resultado não depende da ordem em que os processos
+    acabam. Com orçamento de nós, a primeira jogada pode gastar metade do que resta e as outras dividem o resto.
+    Cada processo começa cada jogada com uma tabela de transposição só com as entradas que devolveu para essa jogada na
+    iteração anterior; as entradas devolvidas são também juntadas à tabela deste jogador.
+    Sem orçamento de tempo nem de nós, as iterações vão até à profundidade fixa.
+    :returns: a melhor jogada, o seu valor e a profundidade da última iteração completa
+    """
+    def search_parallel(self, state: Connect4State, start_time):
+        executor = self.get_executor()
+        deadline = None if self.time_budget is None else start_time + self.time_budget
+        sorted_actions = self.order_root_actions(state)
+        best_action, best_score, completed_depth = sorted_actions[0], float('-inf'), 0
+
+        if self.time_budget is None and self.node_budget is None:
+            max_depth = self.depth
+        else:
+            max_depth = sum(cell == Connect4State.EMPTY_CELL for row in self.get_grid(state) for cell in row)
+
+        #entradas da tabela de transposição devolvidas para cada jogada da raiz na iteração anterior
+        seeds = {action.get_col(): [] for action in sorted_actions}
+        used_nodes = 0
+
+        for depth in range(1, max_depth + 1):
+            node_limit = None
+            if self.node_budget is not None:
+                node_limit = (self.node_budget - used_nodes) // 2
+                if node_limit <= 0:
+                    break
+
+            first = sorted_actions[0]
+            task = (self.simulate_result(state, first), depth - 1, float('-inf'), node_limit, deadline,
+                    seeds[first.get_col()])
+            results = [executor.submit(_search_root_move, task).result()]
+
+            alpha = results[0][0]
+            if alpha is not None and len(sorted_actions) > 1:
+                if node_limit is not None:
+                    node_limit = (self.node_budget - used_nodes - results[0][1]) // (len(sorted_actions) - 1)
+                tasks = [(self.simulate_result(state, action), depth - 1, alpha, node_limit, deadline,
+                          seeds[action.get_col()]) for action in sorted_actions[1:]]
+                results += executor.map(_search_root_move, tasks)
+
+            aborted = len(results) < len(sorted_actions)
+            for action, (value, nodes, cutoffs, first_move_cutoffs, entries) in zip(sorted_actions, results):
+                used_nodes += nodes
+                self.nodes += nodes
+                self.cutoffs += cutoffs
+                self.first_move_cutoffs += first_move_cutoffs
+                self.tt.store_entries(entries)
+                seeds[action.get_col()] = entries
+                aborted = aborted or value is None
+            if aborted:
+                break
+
+            #a primeira das jogadas com o melhor valor, pela ordem da iteração; as jogadas cortadas valem no máximo
+            #alpha, por isso nunca passam à frente da primeira
+            best_index = max(range(len(results)), key=lambda index: results[index][0])
+            best_action, best_score, completed_depth = sorted_actions[best_index], results[best_index][0], depth
+            sorted_actions.insert(0, sorted_actions.pop(best_index))
+            if deadline is not None and time.time() > deadline:
+                break
+
+        return best_action, best_score, completed_depth
+
+    """
+    pesquisa uma jogada da raiz num processo da pesquisa paralela, a partir do estado a que leva, com o alpha da raiz
+    :returns: o valor (None se o orçamento acabou; no máximo alpha se a jogada não o supera), os nós visitados, os
+    cortes, os cortes na primeira jogada e as entradas da tabela de transposição
+    """
+    def search_subtree(self, state: Connect4State, depth, alpha, node_limit, deadline, seed_entries):
+        #cada pesquisa começa do mesmo estado interno, para que o resultado só dependa dos argumentos
+        self.tt.clear()
+        self.history = None
+        self.evaluator = None
+        self.nodes = self.cutoffs = self.first_move_cutoffs = 0
+        self.tt.store_entries(seed_entries)
+        self.start_search(state)
+
+        self.node_limit = node_limit
+        self.deadline = deadline
+        try:
+            value = self.minimax(state, depth, alpha, float('inf'), False)
+        except SearchAborted:
+            value = None
+        finally:
+            self.node_limit = None
+            self.deadline = None
+
+        return value, self.nodes, self.cutoffs, self.first_move_cutoffs, self.tt.get_entries(self.EXPORT_MIN_DEPTH)
+
+    def is_out_of_budget(self):
+        return (self.deadline is not None and time.time() > self.deadline) or \
+            (self.node_limit is not None and self.nodes >= self.node_limit)
+
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(min(self.tt_size_bits, self.WORKER_TT_SIZE_BITS),))
+            weakref.finalize(self, self.executor.shutdown)
+        return self.executor
+
+    #o executor não pode ser copiado para outro processo, a cópia cria o seu se precisar
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['executor'] = None
+        return state
+
+    def search_root(self, state: Connect4State, sorted_actions, depth):
+        best_score = float('-inf')
+        best_action = None
+        for action in sorted_actions:
+            #a melhor pontuação até agora serve de alpha, as jogadas piores são cortadas mais cedo
+            eval = self.minimax(self.play(state, action), depth - 1, best_score, float('inf'), False)
+            self.evaluator.unmake()
+            if best_action is None or eval > best_score:
+                best_score = eval
+                best_action = action
+        return best_action, best_score
+
+    def order_root_actions(self, state: Connect4State):
+        key, mirrored = self.get_key(state, True)
+        return self.order_actions(state, key, mirrored, 0)
+
+    """
+    ordena as ações sem construir os estados a que levam: primeiro a melhor jogada guardada na tabela de transposição,
+    depois as jogadas que ganham de imediato (last_move_wins do avaliador), depois pela avaliação incremental depois
+    de cada jogada (do ponto de vista de quem joga) e, entre jogadas com a mesma avaliação, as jogadas killer do ply
+    (que causaram cortes em nós irmãos), o histórico de cortes do jogador e as colunas do centro
+    """
+    def order_actions(self, state: Connect4State, key, mirrored, ply):
+        tt_col = self.canonical_col(state, self.tt.get_move(key), mirrored)
+        killers = self.killers[ply]
+        mover = self.get_current_player(state)
+        history = self.history[mover]
+        evaluator = self.evaluator
+
+        def priority(action):
+            col = action.get_col()
+            evaluator.make(col, mover)
+            eval = evaluator.evaluate(mover)
+            win = evaluator.last_move_wins()
+            evaluator.unmake()
+            killer = 2 if col == killers[0] else 1 if col == killers[1] else 0
+            return col == tt_col, win, eval, killer, history[col], -self.center_distance[col]
+
+        return sorted(state.get_possible_actions(), key=priority, reverse=True)
+
+    """
+    pesquisa um estado até uma profundidade fixa, sem limite de tempo (usado para construir o livro de aberturas)
+    :returns: a melhor jogada e o seu valor
+    """
+    def search_to_depth(self, state: Connect4State, depth):
+        self.start_search(state)
+        return self.search_root(state, self.order_root_actions(state), depth)
+
+    #prepara uma nova pesquisa: avaliador incremental na posição do estado, jogadas killer vazias e histórico envelhecido
+    def start_search(self, state: Connect4State):
+        self.tt.new_search() #as entradas das jogadas anteriores passam a ser as primeiras a ser substituídas
+
+        num_rows, num_cols = state.get_num_rows(), state.get_num_cols()
+        if self.evaluator is None or self.evaluator_size != (num_rows, num_cols):
+            self.evaluator_size = (num_rows, num_cols)
+            self.evaluator = Connect4Evaluator(num_rows, num_cols)
+            self.history = [[0] * num_cols for _ in range(2)]
+            self.center_distance = [abs(2 * col - (num_cols - 1)) for col in range(num_cols)]
+        self.evaluator.set_state(state)
+
+        self.killers = [[TranspositionTable.NO_MOVE, TranspositionTable.NO_MOVE] for _ in range(num_rows * num_cols + 1)]
+        #o histórico de pesquisas anteriores conta menos, as posições já são outras
+        for history in self.history:
+            for col in range(num_cols):
+                history[col] //= 2
+
+    #joga uma ação numa cópia do estado e no avaliador incremental (desfeita com self.evaluator.unmake())
+    def play(self, state: Connect4State, action):
+        self.evaluator.make(action.get_col(), self.get_current_player(state))
+        return self.simulate_result(state, action)
+
+    """
+    estatísticas da pesquisa: jogadas tiradas do livro, jogadas pesquisadas, nós visitados, nós por segundo,
+    profundidade média completa, cortes beta e a fração deles que aconteceu na primeira jogada tentada, e a fração das
+    consultas à tabela de transposição que encontraram a posição
+    """
+    def get_search_stats(self):
+        tt_probes, tt_hits, _tt_stores = self.tt.get_stats()
+        return {
+            'book_hits': self.book_hits,
+            'searches': self.num_searches,
+            'nodes': self.nodes,
+            'nps': self.nodes / self.search_time if self.search_time > 0 else 0.0,
+            'avg_depth': self.total_depth / self.num_searches if self.num_searches > 0 else 0.0,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / self.cutoffs if self.cutoffs > 0 else 0.0,
+            'tt_hit_rate': tt_hits / tt_probes if tt_probes > 0 else 0.0
+        }
+
+    def print_stats(self):
+        stats = self.get_search_stats()
+        print(f"Player {self.get_name()} | Book moves: {stats['book_hits']} | Moves searched: {stats['searches']} | "
+              f"Nodes: {stats['nodes']} | "
+              f"NPS: {stats['nps']:.0f} | Avg. depth: {stats['avg_depth']:.2f} | Cutoffs: {stats['cutoffs']} "
+              f"({stats['first_move_cutoff_rate']:.1%} on the first move) | TT hits: {stats['tt_hit_rate']:.1%}")
+
+    """
+    chave do estado na tabela de transposição: a chave canónica (ver ZobristKeys.get_canonical), que é a mesma para o
+    estado e para a sua imagem ao espelho, e se é a da imagem ao espelho
+    """
+    def get_key(self, state, maximizing_player):
+        key, mirrored = state.get_canonical_key()
+        return (key ^ self.MAXIMIZING_KEY if maximizing_player else key), mirrored
+
+    #as jogadas da tabela de transposição são as da posição canónica, por isso são espelhadas se a posição o for
+    def canonical_col(self, state, col, mirrored):
+        return ZobristKeys.mirror_col(col, state.get_num_cols(), mirrored)
+
+    def event_action(self, pos, action, state):
+        pass
+
+    def event_end_game(self, state):
+        pass
+
+    def event_new_game(self):
+        pass
+
+    def event_result(self, pos: int, result):
+        pass
+
+
+#jogador usado por cada processo da pesquisa paralela
+_worker_player = None
+
+
+def _init_worker(tt_size_bits):
+    global _worker_player
+    _worker_player = connect4_29344_v1('worker', tt_size_bits=tt_size_bits, opening_book=None)
+
+
+def _search_root_move(args):
+    return _worker_player.search_subtree(*args)
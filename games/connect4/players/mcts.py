@@ -0,0 +1,262 @@
+import math
+import time
+
+from games.connect4.action import Connect4Action
+from games.connect4.player import Connect4Player
+from games.connect4.playout import BitboardPlayout
+from games.connect4.solver import Connect4Solver
+from games.connect4.state import Connect4State
+
+
+class MCTSNode:
+    """
+    A position of the search tree of MCTSConnect4Player, as the bitboards (cells of the player to move, cells of both
+    players) of BitboardPlayout. The rewards of a node are for the player that moved into it, so a parent picks the
+    child with the most rewards. Besides its own visits, each child keeps the AMAF (all moves as first) stats of the
+    playouts in which the player to move of the parent took the cell of the child later on, used by RAVE.
+    """
+    __slots__ = ('col', 'cell', 'current', 'mask', 'player', 'parent', 'children', 'untried', 'terminal', 'visits',
+                 'rewards', 'amaf_visits', 'amaf_rewards')
+
+    """
+    :param col: the column played to reach the node (None for the root)
+    :param cell: the bit of the cell played to reach the node (0 for the root)
+    :param player: the index of the player to move
+    :param untried: the columns that have no child yet, the next one to expand last
+    :param terminal: the reward of the player that moved into the node if the game is over in it, or None
+    """
+    def __init__(self, col, cell, current, mask, player, parent, untried, terminal):
+        self.col = col
+        self.cell = cell
+        self.current = current
+        self.mask = mask
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.terminal = terminal
+        self.visits = 0
+        self.rewards = 0.0
+        self.amaf_visits = 0
+        self.amaf_rewards = 0.0
+
+
+class MCTSConnect4Player(Connect4Player):
+    """
+    Monte Carlo tree search player: UCT with RAVE, over bitboard playouts (see BitboardPlayout).
+
+    Each iteration walks down the tree by UCT, with the value of a child blended with its AMAF value while it has few
+    visits, adds one child, plays a game out from it and backs the result up the path. The tree is kept between
+    moves: the next search starts from the node of the new position if the tree reached it.
+    The move played is the most visited child of the root.
+    """
+
+    # the tree is only dropped at the start of each game
+    SUBSCRIBED_EVENTS = ('event_new_game',)
+
+    """
+    rewards of the player that moved into a node, by the result of the playout for the player to move in it
+    """
+    REWARDS = {BitboardPlayout.WIN: 0.0, BitboardPlayout.DRAW: 0.5, BitboardPlayout.LOSS: 1.0}
+
+    # iterations between checks of the clock
+    TIME_CHECK_INTERVAL = 16
+
+    """
+    :param time_budget: seconds per move
+    :param playout_budget: playouts per move instead of a time budget, so the moves do not depend on the speed of the
+    machine (with a seed, the player always plays the same moves)
+    :param exploration: the UCT exploration constant
+    :param rave_equivalence: the number of visits at which the value of a child and its AMAF value weigh the same
+    (0 disables RAVE)
+    :param tactical_playouts: the playouts take immediate wins and block immediate losses instead of playing randomly
+    :param seed: seed of the playouts
+    """
+    def __init__(self, name, time_budget=1.0, playout_budget=None, exploration=0.7, rave_equivalence=300,
+                 tactical_playouts=True, seed=None):
+        super().__init__(name)
+        self.__time_budget = time_budget
+        self.__playout_budget = playout_budget
+        self.__exploration = exploration
+        self.__rave_equivalence = rave_equivalence
+        self.__tactical_playouts = tactical_playouts
+        self.__seed = seed
+
+        """
+        the playout engine, for the dimensions of the board of the current game
+        """
+        self.__playout = None
+
+        """
+        the root of the tree of the last search, reused by the next one
+        """
+        self.__root = None
+
+        """
+        stats: moves searched, playouts, playouts made on trees kept from a previous move and time searching
+        """
+        self.__num_searches = 0
+        self.__num_playouts = 0
+        self.__num_reused_playouts = 0
+        self.__search_time = 0.0
+
+    def get_action(self, state: Connect4State):
+        start_time = time.time()
+        root = self.__get_root(state)
+        self.__num_reused_playouts += root.visits
+
+        num_playouts = 0
+        while True:
+            self.__run_iteration(root)
+            num_playouts += 1
+            if self.__playout_budget is not None:
+                if num_playouts >= self.__playout_budget:
+                    break
+            elif num_playouts % MCTSConnect4Player.TIME_CHECK_INTERVAL == 0 and \
+                    time.time() - start_time >= self.__time_budget:
+                break
+
+        self.__num_searches += 1
+        self.__num_playouts += num_playouts
+        self.__search_time += time.time() - start_time
+
+        best = max(root.children, key=lambda child: child.visits)
+        return Connect4Action(best.col)
+
+    """
+    gets the node of the position of a state: the node of the last tree that reached it, or a new root
+    """
+    def __get_root(self, state: Connect4State):
+        num_rows, num_cols = state.get_num_rows(), state.get_num_cols()
+        layout = self.__playout.get_layout() if self.__playout is not None else None
+        if layout is None or layout.num_rows != num_rows or layout.num_cols != num_cols:
+            self.__playout = BitboardPlayout(num_rows, num_cols, self.__tactical_playouts, self.__seed)
+            self.__root = None
+
+        current, mask = Connect4Solver.get_position(state)
+        root = self.__find_node(self.__root, current, mask)
+        if root is None:
+            root = self.__new_node(None, 0, current, mask, state.get_acting_player(), None, None)
+        # the rest of the old tree can no longer be reached
+        root.parent = None
+        self.__root = root
+        return root
+
+    # looks for a position in the first plies of a tree (a few moves were played since the tree was built)
+    def __find_node(self, node, current, mask, max_plies=2):
+        if node is None or node.mask & ~mask:
+            return None
+        if node.mask == mask:
+            return node if node.current == current else None
+        if max_plies > 0:
+            for child in node.children:
+                if not child.cell & ~mask:
+                    found = self.__find_node(child, current, mask, max_plies - 1)
+                    if found is not None:
+                        return found
+        return None
+
+    def __new_node(self, col, cell, current, mask, player, parent, terminal):
+        layout = self.__playout.get_layout()
+        untried = []
+        if terminal is None:
+            # the center columns are expanded first
+            untried = sorted((col for col in range(layout.num_cols) if not mask & layout.top_masks[col]),
+                             key=lambda col: -abs(2 * col - (layout.num_cols - 1)))
+        return MCTSNode(col, cell, current, mask, player, parent, untried, terminal)
+
+    # adds the child of the next untried column of a node
+    def __expand(self, node):
+        layout = self.__playout.get_layout()
+        col = node.untried.pop()
+        cell = (node.mask + layout.bottom_masks[col]) & layout.column_masks[col]
+        mask = node.mask | cell
+        if layout.has_four(node.current | cell):
+            terminal = 1.0
+        elif mask == layout.board_mask:
+            terminal = 0.5
+        else:
+            terminal = None
+        # the cells of the player to move in the child are the cells of both players not held by the one that moved
+        child = self.__new_node(col, cell, node.current ^ node.mask, mask, 1 - node.player, node, terminal)
+        node.children.append(child)
+        return child
+
+    # the child with the best UCT value, blended with its AMAF value by RAVE
+    def __select_child(self, node):
+        log_visits = math.log(node.visits)
+        exploration = self.__exploration
+        equivalence = self.__rave_equivalence
+        best, best_value = None, -math.inf
+        for child in node.children:
+            value = child.rewards / child.visits
+            if equivalence > 0 and child.amaf_visits > 0:
+                beta = math.sqrt(equivalence / (3 * child.visits + equivalence))
+                value = (1 - beta) * value + beta * child.amaf_rewards / child.amaf_visits
+            value += exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def __run_iteration(self, root):
+        # selection and expansion
+        node = root
+        while node.terminal is None and not node.untried:
+            node = self.__select_child(node)
+        if node.terminal is None:
+            node = self.__expand(node)
+
+        # simulation
+        if node.terminal is not None:
+            reward, current, mask = node.terminal, node.current, node.mask
+        else:
+            result, current, mask = self.__playout.run(node.current, node.mask)
+            reward = MCTSConnect4Player.REWARDS[result]
+
+        # the cells each player held at the end of the game, for the AMAF stats
+        cells = [0, 0]
+        cells[node.player] = current
+        cells[1 - node.player] = current ^ mask
+
+        # backpropagation, the reward is for the player that moved into the node
+        while node is not root:
+            node.visits += 1
+            node.rewards += reward
+            parent = node.parent
+            later_cells = cells[parent.player]
+            for sibling in parent.children:
+                if sibling.cell & later_cells:
+                    sibling.amaf_visits += 1
+                    sibling.amaf_rewards += reward
+            reward = 1.0 - reward
+            node = parent
+        root.visits += 1
+        root.rewards += reward
+
+    """
+    gets the search stats: moves searched, playouts, playouts per second and playouts kept from previous moves
+    """
+    def get_search_stats(self):
+        return {
+            'searches': self.__num_searches,
+            'playouts': self.__num_playouts,
+            'pps': self.__num_playouts / self.__search_time if self.__search_time > 0 else 0.0,
+            'reused_playouts': self.__num_reused_playouts
+        }
+
+    def print_stats(self):
+        stats = self.get_search_stats()
+        print(f"Player {self.get_name()} | Moves searched: {stats['searches']} | Playouts: {stats['playouts']} | "
+              f"Playouts/s: {stats['pps']:.0f} | Reused playouts: {stats['reused_playouts']}")
+
+    def event_action(self, pos, action, state):
+        pass
+
+    def event_end_game(self, state):
+        pass
+
+    def event_new_game(self):
+        self.__root = None
+
+    def event_result(self, pos: int, result):
+        pass
@@ -0,0 +1,101 @@
+import random
+
+from games.connect4.bitboard import BitboardLayout
+
+
+class BitboardPlayout:
+    """
+    Plays connect 4 games out to the end from a position given as bitboards (see BitboardLayout), for Monte Carlo
+    players. A position is the pair (cells of the player to move, cells of both players), as in Connect4Solver.
+
+    A playout only works on ints and the precomputed masks of the layout: no states, actions or lists are built while
+    it runs, so it is many times faster than playing the game with Connect4State.clone() and update().
+    With tactical playouts, a player that can win at once does so and a player that must block the single threat of
+    the opponent does so; every other move is a random column.
+    """
+
+    WIN = 1
+    DRAW = 0
+    LOSS = -1
+
+    """
+    :param tactical: play the winning and blocking moves instead of random ones
+    :param seed: seed of the random moves, so the playouts can be repeated
+    """
+    def __init__(self, num_rows: int = 6, num_cols: int = 7, tactical: bool = True, seed=None):
+        self.__layout = BitboardLayout.get(num_rows, num_cols)
+        self.__tactical = tactical
+        self.__random = random.Random(seed)
+
+    def get_layout(self):
+        return self.__layout
+
+    """
+    plays a game out from a position that is not finished
+    :param current: the cells of the player to move
+    :param mask: the cells of both players
+    :returns: WIN, DRAW or LOSS for the player to move, and the cells of that player and of both players at the end
+    """
+    def run(self, current: int, mask: int):
+        layout = self.__layout
+        column_masks = layout.column_masks
+        bottom_masks = layout.bottom_masks
+        top_masks = layout.top_masks
+        bottom_mask = layout.bottom_mask
+        board_mask = layout.board_mask
+        num_cols = layout.num_cols
+        get_winning_cells = layout.get_winning_cells
+        has_four = layout.has_four
+        tactical = self.__tactical
+        next_random = self.__random.random
+
+        # the player who started the playout is the one to move while this is True
+        own_turn = True
+
+        # with tactical playouts, the empty cells where the player to move and the opponent would win; each move only
+        # changes the cells of one player, so only its winning cells are computed again
+        if tactical:
+            wins = get_winning_cells(current, mask)
+            opponent_wins = get_winning_cells(current ^ mask, mask)
+
+        while True:
+            playable = (mask + bottom_mask) & board_mask
+            if not playable:
+                result = BitboardPlayout.DRAW
+                break
+
+            move = 0
+            if tactical:
+                if wins & playable:
+                    wins &= playable
+                    move = wins & -wins
+                    current |= move
+                    mask |= move
+                    result = BitboardPlayout.WIN if own_turn else BitboardPlayout.LOSS
+                    break
+                threats = opponent_wins & playable
+                if threats:
+                    # the lowest threat; with two of them the opponent wins anyway
+                    move = threats & -threats
+
+            if not move:
+                col = int(next_random() * num_cols)
+                while mask & top_masks[col]:
+                    col = int(next_random() * num_cols)
+                move = (mask + bottom_masks[col]) & column_masks[col]
+
+            current |= move
+            mask |= move
+            if tactical:
+                wins, opponent_wins = opponent_wins & ~move, get_winning_cells(current, mask)
+            elif has_four(current):
+                result = BitboardPlayout.WIN if own_turn else BitboardPlayout.LOSS
+                break
+
+            # the opponent is now the player to move
+            current ^= mask
+            own_turn = not own_turn
+
+        if not own_turn:
+            current ^= mask
+        return result, current, mask
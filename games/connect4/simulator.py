@@ -1,20 +1,55 @@
 from games.connect4.action import Connect4Action
+from games.connect4.bitboard_state import Connect4BitboardState
 from games.connect4.player import Connect4Player
+from games.connect4.result import Connect4Result
+from games.connect4.solver import Connect4Solver
 from games.connect4.state import Connect4State
 from games.game_simulator import GameSimulator
 
 
 class Connect4Simulator(GameSimulator):
 
-    def __init__(self, players, num_rows: int = 6, num_cols: int = 7):
+    """
+    :param bitboard: play the games with the bitboard state instead of the grid state
+    :param solver_empty_cells: once a game has at most this number of empty cells, every move is checked with the
+    endgame solver, counting the blunders of each player: moves that turn a won position into a draw or a loss, or a
+    drawn position into a loss (0 to turn the solver off)
+    :param adjudicate: end each game as soon as the solver proves its result, instead of playing it out
+    """
+    def __init__(self, players, num_rows: int = 6, num_cols: int = 7, bitboard: bool = False,
+                 solver_empty_cells: int = 0, adjudicate: bool = False):
         super(Connect4Simulator, self).__init__(players)
         """
         the number of rows and cols from the connect4 grid
         """
         self.__num_rows = num_rows
         self.__num_cols = num_cols
+        """
+        play the games with the bitboard state instead of the grid state
+        """
+        self.__bitboard = bitboard
+
+        """
+        the endgame solver, shared by all games so its cache is reused
+        """
+        self.__solver = Connect4Solver(solver_empty_cells) if solver_empty_cells > 0 else None
+        self.__adjudicate = adjudicate and self.__solver is not None
+
+        """
+        the solved value of the current position for the player to move (None if not solved)
+        """
+        self.__solution = None
+
+        """
+        number of moves checked by the solver and number of blunders, by player name
+        """
+        self.__solved_moves = {player.get_name(): 0 for player in players}
+        self.__blunders = {player.get_name(): 0 for player in players}
 
     def on_init_game(self):
+        self.__solution = None
+        if self.__bitboard:
+            return Connect4BitboardState(self.__num_rows, self.__num_cols)
         return Connect4State(self.__num_rows, self.__num_cols)
 
     def on_before_end_game(self, state: Connect4State):
@@ -26,8 +61,64 @@ class Connect4Simulator(GameSimulator):
         pass
 
     def on_state_update(self, state):
-        # ignored for this simulator
-        pass
+        if self.__solver is None:
+            return
+
+        # the value of the position for the player that just moved, before and after the move
+        previous_solution = self.__solution
+        self.__solution = None if state.is_finished() else self.__solver.solve(state)
+        if previous_solution is None:
+            if self.__solution is not None and self.__adjudicate:
+                self.__adjudicate_state(state)
+            return
+
+        mover = 1 - state.get_acting_player()
+        if state.is_finished():
+            value = Connect4Solver.DRAW if state.get_result(mover) == Connect4Result.DRAW.value else Connect4Solver.WIN
+        else:
+            value = -self.__solution
+
+        name = self.get_player_positions()[mover].get_name()
+        self.__solved_moves[name] += 1
+        if value < previous_solution:
+            self.__blunders[name] += 1
+
+        if self.__adjudicate and not state.is_finished():
+            self.__adjudicate_state(state)
+
+    # ends the game with the result the solver proved for the current position
+    def __adjudicate_state(self, state):
+        acting_player = state.get_acting_player()
+        if self.__solution == Connect4Solver.WIN:
+            state.adjudicate(acting_player)
+        elif self.__solution == Connect4Solver.LOSS:
+            state.adjudicate(1 - acting_player)
+        else:
+            state.adjudicate(None)
+
+    """
+    gets the number of moves checked by the solver and the number of blunders, by player name
+    """
+    def get_blunder_stats(self):
+        return {name: {'moves': self.__solved_moves[name], 'blunders': self.__blunders[name]}
+                for name in self.__solved_moves}
+
+    def print_stats(self):
+        super().print_stats()
+        if self.__solver is None or self.__adjudicate:
+            return
+        blunder_stats = self.get_blunder_stats()
+        for player in self.get_players():
+            name, stats = player.get_name(), blunder_stats[player.get_name()]
+            rate = stats['blunders'] / stats['moves'] if stats['moves'] > 0 else 0.0
+            print(f"Player {name} | Solved moves: {stats['moves']} | Blunders: {stats['blunders']} "
+                  f"| Blunder rate: {rate:.2%}")
+
+    def merge_results(self, other):
+        super().merge_results(other)
+        for name, stats in other.get_blunder_stats().items():
+            self.__solved_moves[name] += stats['moves']
+            self.__blunders[name] += stats['blunders']
 
     @staticmethod
     def get_player_type():
@@ -0,0 +1,152 @@
+from games.connect4.bitboard import BitboardLayout
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.state import Connect4State
+
+
+class Connect4Solver:
+    """
+    Perfect-play solver for connect 4 endgames: a negamax search with alpha-beta pruning over bitboards (see
+    BitboardLayout) that finds if the player to move wins, draws or loses.
+    Positions are only solved if they have at most a given number of empty cells, so the search stays small.
+
+    A position is the pair (cells of the player to move, cells of both players). The search plays immediate wins
+    right away, answers the single threat of the opponent or gives up on two, never plays under an opponent's
+    winning cell and tries the center columns first. The bounds found for each position are kept in a cache, keyed by
+    cells of the player to move + cells of both players (which is unique per position), so the cache can be shared by
+    the solves of all the positions of a game, and of all games. A position and its mirror image share the lowest of
+    their keys, as they have the same value.
+    """
+
+    WIN = 1
+    DRAW = 0
+    LOSS = -1
+
+    """
+    :param max_empty_cells: positions with more empty cells than this are not solved
+    :param max_cache_entries: the cache is emptied once it holds this number of positions
+    """
+    def __init__(self, max_empty_cells: int = 12, max_cache_entries: int = 1000000):
+        self.__max_empty_cells = max_empty_cells
+        self.__max_cache_entries = max_cache_entries
+
+        """
+        lower and upper bounds of the value of the positions already searched, by position key
+        """
+        self.__cache = {}
+
+        """
+        stats: positions solved and nodes searched
+        """
+        self.__num_solves = 0
+        self.__num_nodes = 0
+
+        # set by each solve, for the dimensions of the board being solved
+        self.__layout = None
+        self.__column_order = None
+
+    def get_max_empty_cells(self):
+        return self.__max_empty_cells
+
+    """
+    gets the cells of the player to move and of both players of a state, as bitboards of its layout
+    """
+    @staticmethod
+    def get_position(state: Connect4State):
+        layout = BitboardLayout.get(state.get_num_rows(), state.get_num_cols())
+        if isinstance(state, Connect4BitboardState):
+            positions = state.get_bitboards()
+        else:
+            positions = [0, 0]
+            grid = state.get_grid()
+            for row in range(layout.num_rows):
+                for col in range(layout.num_cols):
+                    if grid[row][col] != Connect4State.EMPTY_CELL:
+                        positions[grid[row][col]] |= 1 << layout.get_bit(row, col)
+        return positions[state.get_acting_player()], positions[0] | positions[1]
+
+    """
+    solves a state that is not finished
+    :returns: WIN, DRAW or LOSS for the player to move, or None if the state has too many empty cells to be solved
+    """
+    def solve(self, state: Connect4State):
+        num_rows, num_cols = state.get_num_rows(), state.get_num_cols()
+        current, mask = Connect4Solver.get_position(state)
+        empty_cells = num_rows * num_cols - bin(mask).count('1')
+        if empty_cells > self.__max_empty_cells:
+            return None
+
+        layout = BitboardLayout.get(num_rows, num_cols)
+        if layout is not self.__layout:
+            # positions of other dimensions could share keys with the cached ones
+            self.__cache.clear()
+            self.__layout = layout
+            self.__column_order = sorted(range(num_cols), key=lambda col: abs(2 * col - (num_cols - 1)))
+
+        if len(self.__cache) >= self.__max_cache_entries:
+            self.__cache.clear()
+
+        self.__num_solves += 1
+        return self.__negamax(current, mask, empty_cells, Connect4Solver.LOSS, Connect4Solver.WIN)
+
+    def __negamax(self, current, mask, empty_cells, alpha, beta):
+        self.__num_nodes += 1
+        layout = self.__layout
+        playable = (mask + layout.bottom_mask) & layout.board_mask
+
+        # win right away
+        if layout.get_winning_cells(current, mask) & playable:
+            return Connect4Solver.WIN
+        if empty_cells <= 1:
+            # the last checker cannot win, so the game is a draw (or the board is already full)
+            return Connect4Solver.DRAW
+
+        # the opponent threatens to win: block it, or lose if there are two threats
+        opponent_wins = layout.get_winning_cells(current ^ mask, mask)
+        forced = playable & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return Connect4Solver.LOSS
+            playable = forced
+
+        # playing under a winning cell of the opponent lets it win
+        moves = playable & ~(opponent_wins >> 1)
+        if not moves:
+            return Connect4Solver.LOSS
+
+        # a position and its mirror image have the same value, so they share the key of the lowest of both
+        key = current + mask
+        key = min(key, layout.mirror(key))
+        lower, upper = self.__cache.get(key, (Connect4Solver.LOSS, Connect4Solver.WIN))
+        alpha, beta = max(alpha, lower), min(beta, upper)
+        if alpha >= beta:
+            return alpha
+        alpha_orig = alpha
+
+        best = Connect4Solver.LOSS
+        for col in self.__column_order:
+            move = moves & layout.column_masks[col]
+            if move:
+                # the cells of the opponent, now to move, are the cells of both players not held by the current one
+                value = -self.__negamax(current ^ mask, mask | move, empty_cells - 1, -beta, -alpha)
+                if value > best:
+                    best = value
+                    if value > alpha:
+                        alpha = value
+                        if alpha >= beta:
+                            break
+
+        # the value is a lower bound if the search failed high, an upper bound if it failed low
+        if best >= beta:
+            lower = max(lower, best)
+        elif best <= alpha_orig:
+            upper = min(upper, best)
+        else:
+            lower = upper = best
+        self.__cache[key] = (lower, upper)
+        return best
+
+    """
+    gets the solver stats: positions solved, nodes searched and positions cached
+    """
+    def get_stats(self):
+        return self.__num_solves, self.__num_nodes, len(self.__cache)
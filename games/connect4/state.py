@@ -4,6 +4,7 @@ from termcolor import colored
 
 from games.connect4.action import Connect4Action
 from games.connect4.result import Connect4Result
+from games.connect4.zobrist import ZobristKeys
 from games.state import State
 
 
@@ -44,6 +45,25 @@ class Connect4State(State):
         """
         self.__has_winner = False
 
+        """
+        determine if the game was adjudicated before its end, and the index of the winner (None for a draw)
+        """
+        self.__adjudicated = False
+        self.__adjudicated_winner = None
+
+        """
+        the zobrist keys for the dimensions of the board, the key of the current position and the key of its mirror
+        image
+        """
+        self.__zobrist = ZobristKeys.get(num_rows, num_cols)
+        self.__zobrist_key = self.__zobrist.empty
+        self.__zobrist_mirrored_key = self.__zobrist.empty
+
+        """
+        the read-only copy of the grid given once the state is frozen, built on first use
+        """
+        self.__frozen_grid = None
+
     def __check_winner(self, player):
         # check for 4 across
         for row in range(0, self.__num_rows):
@@ -83,9 +103,36 @@ class Connect4State(State):
 
         return False
 
+    """
+    gets the grid; a frozen state is shared by several players, so it gives a read-only copy (a tuple of row tuples)
+    instead of its own grid, built once and shared by all the calls
+    """
     def get_grid(self):
+        if self.is_frozen():
+            if self.__frozen_grid is None:
+                self.__frozen_grid = tuple(tuple(row) for row in self.__grid)
+            return self.__frozen_grid
         return self.__grid
 
+    """
+    gets the zobrist key of the current position, see ZobristKeys
+    """
+    def get_zobrist_key(self) -> int:
+        return self.__zobrist_key
+
+    """
+    gets the zobrist key of the mirror image of the current position (the board flipped left to right)
+    """
+    def get_mirrored_zobrist_key(self) -> int:
+        return self.__zobrist_mirrored_key
+
+    """
+    gets the canonical key of the current position, shared with its mirror image, see ZobristKeys.get_canonical
+    :returns: the canonical key and if the moves stored with it are mirrored
+    """
+    def get_canonical_key(self):
+        return ZobristKeys.get_canonical(self.get_zobrist_key(), self.get_mirrored_zobrist_key())
+
     def get_num_players(self):
         return 2
 
@@ -103,12 +150,16 @@ class Connect4State(State):
         return True
 
     def update(self, action: Connect4Action):
+        self.check_mutable("updated")
         col = action.get_col()
 
         # drop the checker
         for row in range(self.__num_rows - 1, -1, -1):
             if self.__grid[row][col] < 0:
                 self.__grid[row][col] = self.__acting_player
+                self.__zobrist_key ^= self.__zobrist.cells[self.__acting_player][row][col]
+                self.__zobrist_mirrored_key ^= \
+                    self.__zobrist.cells[self.__acting_player][row][self.__num_cols - 1 - col]
                 break
 
         # determine if there is a winner
@@ -119,8 +170,8 @@ class Connect4State(State):
 
         self.__turns_count += 1
 
-    def __display_cell(self, row, col):
-        cell_value = self.__grid[row][col]
+    def __display_cell(self, grid, row, col):
+        cell_value = grid[row][col]
         if cell_value == 0:
             # Player 1 - Red
             print(colored('●', 'red'), end="")
@@ -132,25 +183,27 @@ class Connect4State(State):
             print(' ', end="")
 
     def __display_numbers(self):
-        for col in range(0, self.__num_cols):
+        for col in range(0, self.get_num_cols()):
             if col < 10:
                 print(' ', end="")
             print(col, end="")
         print("")
 
     def __display_separator(self):
-        for col in range(0, self.__num_cols):
+        for col in range(0, self.get_num_cols()):
             print("--", end="")
         print("-")
 
     def display(self):
+        # the grid is read through get_grid so subclasses with other board representations can be displayed too
+        grid = self.get_grid()
         self.__display_numbers()
         self.__display_separator()
 
-        for row in range(0, self.__num_rows):
+        for row in range(0, self.get_num_rows()):
             print('|', end="")
-            for col in range(0, self.__num_cols):
-                self.__display_cell(row, col)
+            for col in range(0, self.get_num_cols()):
+                self.__display_cell(grid, row, col)
                 print('|', end="")
             print("")
             self.__display_separator()
@@ -161,23 +214,44 @@ class Connect4State(State):
     def __is_full(self):
         return self.__turns_count > (self.__num_cols * self.__num_rows)
 
+    """
+    ends the game before it is played out, with a known result
+    :param winner: the index of the winning player, or None for a draw
+    """
+    def adjudicate(self, winner: Optional[int]):
+        self.check_mutable("adjudicated")
+        self.__adjudicated = True
+        self.__adjudicated_winner = winner
+
     def is_finished(self) -> bool:
-        return self.__has_winner or self.__is_full()
+        return self.__has_winner or self.__is_full() or self.__adjudicated
 
     def get_acting_player(self) -> int:
         return self.__acting_player
 
     def clone(self):
-        cloned_state = Connect4State(self.__num_rows, self.__num_cols)
+        # the constructor is skipped, it would only build an empty grid to be overwritten
+        cloned_state = Connect4State.__new__(Connect4State)
+        State.__init__(cloned_state)
+        cloned_state.__num_rows = self.__num_rows
+        cloned_state.__num_cols = self.__num_cols
+        cloned_state.__grid = [row.copy() for row in self.__grid]
         cloned_state.__turns_count = self.__turns_count
         cloned_state.__acting_player = self.__acting_player
         cloned_state.__has_winner = self.__has_winner
-        for row in range(0, self.__num_rows):
-            for col in range(0, self.__num_cols):
-                cloned_state.__grid[row][col] = self.__grid[row][col]
+        cloned_state.__adjudicated = self.__adjudicated
+        cloned_state.__adjudicated_winner = self.__adjudicated_winner
+        cloned_state.__zobrist = self.__zobrist
+        cloned_state.__zobrist_key = self.__zobrist_key
+        cloned_state.__zobrist_mirrored_key = self.__zobrist_mirrored_key
+        cloned_state.__frozen_grid = None
         return cloned_state
 
     def get_result(self, pos):
+        if self.__adjudicated:
+            if self.__adjudicated_winner is None:
+                return Connect4Result.DRAW.value
+            return Connect4Result.WIN.value if pos == self.__adjudicated_winner else Connect4Result.LOOSE.value
         if self.__has_winner:
             return Connect4Result.LOOSE.value if pos == self.__acting_player else Connect4Result.WIN.value
         if self.__is_full():
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.batch import Connect4Batch
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.result import Connect4Result
+from games.connect4.state import Connect4State
+
+
+"""
+checks every slot of a batch against its game replayed as a state
+"""
+def assert_slots_match_states(batch):
+    grids = batch.get_grids()
+    finished = batch.get_finished()
+    winners = batch.get_winners()
+    legal = batch.get_legal_moves()
+    results = batch.get_results(0)
+    for index in range(len(batch)):
+        state = batch.get_state(index)
+        assert grids[index].tolist() == [list(row) for row in state.get_grid()]
+        assert finished[index] == state.is_finished()
+        if not state.is_finished():
+            assert legal[index].tolist() == [state.validate_action(Connect4Action(col))
+                                             for col in range(batch.get_num_cols())]
+            assert winners[index] == Connect4Batch.NO_WINNER
+        else:
+            assert not legal[index].any()
+            assert results[index] == state.get_result(0)
+            expected = Connect4Batch.NO_WINNER if state.get_result(0) == 0 else 0 if state.get_result(0) > 0 else 1
+            assert winners[index] == expected
+
+
+@pytest.mark.parametrize('num_rows, num_cols', [(6, 7), (4, 5)])
+def test_random_games_match_states(num_rows, num_cols):
+    batch = Connect4Batch(200, num_rows, num_cols, seed=1)
+    while not batch.is_finished():
+        batch.play_random()
+        if batch.get_num_steps() % 5 == 0:
+            assert_slots_match_states(batch)
+    assert_slots_match_states(batch)
+
+
+def test_playout_from_an_origin():
+    origin = Connect4BitboardState()
+    for col in (3, 3, 2):
+        origin.update(Connect4Action(col))
+    batch = Connect4Batch(100, origin=origin, seed=2)
+    assert batch.get_acting_player() == 1
+    winners = batch.playout()
+    assert batch.is_finished()
+    assert type(batch.get_state(0)) is Connect4BitboardState
+    assert (winners == batch.get_winners()).all()
+    assert_slots_match_states(batch)
+    # the results of both players are opposite
+    assert (batch.get_results(0) == -batch.get_results(1)).all()
+    assert set(batch.get_results(0).tolist()) <= {result.value for result in Connect4Result}
+
+
+def test_seed_makes_playouts_repeatable():
+    assert (Connect4Batch(50, seed=7).playout() == Connect4Batch(50, seed=7).playout()).all()
+
+
+def test_invalid_moves_and_origins_raise():
+    batch = Connect4Batch(2)
+    with pytest.raises(ValueError):
+        batch.play(np.array([0, 7]))
+    for _ in range(6):
+        batch.play(np.array([0, 1]))
+    with pytest.raises(ValueError):
+        batch.play(np.array([0, 2]))
+
+    finished = Connect4State()
+    for col in (0, 1, 0, 1, 0, 1, 0):
+        finished.update(Connect4Action(col))
+    with pytest.raises(ValueError):
+        Connect4Batch(2, origin=finished)
+    with pytest.raises(ValueError):
+        Connect4Batch(2, 8, 8)
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.state import Connect4State
+
+"""
+the board sizes the games are played on: the standard board, a small one and a wide one
+"""
+BOARD_SIZES = [(6, 7), (4, 4), (5, 8)]
+
+
+"""
+checks that a bitboard state describes the same position as a grid state
+"""
+def assert_same_position(grid_state, bitboard_state):
+    assert bitboard_state.get_grid() == grid_state.get_grid()
+    assert bitboard_state.get_acting_player() == grid_state.get_acting_player()
+    assert bitboard_state.is_finished() == grid_state.is_finished()
+    assert [action.get_col() for action in bitboard_state.get_possible_actions()] == \
+        [action.get_col() for action in grid_state.get_possible_actions()]
+    assert bitboard_state.get_zobrist_key() == grid_state.get_zobrist_key()
+    assert bitboard_state.get_mirrored_zobrist_key() == grid_state.get_mirrored_zobrist_key()
+
+
+@pytest.mark.parametrize('num_rows, num_cols', BOARD_SIZES)
+def test_random_games_match_grid_state(num_rows, num_cols):
+    generator = random.Random(num_rows * num_cols)
+    for _ in range(50):
+        grid_state, bitboard_state = Connect4State(num_rows, num_cols), Connect4BitboardState(num_rows, num_cols)
+        assert_same_position(grid_state, bitboard_state)
+        while not grid_state.is_finished():
+            col = generator.choice(grid_state.get_possible_actions()).get_col()
+            grid_state.update(Connect4Action(col))
+            bitboard_state.update(Connect4Action(col))
+            assert_same_position(grid_state, bitboard_state)
+        assert [bitboard_state.get_result(pos) for pos in range(2)] == [grid_state.get_result(pos) for pos in range(2)]
+
+
+def test_invalid_actions_match_grid_state():
+    grid_state, bitboard_state = Connect4State(), Connect4BitboardState()
+    for _ in range(grid_state.get_num_rows()):
+        grid_state.update(Connect4Action(0))
+        bitboard_state.update(Connect4Action(0))
+    for col in (-1, 0, 7):
+        assert not grid_state.validate_action(Connect4Action(col))
+        assert not bitboard_state.validate_action(Connect4Action(col))
+
+
+def test_clone_is_independent():
+    state = Connect4BitboardState()
+    state.update(Connect4Action(3))
+    copy = state.clone()
+    copy.update(Connect4Action(3))
+    assert copy.get_grid() != state.get_grid()
+    assert copy.get_zobrist_key() != state.get_zobrist_key()
+    assert state.get_acting_player() == 1 and copy.get_acting_player() == 0
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.evaluation import Connect4Evaluator, WindowTable
+from games.connect4.state import Connect4State
+
+
+"""
+scores a grid for player 0 from scratch: every window of 4 cells held by a single player, and the checkers of the
+center columns
+"""
+def score_grid(grid):
+    num_rows, num_cols = len(grid), len(grid[0])
+    score = 0
+    for row_step, col_step in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+        for row in range(num_rows):
+            for col in range(num_cols):
+                cells = [(row + i * row_step, col + i * col_step) for i in range(4)]
+                if not all(0 <= cell_row < num_rows and 0 <= cell_col < num_cols for cell_row, cell_col in cells):
+                    continue
+                checkers = [grid[cell_row][cell_col] for cell_row, cell_col in cells]
+                if 1 not in checkers:
+                    score += Connect4Evaluator.WINDOW_SCORES[checkers.count(0)]
+                elif 0 not in checkers:
+                    score -= Connect4Evaluator.WINDOW_SCORES[checkers.count(1)]
+    for row in range(num_rows):
+        for col in range(num_cols):
+            if grid[row][col] != Connect4State.EMPTY_CELL and abs(2 * col - (num_cols - 1)) <= 1:
+                score += Connect4Evaluator.CENTER_SCORE if grid[row][col] == 0 else -Connect4Evaluator.CENTER_SCORE
+    return score
+
+
+@pytest.mark.parametrize('num_rows, num_cols', [(6, 7), (5, 8)])
+def test_incremental_score_matches_score_from_scratch(num_rows, num_cols):
+    generator = random.Random(num_cols)
+    for _ in range(20):
+        state = Connect4State(num_rows, num_cols)
+        evaluator = Connect4Evaluator(num_rows, num_cols)
+        scores = [evaluator.evaluate(0)]
+        while not state.is_finished():
+            player = state.get_acting_player()
+            col = generator.choice(state.get_possible_actions()).get_col()
+            state.update(Connect4Action(col))
+            evaluator.make(col, player)
+            assert evaluator.evaluate(0) == score_grid(state.get_grid()) == -evaluator.evaluate(1)
+            # a move wins exactly when it ends the game with a winner
+            assert evaluator.last_move_wins() == (state.is_finished() and state.get_result(player) > 0)
+            scores.append(evaluator.evaluate(0))
+
+        from_scratch = Connect4Evaluator(num_rows, num_cols)
+        from_scratch.set_state(state)
+        assert from_scratch.evaluate(0) == scores[-1]
+
+        # unmake goes back through the same scores
+        for score in reversed(scores[:-1]):
+            evaluator.unmake()
+            assert evaluator.evaluate(0) == score
+
+
+def test_mirror_images_score_the_same():
+    generator = random.Random(0)
+    for _ in range(20):
+        state, mirror = Connect4State(), Connect4State()
+        for _ in range(generator.randint(1, 20)):
+            col = generator.choice(state.get_possible_actions()).get_col()
+            state.update(Connect4Action(col))
+            mirror.update(Connect4Action(state.get_num_cols() - 1 - col))
+            if state.is_finished():
+                break
+        evaluator, mirror_evaluator = Connect4Evaluator(), Connect4Evaluator()
+        evaluator.set_state(state)
+        mirror_evaluator.set_state(mirror)
+        assert evaluator.evaluate(0) == mirror_evaluator.evaluate(0)
+
+
+def test_window_table_sizes():
+    table = WindowTable.get(6, 7)
+    assert len(table.windows) == 69
+    assert max(len(windows) for row in table.cell_windows for windows in row) == 13
+    assert WindowTable.get(6, 7) is table
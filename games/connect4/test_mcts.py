@@ -0,0 +1,62 @@
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.players.mcts import MCTSConnect4Player
+from games.connect4.state import Connect4State
+
+
+"""
+plays a list of columns from the empty board
+"""
+def play(cols, state_type=Connect4State):
+    state = state_type()
+    for col in cols:
+        state.update(Connect4Action(col))
+    return state
+
+
+@pytest.mark.parametrize('state_type', [Connect4State, Connect4BitboardState])
+def test_takes_an_immediate_win(state_type):
+    # player 0 has three in the bottom row, from column 1 to 3
+    state = play([1, 1, 2, 2, 3, 3], state_type)
+    player = MCTSConnect4Player('mcts', playout_budget=300, seed=0)
+    assert player.get_action(state).get_col() in (0, 4)
+
+
+def test_blocks_an_immediate_loss():
+    # player 1 has three in column 6 and player 0, with no win of its own, must block it
+    state = play([0, 6, 1, 6, 5, 6])
+    player = MCTSConnect4Player('mcts', playout_budget=300, seed=0)
+    assert player.get_action(state).get_col() == 6
+
+
+def test_playout_budget_with_seed_is_deterministic():
+    moves = []
+    for _ in range(2):
+        player = MCTSConnect4Player('mcts', playout_budget=200, seed=3)
+        state = Connect4State()
+        game = []
+        for _ in range(6):
+            action = player.get_action(state)
+            game.append(action.get_col())
+            state.update(action)
+        moves.append(game)
+    assert moves[0] == moves[1]
+
+
+def test_tree_is_kept_between_moves():
+    player = MCTSConnect4Player('mcts', playout_budget=200, seed=0)
+    state = Connect4State()
+    action = player.get_action(state)
+    state.update(action)
+    state.update(Connect4Action(3))
+    player.get_action(state)
+    stats = player.get_search_stats()
+    assert stats['searches'] == 2 and stats['playouts'] == 400
+    assert stats['reused_playouts'] > 0
+
+    # a new game starts from an empty tree
+    player.event_new_game()
+    player.get_action(Connect4State())
+    assert player.get_search_stats()['reused_playouts'] == stats['reused_playouts']
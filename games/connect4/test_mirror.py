@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard import BitboardLayout
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.players.connect4_29344_v1 import connect4_29344_v1
+from games.connect4.solver import Connect4Solver
+from games.connect4.state import Connect4State
+from games.connect4.zobrist import ZobristKeys
+
+
+"""
+plays the same random game and its mirror image, and returns both states
+"""
+def play_mirrored(state_type, num_moves, seed):
+    generator = random.Random(seed)
+    state, mirror = state_type(), state_type()
+    for _ in range(num_moves):
+        col = generator.choice(state.get_possible_actions()).get_col()
+        state.update(Connect4Action(col))
+        mirror.update(Connect4Action(state.get_num_cols() - 1 - col))
+        if state.is_finished():
+            break
+    return state, mirror
+
+
+@pytest.mark.parametrize('state_type', [Connect4State, Connect4BitboardState])
+def test_mirror_images_share_the_canonical_key(state_type):
+    for seed in range(20):
+        state, mirror = play_mirrored(state_type, 15, seed)
+        assert state.get_mirrored_zobrist_key() == mirror.get_zobrist_key()
+        key, mirrored = state.get_canonical_key()
+        mirror_key, mirror_mirrored = mirror.get_canonical_key()
+        assert key == mirror_key
+        # a symmetric position is its own mirror image
+        assert mirrored != mirror_mirrored or state.get_zobrist_key() == mirror.get_zobrist_key()
+
+
+def test_mirror_col():
+    assert ZobristKeys.mirror_col(0, 7, True) == 6
+    assert ZobristKeys.mirror_col(2, 7, False) == 2
+    assert ZobristKeys.mirror_col(-1, 7, True) == -1
+
+
+def test_bitboard_mirror():
+    layout = BitboardLayout.get(6, 7)
+    for row, col in ((5, 0), (0, 3), (2, 6)):
+        assert layout.mirror(1 << layout.get_bit(row, col)) == 1 << layout.get_bit(row, 6 - col)
+
+
+def test_search_of_a_mirror_image_mirrors_the_move():
+    player = connect4_29344_v1('mirror', opening_book=None)
+    num_searched = 0
+    for seed in range(6):
+        state, mirror = play_mirrored(Connect4State, 10, seed)
+        if state.is_finished():
+            continue
+        fresh = connect4_29344_v1('fresh', opening_book=None)
+        action, value = fresh.search_to_depth(state, 4)
+        # the second search finds the mirror image in the transposition table of the first one
+        player.search_to_depth(state, 4)
+        mirror_action, mirror_value = player.search_to_depth(mirror, 4)
+        assert mirror_value == value
+        assert mirror_action.get_col() == state.get_num_cols() - 1 - action.get_col()
+        num_searched += 1
+    assert num_searched > 0
+
+
+def test_solver_shares_mirror_images():
+    solver = Connect4Solver(max_empty_cells=12)
+    num_solved = 0
+    for seed in range(40):
+        state, mirror = play_mirrored(Connect4BitboardState, 30, seed)
+        if state.is_finished():
+            continue
+        value = solver.solve(state)
+        nodes = solver.get_stats()[1]
+        assert solver.solve(mirror) == value
+        # the mirror image is found in the cache
+        assert solver.get_stats()[1] == nodes + 1
+        num_solved += 1
+    assert num_solved > 0
@@ -0,0 +1,31 @@
+from games.connect4.action import Connect4Action
+from games.connect4.opening_book import OpeningBook
+from games.connect4.state import Connect4State
+
+
+def test_records_without_a_move_are_skipped(tmp_path):
+    path = str(tmp_path / 'book.bin')
+    state = Connect4State()
+    key, _mirrored = state.get_canonical_key()
+    other = state.clone()
+    other.update(Connect4Action(0))
+    other_key, mirrored = other.get_canonical_key()
+    OpeningBook.write(path, 6, 7, {key: (0.5, 3, 8), other_key: (0.25, OpeningBook.NO_MOVE, 0)})
+
+    book = OpeningBook(path)
+    assert book.lookup(key) == (0.5, 3, 8)
+    assert book.get_move(state) == 3
+    assert book.lookup(other_key) is None
+    assert book.get_move(other) is None
+    assert book.get_entries() == {key: (0.5, 3, 8)}
+    book.close()
+
+
+def test_shipped_book_moves_are_legal():
+    book = OpeningBook(OpeningBook.DEFAULT_PATH)
+    state = Connect4State(book.get_num_rows(), book.get_num_cols())
+    for col in (3, 3, 2, 4):
+        move = book.get_move(state)
+        assert move is not None and state.validate_action(Connect4Action(move))
+        state.update(Connect4Action(col))
+    book.close()
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.solver import Connect4Solver
+from games.connect4.state import Connect4State
+
+
+"""
+gets random positions that are not finished, with a given number of empty cells
+"""
+def get_endgames(state_type, num_rows, num_cols, empty_cells, num_positions, seed):
+    generator = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        state = state_type(num_rows, num_cols)
+        for _ in range(num_rows * num_cols - empty_cells):
+            state.update(generator.choice(state.get_possible_actions()))
+            if state.is_finished():
+                break
+        if not state.is_finished():
+            positions.append(state)
+    return positions
+
+
+"""
+solves a position by trying every game from it: WIN, DRAW or LOSS for the player to move
+"""
+def brute_force(state):
+    best = Connect4Solver.LOSS
+    for action in state.get_possible_actions():
+        next_state = state.clone()
+        next_state.update(action)
+        if next_state.is_finished():
+            # the player who just moved either won or filled the board
+            value = Connect4Solver.WIN if next_state.get_result(state.get_acting_player()) > 0 else Connect4Solver.DRAW
+        else:
+            value = -brute_force(next_state)
+        best = max(best, value)
+        if best == Connect4Solver.WIN:
+            break
+    return best
+
+
+@pytest.mark.parametrize('state_type', [Connect4State, Connect4BitboardState])
+def test_solver_matches_brute_force(state_type):
+    solver = Connect4Solver(max_empty_cells=8)
+    for empty_cells in range(1, 9):
+        for state in get_endgames(state_type, 6, 7, empty_cells, 6, empty_cells):
+            assert solver.solve(state) == brute_force(state)
+
+
+def test_solver_matches_brute_force_on_small_board():
+    # the whole 4x5 board is too big to brute force, but its late middlegames are not
+    solver = Connect4Solver(max_empty_cells=12)
+    for state in get_endgames(Connect4State, 4, 5, 11, 5, 0):
+        assert solver.solve(state) == brute_force(state)
+
+
+def test_positions_with_too_many_empty_cells_are_not_solved():
+    solver = Connect4Solver(max_empty_cells=8)
+    assert solver.solve(Connect4State()) is None
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from games.connect4.players.connect4_29344_v1 import connect4_29344_v1
+from games.connect4.state import Connect4State
+from games.connect4.transposition import TranspositionTable
+
+
+"""
+gets random positions that are not finished, after a number of random moves from the empty board
+"""
+def get_positions(num_positions, max_plies, seed):
+    generator = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        state = Connect4State()
+        for _ in range(generator.randint(0, max_plies)):
+            state.update(generator.choice(state.get_possible_actions()))
+            if state.is_finished():
+                break
+        if not state.is_finished():
+            positions.append(state)
+    return positions
+
+
+"""
+plain minimax, without pruning nor transposition table, with the evaluation of connect4_29344_v1 for the root player
+"""
+def plain_minimax(player, state, depth, maximizing_player, root_player):
+    if depth == 0 or state.is_finished():
+        return player.heuristic(state, root_player)
+    values = []
+    for action in state.get_possible_actions():
+        next_state = state.clone()
+        next_state.update(action)
+        values.append(plain_minimax(player, next_state, depth - 1, not maximizing_player, root_player))
+    return max(values) if maximizing_player else min(values)
+
+
+@pytest.mark.parametrize('depth', [1, 2, 3])
+def test_search_matches_plain_minimax(depth):
+    for state in get_positions(8, 14, depth):
+        player = connect4_29344_v1('tt', opening_book=None)
+        _action, value = player.search_to_depth(state, depth)
+        assert value == plain_minimax(player, state, depth, True, state.get_acting_player())
+
+
+def test_probe_respects_depth_and_bounds():
+    table = TranspositionTable(4)
+    table.store(17, 5.0, 3, TranspositionTable.LOWER, 2)
+    # a lower bound only settles windows it fails high on, and only for searches as deep or shallower
+    assert table.probe(17, 3, 0.0, 4.0) == 5.0
+    assert table.probe(17, 3, 0.0, 6.0) is None
+    assert table.probe(17, 4, 0.0, 4.0) is None
+    assert table.get_move(17) == 2
+    # another key in the same slot is not found
+    assert table.probe(1, 0, 0.0, 4.0) is None
+    assert table.get_move(1) == TranspositionTable.NO_MOVE
+
+    table.store(17, 1.0, 3, TranspositionTable.UPPER)
+    assert table.probe(17, 2, 1.0, 4.0) == 1.0
+    assert table.probe(17, 2, 0.0, 4.0) is None
+    # the move of the previous search of the position is kept
+    assert table.get_move(17) == 2
+
+
+def test_deeper_entries_are_kept_within_a_search():
+    table = TranspositionTable(4)
+    table.store(17, 5.0, 6, TranspositionTable.EXACT)
+    table.store(33, 1.0, 2, TranspositionTable.EXACT)
+    assert table.probe(17, 6, 0.0, 1.0) == 5.0
+    assert table.probe(33, 2, 0.0, 1.0) is None
+
+    table.new_search()
+    table.store(33, 1.0, 2, TranspositionTable.EXACT)
+    assert table.probe(33, 2, 0.0, 1.0) == 1.0
+    assert [entry[0] for entry in table.get_entries()] == [33]
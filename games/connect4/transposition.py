@@ -0,0 +1,147 @@
+from array import array
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results, indexed by the low bits of the zobrist key of the position.
+    Each slot keeps the full key (to detect collisions), the value, the depth it was searched to, the kind of bound
+    the value is and the best move found. The slots are stored in flat arrays, so the memory used is set once by the
+    size and a lookup is an index computation that allocates nothing.
+
+    When two positions fall in the same slot, the new entry replaces the old one if it was searched at least as deep,
+    or if the old one comes from a previous search (see new_search), so deep results survive within a search but stale
+    ones do not fill the table forever.
+    """
+
+    """
+    kinds of bound: the value is exact, a lower bound (the search failed high) or an upper bound (it failed low)
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    NO_MOVE = -1
+
+    """
+    :param size_bits: the table has 2 ** size_bits slots
+    """
+    def __init__(self, size_bits: int = 18):
+        size = 1 << size_bits
+        self.__mask = size - 1
+
+        """
+        the columns of the slots; a key of 0 marks an empty slot
+        """
+        self.__keys = array('Q', bytes(8 * size))
+        self.__values = array('d', bytes(8 * size))
+        self.__depths = array('b', bytes(size))
+        self.__bounds = array('b', bytes(size))
+        self.__moves = array('b', bytes(size))
+        self.__generations = array('B', bytes(size))
+
+        """
+        the current search, entries from older searches are replaced first
+        """
+        self.__generation = 0
+
+        """
+        stats: lookups, lookups that found the position and results that were stored
+        """
+        self.__num_probes = 0
+        self.__num_hits = 0
+        self.__num_stores = 0
+
+    def __len__(self):
+        return self.__mask + 1
+
+    """
+    starts a new search, so the entries of the previous ones become the first to be replaced
+    """
+    def new_search(self):
+        self.__generation = (self.__generation + 1) & 0xFF
+
+    """
+    looks up a position and returns its value if it settles a search of the given depth and window, or None otherwise
+    """
+    def probe(self, key: int, depth: int, alpha: float, beta: float):
+        self.__num_probes += 1
+        slot = key & self.__mask
+        if self.__keys[slot] != key:
+            return None
+        self.__num_hits += 1
+
+        if self.__depths[slot] < depth:
+            return None
+
+        value = self.__values[slot]
+        bound = self.__bounds[slot]
+        if bound == TranspositionTable.EXACT or \
+                (bound == TranspositionTable.LOWER and value >= beta) or \
+                (bound == TranspositionTable.UPPER and value <= alpha):
+            return value
+        return None
+
+    """
+    gets the best move stored for a position (from a search of any depth), or NO_MOVE
+    """
+    def get_move(self, key: int) -> int:
+        slot = key & self.__mask
+        if self.__keys[slot] != key:
+            return TranspositionTable.NO_MOVE
+        return self.__moves[slot]
+
+    """
+    stores the result of searching a position
+    :param value: the value found
+    :param depth: the depth the position was searched to
+    :param bound: EXACT, LOWER or UPPER
+    :param move: the best move found, or NO_MOVE
+    """
+    def store(self, key: int, value: float, depth: int, bound: int, move: int = NO_MOVE):
+        slot = key & self.__mask
+        if self.__keys[slot] != key and self.__generations[slot] == self.__generation and \
+                self.__depths[slot] > depth:
+            return
+
+        # keep the move of a previous search of this position if this one did not find any
+        if move == TranspositionTable.NO_MOVE and self.__keys[slot] == key:
+            move = self.__moves[slot]
+
+        self.__num_stores += 1
+        self.__keys[slot] = key
+        self.__values[slot] = value
+        self.__depths[slot] = depth
+        self.__bounds[slot] = bound
+        self.__moves[slot] = move
+        self.__generations[slot] = self.__generation
+
+    """
+    empties the table
+    """
+    def clear(self):
+        size = self.__mask + 1
+        self.__keys = array('Q', bytes(8 * size))
+        self.__depths = array('b', bytes(size))
+        self.__generations = array('B', bytes(size))
+
+    """
+    gets the entries stored, to merge them into another table (e.g. one of a process searching in parallel)
+    :param min_depth: only the entries searched at least this deep are returned
+    :returns: list of (key, value, depth, bound, move)
+    """
+    def get_entries(self, min_depth: int = 0):
+        return [entry for entry in zip(self.__keys, self.__values, self.__depths, self.__bounds, self.__moves)
+                if entry[0] != 0 and entry[2] >= min_depth]
+
+    """
+    stores entries taken from another table with get_entries, with the same replacement policy as store
+    """
+    def store_entries(self, entries: list):
+        for key, value, depth, bound, move in entries:
+            self.store(key, value, depth, bound, move)
+
+    """
+    gets the lookup stats: (number of probes, number of hits, number of stores)
+    """
+    def get_stats(self):
+        return self.__num_probes, self.__num_hits, self.__num_stores
@@ -0,0 +1,65 @@
+import random
+
+
+class ZobristKeys:
+    """
+    Zobrist keys of a connect 4 board: one random 64 bit key per (player, row, col), row 0 being the top row.
+    The key of a position is the xor of the key of the empty board and the keys of its checkers, so it can be updated
+    with a single xor per move. The empty board has a random key of its own, as the key 0 marks an empty slot in a
+    TranspositionTable.
+    The player to move does not need a key of its own, in connect 4 it follows from the number of checkers.
+    The keys come from a fixed seed, so they are the same in every process and every run.
+
+    A position and its mirror image (the board flipped left to right) are equivalent, so caches are keyed by the
+    canonical key of a position: the lowest of its key and of the key of its mirror image (see get_canonical).
+    """
+
+    SEED = 0xC0DEC4
+
+    """
+    the keys already built, by (num_rows, num_cols)
+    """
+    __keys = {}
+
+    @staticmethod
+    def get(num_rows: int, num_cols: int):
+        key = (num_rows, num_cols)
+        if key not in ZobristKeys.__keys:
+            ZobristKeys.__keys[key] = ZobristKeys(num_rows, num_cols)
+        return ZobristKeys.__keys[key]
+
+    def __init__(self, num_rows: int, num_cols: int):
+        rng = random.Random(ZobristKeys.SEED)
+
+        """
+        the key of the empty board
+        """
+        self.empty = rng.getrandbits(64)
+
+        """
+        the keys of each cell, by player, row and col
+        """
+        self.cells = [[[rng.getrandbits(64) for _col in range(num_cols)] for _row in range(num_rows)]
+                      for _player in range(2)]
+
+    """
+    gets the canonical key of a position, which is the same for the position and its mirror image
+    :param key: the zobrist key of the position
+    :param mirrored_key: the zobrist key of its mirror image
+    :returns: the canonical key, and if it is the key of the mirror image, in which case the columns of the moves
+    stored with it are mirrored as well (see mirror_col)
+    """
+    @staticmethod
+    def get_canonical(key: int, mirrored_key: int):
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    """
+    gets the column of a move in the mirror image of the board, if mirrored is True (moves below 0 are kept)
+    """
+    @staticmethod
+    def mirror_col(col: int, num_cols: int, mirrored: bool) -> int:
+        if not mirrored or col < 0:
+            return col
+        return num_cols - 1 - col
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from games.player import Player
+from games.result_log import ResultLog
 from games.state import State
 
 
@@ -19,11 +20,58 @@ class GameSimulator(ABC):
 
         self.heap_permutation(players, len(players))
 
+        # the players of each permutation (in seat order) that consume each event, so the others are never notified
+        subscribed_events = {player.get_name(): player.get_subscribed_events() for player in players}
+        self.__subscribers = [
+            {event: [player for player in permutation if event in subscribed_events[player.get_name()]]
+             for event in Player.EVENTS}
+            for permutation in self.__permutations
+        ]
+
         # the selected permutation for the current game
         self.__current_permutation = 0
 
+        # whether the players change seats after each game (see set_seat_permutation)
+        self.__seat_permutation = True
+
         # the results of all games between all players
-        self.__results = []
+        self.__results = ResultLog(self.__get_permutation_names())
+
+        # running aggregates of the results, updated as each game finishes so the scores never rescan the results
+        # the mean and the sum of squared differences (m2) are kept with Welford's algorithm, over samples: each game
+        # is a sample, unless the simulator groups games with correlated results (see is_sample_complete)
+        self.__num_games = 0
+        self.__num_samples = 0
+        self.__total_scores = {name: 0 for name in names}
+        self.__mean_scores = {name: 0.0 for name in names}
+        self.__m2_scores = {name: 0.0 for name in names}
+
+        # the scores and the number of games of the sample being played
+        self.__sample_scores = {name: 0 for name in names}
+        self.__sample_games = 0
+
+    def __get_permutation_names(self):
+        return [[player.get_name() for player in permutation] for permutation in self.__permutations]
+
+    """
+    Sets up the result log to move the results to files once it holds more than a number of games.
+    It must be called before any game is played.
+    :param threshold: number of games kept in memory
+    :param directory: directory for the result files, a temporary one is used if not given
+    """
+    def set_results_spill(self, threshold: int, directory: str = None):
+        assert len(self.__results) == 0, "The result log can only be set up before any game is played"
+        self.__results = ResultLog(self.__get_permutation_names(), threshold, directory)
+
+    """
+    Sets whether the players change seats after each game (see change_player_positions), as they do by default.
+    Simulators that group the games of all the permutations of the players (see is_sample_complete) need to know it.
+    """
+    def set_seat_permutation(self, seat_permutation: bool):
+        self.__seat_permutation = seat_permutation
+
+    def uses_seat_permutation(self) -> bool:
+        return self.__seat_permutation
 
     """
     Adapted from https://www.geeksforgeeks.org/heaps-algorithm-for-generating-permutations/
@@ -95,6 +143,8 @@ class GameSimulator(ABC):
 
     """
     event that occur when a game state is updated
+    the state must not be changed here, the players already got a snapshot of it; it may only be ended early with a
+    known result (e.g. adjudicated), which stops the game
     """
 
     @abstractmethod
@@ -111,11 +161,17 @@ class GameSimulator(ABC):
     def run_simulation(self):
         state = self.on_init_game()
         players = self.get_player_positions()
+        subscribers = self.__subscribers[self.__current_permutation]
 
-        # notify players a new game is starting
         for pos in range(0, len(players)):
             players[pos].set_current_pos(pos)
-            players[pos].event_new_game()
+
+        # notify players a new game is starting
+        for player in subscribers['event_new_game']:
+            player.event_new_game()
+
+        # a single frozen snapshot of the state is taken per turn and shared by all players
+        snapshot = state.clone().freeze()
 
         # play a turn
         while not state.is_finished():
@@ -124,15 +180,16 @@ class GameSimulator(ABC):
 
             # obtain a valid action
             while True:
-                selected_action = players[pos].get_action(state.clone())
+                selected_action = players[pos].get_action(GameSimulator.__get_player_state(players[pos], snapshot))
                 if state.validate_action(selected_action):
                     break
 
             state.play(selected_action)
+            snapshot = state.clone().freeze()
 
             # notify players of the action
-            for player in players:
-                player.event_action(pos, selected_action, state.clone())
+            for player in subscribers['event_action']:
+                player.event_action(pos, selected_action, GameSimulator.__get_player_state(player, snapshot))
 
             # the simulator will run an optional hanlder for each updated state
             self.on_state_update(state)
@@ -140,27 +197,76 @@ class GameSimulator(ABC):
         # handler to run before the game ends
         self.on_before_end_game(state)
 
-        result = {}
-        for player in players:
-            # notify the player of the result in each position
+        # notify the players of the result in each position
+        for player in subscribers['event_result']:
             for pos in range(len(players)):
                 player.event_result(pos, state.get_result(pos))
 
-            # store the result for that player
+        # notify the players that the game ended
+        if len(subscribers['event_end_game']) > 0:
+            snapshot = state.clone().freeze()
+            for player in subscribers['event_end_game']:
+                player.event_end_game(GameSimulator.__get_player_state(player, snapshot))
+
+        # store the result for each player
+        result = {}
+        for player in players:
             result[player.get_name()] = state.get_result(player.get_current_pos())
-            player.event_end_game(state.clone())
 
-        self.__results.append(result)
+        self.__results.append(self.__current_permutation, [state.get_result(pos) for pos in range(len(players))])
+        self.__update_aggregates(result)
 
         # handler to run after a game ends
         self.on_end_game(state)
 
+    # gets the state given to a player: the shared snapshot, or a mutable copy for players that require one
+    @staticmethod
+    def __get_player_state(player, snapshot):
+        return snapshot.clone() if player.REQUIRES_MUTABLE_STATE else snapshot
+
+    # updates the running aggregates with the result of a single game, and with its sample once it is complete
+    def __update_aggregates(self, result):
+        self.__num_games += 1
+        self.__sample_games += 1
+        for name, score in result.items():
+            self.__total_scores[name] += score
+            self.__sample_scores[name] += score
+        if not self.is_sample_complete():
+            return
+
+        # the sample is the mean score per game of its games
+        self.__num_samples += 1
+        for name, sample_score in self.__sample_scores.items():
+            score = sample_score / self.__sample_games
+            delta = score - self.__mean_scores[name]
+            self.__mean_scores[name] += delta / self.__num_samples
+            self.__m2_scores[name] += delta * (score - self.__mean_scores[name])
+            self.__sample_scores[name] = 0
+        self.__sample_games = 0
+
+    """
+    checks if the game that just ended completes a sample of the score stats. By default every game is a sample of
+    its own; simulators that play games with correlated results (e.g. the same cards with the seats exchanged) group
+    them in a single sample, so the variance and the standard error are the ones of the groups
+    """
+    def is_sample_complete(self) -> bool:
+        return True
+
+    """
+    checks if the simulator groups games with correlated results in samples (see is_sample_complete). Such groups can
+    cancel out exactly, e.g. two players that always play the same way tie every group, so playing more games doesn't
+    break a tie between them
+    """
+    def groups_games(self) -> bool:
+        return False
+
     # prints the stats for all players
     def print_stats(self):
-        scores = self.get_global_score()
+        stats = self.get_score_stats()
         for player in self.__permutations[0]:
             name = player.get_name()
-            print(f"Player {name} | Total score: {scores[name]}$ | Avg. score per game: {scores[name] / len(self.__results)}$")
+            print(f"Player {name} | Total score: {stats[name]['total']}$ | "
+                  f"Avg. score per game: {stats[name]['mean']}$ (± {stats[name]['stderr']:.4f})")
 
     # returns the list of players
     def get_players(self):
@@ -170,23 +276,72 @@ class GameSimulator(ABC):
     def get_player_positions(self):
         return self.__permutations[self.__current_permutation]
 
+    # returns the index of the current permutation of the players, in [0, number of permutations[
+    def get_current_permutation(self):
+        return self.__current_permutation
+
+    # gets the number of permutations of the players
+    def get_num_permutations(self):
+        return len(self.__permutations)
+
     # gets the number os players
     def num_players(self):
         return len(self.__permutations[0])
 
-    # gets the results of all games
+    # gets the results of all games, as a log that lazily iterates over {player name: score} dictionaries
     def get_results(self):
         return self.__results
 
+    # writes the results still kept in memory to the result files, if they spill to files (see set_results_spill)
+    def flush_results(self):
+        self.__results.flush()
+
+    # merges the results of a simulator with the same players, such as a chunk of games played in another process
+    def merge_results(self, other):
+        assert [player.get_name() for player in self.get_players()] == \
+               [player.get_name() for player in other.get_players()], "Can only merge results of the same players"
+        self.__results.extend(other.get_results())
+
+        # the aggregates of both simulators are combined with Chan et al.'s parallel variant of Welford's algorithm
+        # (the other simulator plays whole samples, e.g. whole iterations in a chunk)
+        other_games = other.get_num_games()
+        if other_games == 0:
+            return
+        other_stats = other.get_score_stats()
+        other_samples = next(iter(other_stats.values()))['samples']
+        num_samples = self.__num_samples + other_samples
+        for name, stats in other_stats.items():
+            delta = stats['mean'] - self.__mean_scores[name]
+            self.__total_scores[name] += stats['total']
+            self.__mean_scores[name] += delta * other_samples / num_samples
+            self.__m2_scores[name] += stats['m2'] + delta * delta * self.__num_samples * other_samples / num_samples
+        self.__num_games += other_games
+        self.__num_samples = num_samples
+
+    # gets the number of games played
+    def get_num_games(self):
+        return self.__num_games
+
     # gets the scores of all players
     def get_global_score(self):
-        scores = {}
-        for player in self.__permutations[0]:
-            name = player.get_name()
-            scores[name] = 0
-            for result in self.__results:
-                scores[name] += result[name]
-        return scores
+        return dict(self.__total_scores)
+
+    # gets the running stats of every player: number of games and of samples, total, mean per game, and variance and
+    # standard error of the mean of the samples
+    def get_score_stats(self):
+        stats = {}
+        for name, total in self.__total_scores.items():
+            variance = self.__m2_scores[name] / (self.__num_samples - 1) if self.__num_samples > 1 else 0.0
+            stats[name] = {
+                'games': self.__num_games,
+                'samples': self.__num_samples,
+                'total': total,
+                'mean': self.__mean_scores[name],
+                'm2': self.__m2_scores[name],
+                'variance': variance,
+                'stderr': (variance / self.__num_samples) ** 0.5 if self.__num_samples > 0 else 0.0
+            }
+        return stats
 
 
     @staticmethod
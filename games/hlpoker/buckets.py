@@ -0,0 +1,224 @@
+import os
+import struct
+import sys
+from array import array
+from itertools import combinations_with_replacement
+from math import comb
+
+from games.hlpoker.card import Card
+
+"""
+the name of each postflop round, by the number of board cards
+"""
+ROUND_NAMES = {3: 'flop', 4: 'turn', 5: 'river'}
+
+"""
+the number of buckets of the turn and the river, which have no table (see BucketTable): their hands are bucketed by
+their exact equity against a random hand, in buckets of equal width
+"""
+NUM_EQUITY_BUCKETS = 50
+
+"""
+the colex index of each set of ranks (a 13 bit mask) among the sets of the same size
+"""
+COLEX_INDEXES = [sum(comb(rank, count + 1) for count, rank in enumerate(rank for rank in range(13)
+                                                                        if mask >> rank & 1))
+                 for mask in range(1 << 13)]
+
+
+class HandIndexer:
+    """
+    Numbers the postflop hands (2 private cards and a board of a number of cards) up to suit isomorphism: two hands
+    that only differ by a renaming of the suits play the same and get the same index, and the indexes of a round are
+    exactly [0, len(indexer)[ (1286792 on the flop, 13960050 on the turn and 123156254 on the river), so they can
+    index a flat table.
+
+    Each suit of a hand is a configuration: the ranks of the private cards and the ranks of the board in that suit,
+    numbered by their sizes (m, n) and the colex indexes of both rank sets. A hand is the multiset of the
+    configurations of its 4 suits: its shape (the sorted sizes of the suits) selects a range of indexes, and the
+    configurations of the suits of the same size are numbered as a combination with repetition inside it.
+    """
+
+    """
+    the indexers, by number of board cards
+    """
+    __indexers = {}
+
+    @staticmethod
+    def get(board_size: int):
+        if board_size not in HandIndexer.__indexers:
+            HandIndexer.__indexers[board_size] = HandIndexer(board_size)
+        return HandIndexer.__indexers[board_size]
+
+    def __init__(self, board_size: int):
+        if board_size not in ROUND_NAMES:
+            raise ValueError(f"A postflop board has 3 to 5 cards, not {board_size}")
+        self.__board_size = board_size
+
+        """
+        the number of configurations of a suit with m private and n board cards, by (m, n)
+        """
+        self.__num_configs = {(m, n): comb(13, m) * comb(13 - m, n) for m in range(3) for n in range(6)}
+
+        """
+        the first index and the number of indexes of each shape, as a tuple of the (m, n) of the suits, largest first
+        """
+        self.__shapes = {}
+        size = 0
+        sizes = [(m, n) for m in range(3) for n in range(board_size + 1)]
+        for shape in combinations_with_replacement(sorted(sizes, reverse=True), 4):
+            if sum(m for m, _ in shape) == 2 and sum(n for _, n in shape) == board_size:
+                shape_size = 1
+                for group in set(shape):
+                    shape_size *= comb(self.__num_configs[group] + shape.count(group) - 1, shape.count(group))
+                self.__shapes[shape] = (size, shape_size)
+                size += shape_size
+        self.__size = size
+
+    def __len__(self):
+        return self.__size
+
+    def get_board_size(self):
+        return self.__board_size
+
+    """
+    gets the index of a hand
+    :param private_cards: the 2 private cards, as Card or ids
+    :param board_cards: the cards of the board, as Card or ids
+    """
+    def index(self, private_cards, board_cards) -> int:
+        private_masks = [0, 0, 0, 0]
+        board_masks = [0, 0, 0, 0]
+        for card in private_cards:
+            card_id = card.id if isinstance(card, Card) else card
+            private_masks[card_id & 3] |= 1 << (card_id >> 2)
+        for card in board_cards:
+            card_id = card.id if isinstance(card, Card) else card
+            board_masks[card_id & 3] |= 1 << (card_id >> 2)
+
+        suits = []
+        for private_mask, board_mask in zip(private_masks, board_masks):
+            m = bin(private_mask).count('1')
+            n = bin(board_mask).count('1')
+            # the board ranks are numbered among the ranks that are not private cards of the suit
+            compressed = board_mask
+            ranks = private_mask
+            while ranks:
+                rank = ranks.bit_length() - 1
+                compressed = (compressed & ((1 << rank) - 1)) | ((compressed >> (rank + 1)) << rank)
+                ranks ^= 1 << rank
+            suits.append((m, n, COLEX_INDEXES[private_mask] * comb(13 - m, n) + COLEX_INDEXES[compressed]))
+        suits.sort(reverse=True)
+
+        offset, _size = self.__shapes[tuple((m, n) for m, n, _config in suits)]
+        index = 0
+        start = 0
+        while start < 4:
+            group = suits[start][:2]
+            end = start
+            while end < 4 and suits[end][:2] == group:
+                end += 1
+            # the configurations of the group, ascending, as a combination with repetition
+            rank = sum(comb(config + position, position + 1)
+                       for position, (_m, _n, config) in enumerate(reversed(suits[start:end])))
+            count = end - start
+            index = index * comb(self.__num_configs[group] + count - 1, count) + rank
+            start = end
+        return offset + index
+
+
+class BucketTable:
+    """
+    Table of the bucket (the strength class of a card abstraction) of every postflop hand of a round, by the index of
+    the hand in HandIndexer, computed offline by clustering the hands on their equity distributions (see
+    build_hlpoker_buckets.py). The buckets are numbered from the weakest to the strongest.
+
+    The file is a small header followed by one bucket per index, as uint8 (uint16 with more than 256 buckets). It is
+    read once, on first use of get(), into an array, so a lookup is the index of the hand and an array access.
+    """
+
+    MAGIC = b'PFBK'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHBHI')
+
+    """
+    the tables, by number of board cards
+    """
+    __tables = {}
+
+    """
+    gets the table of a round at the root of the repository, loaded on first use; only the table of the flop is
+    built (by build_hlpoker_buckets.py) and shipped, the turn and the river have too many hands
+    """
+    @staticmethod
+    def get(board_size: int):
+        if board_size not in BucketTable.__tables:
+            if board_size not in ROUND_NAMES:
+                raise ValueError(f"There are only buckets after the flop (3 to 5 board cards), not with {board_size} "
+                                 f"board cards")
+            path = BucketTable.get_default_path(board_size)
+            if not os.path.exists(path):
+                raise ValueError(f"There is no table of {ROUND_NAMES[board_size]} buckets at {path}, only the flop "
+                                 f"table is built (HLPokerPlayer.get_bucket buckets the turn and the river hands by "
+                                 f"equity)")
+            BucketTable.__tables[board_size] = BucketTable(path)
+        return BucketTable.__tables[board_size]
+
+    @staticmethod
+    def get_default_path(board_size: int) -> str:
+        return os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                             f"hlpoker_buckets_{ROUND_NAMES[board_size]}.bin"))
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, board_size, self.__num_buckets, num_entries = BucketTable.HEADER.unpack_from(data, 0)
+        if magic != BucketTable.MAGIC or version != BucketTable.VERSION:
+            raise ValueError(f"{path} is not a table of buckets (version {BucketTable.VERSION})")
+
+        self.__indexer = HandIndexer.get(board_size)
+        self.__buckets = array(BucketTable.get_typecode(self.__num_buckets))
+        self.__buckets.frombytes(data[BucketTable.HEADER.size:])
+        if sys.byteorder == 'big':
+            self.__buckets.byteswap()
+        if num_entries != len(self.__indexer) or len(self.__buckets) != num_entries:
+            raise ValueError(f"{path} does not hold a bucket for every {ROUND_NAMES[board_size]} hand")
+
+    def __len__(self):
+        return len(self.__buckets)
+
+    def get_num_buckets(self):
+        return self.__num_buckets
+
+    def get_board_size(self):
+        return self.__indexer.get_board_size()
+
+    """
+    gets the bucket of a hand
+    :param private_cards: the 2 private cards, as Card or ids
+    :param board_cards: the cards of the board of the round of the table, as Card or ids
+    """
+    def get_bucket(self, private_cards, board_cards) -> int:
+        return self.__buckets[self.__indexer.index(private_cards, board_cards)]
+
+    """
+    gets the type of the buckets in the file: uint8 up to 256 buckets, uint16 otherwise
+    """
+    @staticmethod
+    def get_typecode(num_buckets: int) -> str:
+        return 'B' if num_buckets <= 256 else 'H'
+
+    """
+    writes a table
+    :param buckets: the bucket of each index of the hands of the round
+    """
+    @staticmethod
+    def write(path: str, board_size: int, num_buckets: int, buckets):
+        values = array(BucketTable.get_typecode(num_buckets), buckets)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        with open(path, 'wb') as file:
+            file.write(BucketTable.HEADER.pack(BucketTable.MAGIC, BucketTable.VERSION, board_size, num_buckets,
+                                               len(values)))
+            file.write(values.tobytes())
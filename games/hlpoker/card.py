@@ -56,11 +56,41 @@ class Suit(Enum):
         return SUIT_SYMBOLS[self.value]
 
 
+"""
+the index of each suit (by the value of Suit) in the card ids: clubs, diamonds, hearts and spades, as in phevaluator
+"""
+SUIT_IDS = [2, 1, 0, 3]
+
+"""
+number of cards in the deck
+"""
+NUM_CARDS = 52
+
+
 class Card:
+    """
+    A card can also be identified by an int in [0, 52[, its id: 4 * (rank - 2) + the index of its suit in SUIT_IDS.
+    These are the card ids of phevaluator, so hands of ids are evaluated without building strings (see
+    HLPokerState.evaluate_hand_ids), and the simulator deals ids, turning them into the shared Card of CARDS only
+    for the players.
+    """
+
     def __init__(self, rank, suit):
         self.rank = rank
         self.suit = suit
 
+        """
+        the id of the card
+        """
+        self.id = 4 * (rank.value - 2) + SUIT_IDS[suit.value]
+
+    """
+    gets the card with an id, shared by all its users
+    """
+    @staticmethod
+    def from_id(card_id: int):
+        return CARDS[card_id]
+
     def __lt__(self, other):
         return self.rank.value < other.rank.value
 
@@ -69,3 +99,9 @@ class Card:
 
     def to_symbol_str(self):
         return f"{self.rank}{self.suit.symbol()}"
+
+
+"""
+all the cards of the deck, by id
+"""
+CARDS = sorted((Card(rank, suit) for suit in Suit for rank in Rank), key=lambda card: card.id)
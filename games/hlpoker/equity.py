@@ -0,0 +1,239 @@
+from itertools import combinations
+
+import numpy as np
+from phevaluator.evaluator import evaluate_cards
+
+from games.hlpoker.card import Card, NUM_CARDS
+
+"""
+all the 1326 pairs of hole cards, as card ids (lowest id first), in the order of the weights of an opponent range
+"""
+COMBOS = np.array(list(combinations(range(NUM_CARDS), 2)), dtype=np.int8)
+
+"""
+the index of each pair of hole cards in COMBOS, by both card ids
+"""
+COMBO_INDEXES = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int16)
+COMBO_INDEXES[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(len(COMBOS))
+COMBO_INDEXES[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(len(COMBOS))
+
+
+"""
+gets the ids of a list of cards, given as Card or as ids
+"""
+def get_card_ids(cards):
+    return [card.id if isinstance(card, Card) else card for card in cards]
+
+
+class HandEvaluator:
+    """
+    Evaluates batches of 7 card hands with NumPy, as phevaluator would one by one (lower is better), from two tables
+    built once from phevaluator itself:
+        - the hands without a flush only depend on how many cards of each rank they hold, so they are looked up by
+          sum(5 ** rank) over their cards, among the 49205 possible sums (sorted, for a binary search);
+        - the hands with 5 or more cards of a suit are looked up by the ranks of that suit, as a 13 bit mask (7 cards
+          can't hold a flush and a better hand, such as a full house).
+    """
+
+    """
+    the evaluator, built on first use
+    """
+    __evaluator = None
+
+    @staticmethod
+    def get():
+        if HandEvaluator.__evaluator is None:
+            HandEvaluator.__evaluator = HandEvaluator()
+        return HandEvaluator.__evaluator
+
+    def __init__(self):
+        keys = []
+        values = []
+        # every way to hold 7 cards over the 13 ranks, with at most 4 of each, given suits that don't make a flush
+        for counts in HandEvaluator.__get_rank_counts(13, 7):
+            ranks = [rank for rank, count in enumerate(counts) for _ in range(count)]
+            keys.append(sum(5 ** rank for rank in ranks))
+            values.append(evaluate_cards(*[4 * rank + index % 4 for index, rank in enumerate(ranks)]))
+        order = np.argsort(keys)
+
+        """
+        the sums of 5 ** rank of the hands without a flush, sorted, and the value of each
+        """
+        self.__keys = np.array(keys, dtype=np.int64)[order]
+        self.__values = np.array(values, dtype=np.int16)[order]
+
+        """
+        the value of each mask of the ranks of the flush suit, for the masks of 5 to 7 ranks
+        """
+        self.__flush_values = np.zeros(1 << 13, dtype=np.int16)
+        for mask in range(1 << 13):
+            ranks = [rank for rank in range(13) if mask >> rank & 1]
+            if 5 <= len(ranks) <= 7:
+                self.__flush_values[mask] = evaluate_cards(*[4 * rank for rank in ranks])
+
+        self.__powers = 5 ** np.arange(13, dtype=np.int64)
+        self.__rank_bits = 1 << np.arange(13, dtype=np.int32)
+
+    # the counts of cards per rank of all hands of a number of cards, over a number of ranks
+    @staticmethod
+    def __get_rank_counts(num_ranks, num_cards):
+        if num_ranks == 1:
+            if num_cards <= 4:
+                yield [num_cards]
+            return
+        for count in range(min(num_cards, 4) + 1):
+            for counts in HandEvaluator.__get_rank_counts(num_ranks - 1, num_cards - count):
+                yield [count] + counts
+
+    """
+    evaluates hands of 7 cards
+    :param hands: int array (number of hands, 7) of card ids
+    :returns: int array with the value of each hand (lower is better)
+    """
+    def evaluate(self, hands):
+        ranks = hands >> 2
+        suits = hands & 3
+
+        values = self.__values[np.searchsorted(self.__keys, self.__powers[ranks].sum(axis=1))]
+
+        # the cards of the most frequent suit of each hand, which is the flush suit if there is one
+        of_suit = suits[:, :, np.newaxis] == np.arange(4)
+        flush_suits = of_suit.sum(axis=1).argmax(axis=1)
+        in_flush = suits == flush_suits[:, np.newaxis]
+        flush = in_flush.sum(axis=1) >= 5
+        if flush.any():
+            masks = np.where(in_flush[flush], self.__rank_bits[ranks[flush]], 0).sum(axis=1)
+            values[flush] = self.__flush_values[masks]
+        return values
+
+
+class EquityCalculator:
+    """
+    Computes the equity of a hand in a showdown against one opponent: the chance to win plus half the chance to tie,
+    over the cards still to come and the hands of the opponent, drawn at random or from a weighted range.
+
+    Before the turn, the equity is estimated by Monte Carlo: the opponent hands and the rest of the board are dealt
+    for all trials at once in NumPy arrays, and evaluated in a single batch (see HandEvaluator). On the turn and the
+    river, every remaining card and every opponent hand are enumerated, so the equity is exact.
+    The results are cached for the current hand (the same private cards), so the players can ask for the equity as
+    often as they need during a hand; the cache is emptied when the private cards change.
+    """
+
+    """
+    :param num_trials: number of trials of each Monte Carlo estimate
+    :param seed: seed of the Monte Carlo trials
+    """
+    def __init__(self, num_trials: int = 20000, seed=None):
+        self.__num_trials = num_trials
+        self.__random = np.random.default_rng(seed)
+
+        """
+        the private cards of the current hand, and the equities already computed for it, by (board cards, range)
+        """
+        self.__hand = None
+        self.__cache = {}
+
+        """
+        stats: equities computed, cache hits and hands evaluated
+        """
+        self.__num_queries = 0
+        self.__num_cache_hits = 0
+        self.__num_evaluations = 0
+
+    """
+    gets the equity of a hand
+    :param private_cards: the 2 private cards, as Card or ids
+    :param board_cards: the 0 to 5 cards of the board, as Card or ids
+    :param opponent_range: None for an opponent with any hand, or an array of 1326 weights of the opponent hands, in
+    the order of COMBOS (the hands holding known cards are left out)
+    :returns: the equity, between 0 and 1
+    """
+    def get_equity(self, private_cards, board_cards, opponent_range=None) -> float:
+        self.__num_queries += 1
+        private_ids = tuple(sorted(get_card_ids(private_cards)))
+        board_ids = tuple(sorted(get_card_ids(board_cards)))
+        if private_ids != self.__hand:
+            self.__hand = private_ids
+            self.__cache.clear()
+
+        weights = self.__get_weights(private_ids + board_ids, opponent_range)
+        key = (board_ids, None if opponent_range is None else weights.tobytes())
+        if key in self.__cache:
+            self.__num_cache_hits += 1
+            return self.__cache[key]
+
+        if len(board_ids) >= 4:
+            equity = self.__enumerate(private_ids, board_ids, weights)
+        else:
+            equity = self.__simulate(private_ids, board_ids, weights)
+        self.__cache[key] = equity
+        return equity
+
+    # the weights of the opponent hands, without the ones that hold known cards
+    @staticmethod
+    def __get_weights(known_ids, opponent_range):
+        weights = np.ones(len(COMBOS)) if opponent_range is None else np.array(opponent_range, dtype=float)
+        known = np.zeros(NUM_CARDS, dtype=bool)
+        known[list(known_ids)] = True
+        weights[known[COMBOS[:, 0]] | known[COMBOS[:, 1]]] = 0.0
+        if weights.sum() <= 0:
+            raise ValueError("The opponent range has no hands left with the known cards")
+        return weights
+
+    # the equity given the results of the hands (lower values are better) and their weights
+    def __get_equity(self, private_values, opponent_values, weights):
+        self.__num_evaluations += len(private_values) + len(opponent_values)
+        scores = np.where(private_values < opponent_values, 1.0, np.where(private_values == opponent_values, 0.5, 0.0))
+        return float(np.average(scores, weights=weights))
+
+    # exact equity over all rivers (on the turn) and all opponent hands
+    def __enumerate(self, private_ids, board_ids, weights):
+        evaluator = HandEvaluator.get()
+        opponents = np.flatnonzero(weights)
+
+        dead = set(private_ids) | set(board_ids)
+        rivers = [[]] if len(board_ids) == 5 else [[card] for card in range(NUM_CARDS) if card not in dead]
+        boards = np.array([list(board_ids) + river for river in rivers], dtype=np.int64)
+
+        # every (board, opponent hand) pair, without the opponent hands that hold the river card
+        board_index = np.repeat(np.arange(len(boards)), len(opponents))
+        combos = COMBOS[np.tile(opponents, len(boards))].astype(np.int64)
+        valid = (combos != boards[board_index, -1:]).all(axis=1) if len(board_ids) == 4 else \
+            np.ones(len(combos), dtype=bool)
+        board_index, combos = board_index[valid], combos[valid]
+
+        private_values = evaluator.evaluate(np.hstack([np.tile(private_ids, (len(boards), 1)), boards]))[board_index]
+        opponent_values = evaluator.evaluate(np.hstack([combos, boards[board_index]]))
+        return self.__get_equity(private_values, opponent_values, weights[np.tile(opponents, len(boards))][valid])
+
+    # Monte Carlo estimate of the equity over random opponent hands (from the range) and random boards
+    def __simulate(self, private_ids, board_ids, weights):
+        evaluator = HandEvaluator.get()
+        num_trials = self.__num_trials
+        missing = 5 - len(board_ids)
+
+        # the opponent hands, drawn from the range
+        combos = COMBOS[self.__random.choice(len(COMBOS), size=num_trials, p=weights / weights.sum())].astype(np.int64)
+
+        # the rest of the board: a random permutation of the cards left in the deck of each trial (the first cards of
+        # random sort keys, with the known cards and the cards of the opponent pushed to the end)
+        keys = self.__random.random((num_trials, NUM_CARDS))
+        keys[:, list(private_ids + board_ids)] = 2.0
+        np.put_along_axis(keys, combos, 2.0, axis=1)
+        runouts = np.argpartition(keys, missing, axis=1)[:, :missing] if missing > 0 else \
+            np.empty((num_trials, 0), dtype=np.int64)
+
+        boards = np.hstack([np.tile(np.array(board_ids, dtype=np.int64), (num_trials, 1)), runouts])
+        private_values = evaluator.evaluate(np.hstack([np.tile(private_ids, (num_trials, 1)), boards]))
+        opponent_values = evaluator.evaluate(np.hstack([combos, boards]))
+        return self.__get_equity(private_values, opponent_values, np.ones(num_trials))
+
+    """
+    gets the stats: equities asked for, answered from the cache and hands evaluated
+    """
+    def get_stats(self):
+        return {
+            'queries': self.__num_queries,
+            'cache_hits': self.__num_cache_hits,
+            'evaluations': self.__num_evaluations
+        }
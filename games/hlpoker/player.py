@@ -2,7 +2,9 @@ from abc import ABC, abstractmethod
 
 from termcolor import colored
 
+from games.hlpoker.buckets import NUM_EQUITY_BUCKETS, BucketTable
 from games.hlpoker.card import Card, Suit
+from games.hlpoker.preflop import PreflopTable, get_hand_class
 from games.hlpoker.round import Round
 from games.hlpoker.state import HLPokerState
 from games.player import Player
@@ -38,6 +40,11 @@ class HLPokerPlayer(Player, ABC):
         """
         self.__opponent_cards = [None, None]
 
+        """
+        the equity calculator of get_equity, created on first use
+        """
+        self.__equity_calculator = None
+
     """
     gets the score
     """
@@ -130,6 +137,47 @@ class HLPokerPlayer(Player, ABC):
     def get_opponent_cards(self):
         return self.__opponent_cards
 
+    """
+    gets the equity of the private cards against an opponent with the current board (see EquityCalculator), cached
+    until the next hand
+    :param opponent_range: None for an opponent with any hand, or an array of 1326 weights of the opponent hands
+    """
+    def get_equity(self, opponent_range=None) -> float:
+        if self.__equity_calculator is None:
+            # imported here, so NumPy is only needed by the players that use it
+            from games.hlpoker.equity import EquityCalculator
+            self.__equity_calculator = EquityCalculator()
+        return self.__equity_calculator.get_equity(self.__private_cards, self.__board_cards, opponent_range)
+
+    """
+    gets the class of the private cards among the 169 classes of starting hands (see get_hand_class)
+    """
+    def get_preflop_class(self) -> int:
+        return get_hand_class(self.__private_cards)
+
+    """
+    gets the all-in equity of the private cards before the flop, from the precomputed table (see PreflopTable), which
+    is loaded the first time a player asks for it
+    :param opponent_class: the class of the hand of the opponent, or None for a random hand
+    """
+    def get_preflop_equity(self, opponent_class: int = None) -> float:
+        hand_class = get_hand_class(self.__private_cards)
+        if opponent_class is None:
+            return PreflopTable.get().get_equity(hand_class)
+        return PreflopTable.get().get_head_to_head(hand_class, opponent_class)
+
+    """
+    gets the bucket of the private cards with the current board, numbered from the weakest hands. On the flop, it comes
+    from the precomputed table (see BucketTable), which is loaded the first time a player asks for it. The turn and
+    the river have no table: their hands are bucketed by their equity against a random hand (get_equity, exact on
+    those rounds) into NUM_EQUITY_BUCKETS buckets of equal width. Before the flop there are no buckets (a ValueError is
+    raised)
+    """
+    def get_bucket(self) -> int:
+        if len(self.__board_cards) > 3:
+            return min(int(self.get_equity() * NUM_EQUITY_BUCKETS), NUM_EQUITY_BUCKETS - 1)
+        return BucketTable.get(len(self.__board_cards)).get_bucket(self.__private_cards, self.__board_cards)
+
     def event_action(self, pos: int, action, new_state):
         if self.get_current_pos() == pos:
             self.event_my_action(action, new_state)
@@ -134,6 +134,9 @@ class MonteCarloTreeSearchNode:
         return None
 
 class hlpoker_29344_v1(HLPokerPlayer):
+    # only the results are consumed, to keep the score (see HLPokerPlayer.event_result)
+    SUBSCRIBED_EVENTS = ('event_result',)
+
     def __init__(self, name="MCTSPlayer"):
         super().__init__(name)
         self.position = None 
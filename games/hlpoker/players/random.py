@@ -6,6 +6,10 @@ from random import choice
 
 
 class RandomHLPokerPlayer(HLPokerPlayer):
+
+    # the player does nothing with the events of the games
+    SUBSCRIBED_EVENTS = ()
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -0,0 +1,136 @@
+import os
+import struct
+import sys
+from array import array
+
+from games.hlpoker.card import Card
+
+"""
+number of classes of starting hands: 13 pairs, 78 suited and 78 offsuit hands
+"""
+NUM_CLASSES = 169
+
+RANK_NAMES = "AKQJT98765432"
+
+
+"""
+gets the class of a starting hand, given as Card or ids, as its cell in the usual 13x13 grid: the rows and the cols
+go from aces to twos, the pairs are on the diagonal, the suited hands above it (row of the highest rank) and the
+offsuit hands below it (col of the highest rank)
+"""
+def get_hand_class(cards) -> int:
+    first, second = (card.id if isinstance(card, Card) else card for card in cards)
+    # the index of the ranks in RANK_NAMES
+    high, low = sorted((12 - (first >> 2), 12 - (second >> 2)))
+    if (first & 3) == (second & 3):
+        return 13 * high + low
+    return 13 * low + high
+
+
+"""
+gets the name of a class, e.g. 'AA', 'AKs' or 'AKo'
+"""
+def get_class_name(hand_class: int) -> str:
+    row, col = divmod(hand_class, 13)
+    if row == col:
+        return RANK_NAMES[row] * 2
+    if row < col:
+        return f"{RANK_NAMES[row]}{RANK_NAMES[col]}s"
+    return f"{RANK_NAMES[col]}{RANK_NAMES[row]}o"
+
+
+"""
+gets the starting hands of a class, as pairs of card ids
+"""
+def get_class_hands(hand_class: int) -> list:
+    row, col = divmod(hand_class, 13)
+    first_rank, second_rank = 12 - min(row, col), 12 - max(row, col)
+    if row == col:
+        return [(4 * first_rank + first, 4 * first_rank + second)
+                for first in range(4) for second in range(first + 1, 4)]
+    if row < col:
+        return [(4 * first_rank + suit, 4 * second_rank + suit) for suit in range(4)]
+    return [(4 * first_rank + first, 4 * second_rank + second) for first in range(4) for second in range(4)
+            if first != second]
+
+
+class PreflopTable:
+    """
+    Table of the all-in equities of the 169 classes of starting hands, computed offline (see build_hlpoker_preflop.py):
+    the equity of each class against a random hand and against each other class.
+
+    The file is a small header followed by the equities as uint16 (the equity times EQUITY_SCALE): the 169 equities
+    against a random hand and the 169x169 head-to-head ones, by row. It is read once, on first use of get(), into
+    arrays, so a lookup is an index computation and importing this module reads nothing.
+    """
+
+    MAGIC = b'PFEQ'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHH')
+
+    EQUITY_SCALE = 65535
+
+    """
+    the table shipped at the root of the repository
+    """
+    DEFAULT_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                                                 'hlpoker_preflop.bin'))
+
+    """
+    the shipped table, loaded on first use
+    """
+    __table = None
+
+    @staticmethod
+    def get():
+        if PreflopTable.__table is None:
+            PreflopTable.__table = PreflopTable(PreflopTable.DEFAULT_PATH)
+        return PreflopTable.__table
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, num_classes = PreflopTable.HEADER.unpack_from(data, 0)
+        if magic != PreflopTable.MAGIC or version != PreflopTable.VERSION or num_classes != NUM_CLASSES:
+            raise ValueError(f"{path} is not a preflop equity table (version {PreflopTable.VERSION})")
+
+        equities = array('H')
+        equities.frombytes(data[PreflopTable.HEADER.size:])
+        if sys.byteorder == 'big':
+            equities.byteswap()
+        if len(equities) != NUM_CLASSES * (NUM_CLASSES + 1):
+            raise ValueError(f"{path} is cut short")
+
+        """
+        the equities against a random hand, by class, and the head-to-head ones, by class * NUM_CLASSES + other class
+        """
+        self.__equities = equities[:NUM_CLASSES]
+        self.__head_to_head = equities[NUM_CLASSES:]
+
+    """
+    gets the equity of a class against a random hand
+    """
+    def get_equity(self, hand_class: int) -> float:
+        return self.__equities[hand_class] / PreflopTable.EQUITY_SCALE
+
+    """
+    gets the equity of a class against a hand of another class
+    """
+    def get_head_to_head(self, hand_class: int, other_class: int) -> float:
+        return self.__head_to_head[hand_class * NUM_CLASSES + other_class] / PreflopTable.EQUITY_SCALE
+
+    """
+    writes a table
+    :param equities: the 169 equities against a random hand
+    :param head_to_head: the 169 lists of 169 equities against each class
+    """
+    @staticmethod
+    def write(path: str, equities, head_to_head):
+        values = array('H', (round(equity * PreflopTable.EQUITY_SCALE) for equity in equities))
+        values.extend(round(equity * PreflopTable.EQUITY_SCALE) for row in head_to_head for equity in row)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        with open(path, 'wb') as file:
+            file.write(PreflopTable.HEADER.pack(PreflopTable.MAGIC, PreflopTable.VERSION, NUM_CLASSES))
+            file.write(values.tobytes())
@@ -4,7 +4,7 @@ from termcolor import cprint
 
 from games.game_simulator import GameSimulator
 from games.hlpoker.action import HLPokerAction
-from games.hlpoker.card import Card, Suit, Rank
+from games.hlpoker.card import CARDS, NUM_CARDS
 from games.hlpoker.round import Round
 from games.hlpoker.state import HLPokerState
 from games.hlpoker.player import HLPokerPlayer
@@ -12,12 +12,18 @@ from games.hlpoker.player import HLPokerPlayer
 
 class HLPokerSimulator(GameSimulator):
 
-    def __init__(self, players: list[HLPokerPlayer]):
+    """
+    :param duplicate: replay each deck with the seats exchanged, so every player gets to hold every hand; a new deck
+    is only shuffled once the current one was played in all permutations of the players (with --seat-permutation,
+    without it every deck is played once), and the games of each deck are a single sample of the score stats, as
+    their card luck cancels out
+    """
+    def __init__(self, players: list[HLPokerPlayer], duplicate: bool = False):
         super().__init__(players)
         """
-        deck of cards
+        deck of cards, as card ids (see Card)
         """
-        self.__deck = [Card(rank, suit) for suit in Suit for rank in Rank]
+        self.__deck = list(range(NUM_CARDS))
         """
         stores the current round of the current game being simulated
         """
@@ -26,10 +32,19 @@ class HLPokerSimulator(GameSimulator):
         number of cards that were played in the current game
         """
         self.__used_card_count = None
+        """
+        if the decks are replayed, and the permutations of the players that already played the current deck
+        """
+        self.__duplicate = duplicate
+        self.__deck_permutations = set()
 
     def on_init_game(self):
-        # shuffle the deck
-        shuffle(self.__deck)
+        # shuffle the deck, unless it is replayed in a permutation of the players that didn't play it yet
+        permutation = self.get_current_permutation()
+        if not self.__duplicate or not self.__deck_permutations or permutation in self.__deck_permutations:
+            shuffle(self.__deck)
+            self.__deck_permutations.clear()
+        self.__deck_permutations.add(permutation)
 
         self.__used_card_count = 0
         self.__current_round = Round.Preflop
@@ -37,7 +52,7 @@ class HLPokerSimulator(GameSimulator):
         # assign a pair of cards to each player
         for player in self.get_player_positions():
             private_cards = self.__deck[self.__used_card_count:self.__used_card_count+2]
-            player.start_new_game(private_cards)
+            player.start_new_game([CARDS[card_id] for card_id in private_cards])
             self.__used_card_count += 2
 
         return HLPokerState(len(self.get_players()))
@@ -55,11 +70,11 @@ class HLPokerSimulator(GameSimulator):
 
                 if self.__current_round == Round.Flop:
                     # Show three cards for Flop
-                    cards_to_show = self.__deck[next_card_index:next_card_index + 3]
+                    cards_to_show = [CARDS[card_id] for card_id in self.__deck[next_card_index:next_card_index + 3]]
                     self.__used_card_count += 3
                 elif self.__current_round in (Round.Turn, Round.River):
                     # Show one card for Turn and River
-                    cards_to_show = [self.__deck[next_card_index]]
+                    cards_to_show = [CARDS[self.__deck[next_card_index]]]
                     self.__used_card_count += 1
 
                 # Notify all positions about the new board cards
@@ -69,8 +84,15 @@ class HLPokerSimulator(GameSimulator):
             else:
                 # Notify all positions about the opponent's cards
                 players = self.get_player_positions()
-                players[0].event_show_opponent_cards(*self.__deck[2:4])
-                players[1].event_show_opponent_cards(*self.__deck[0:2])
+                players[0].event_show_opponent_cards(CARDS[self.__deck[2]], CARDS[self.__deck[3]])
+                players[1].event_show_opponent_cards(CARDS[self.__deck[0]], CARDS[self.__deck[1]])
+
+    # without seat permutation every deck is only played once, so each game is a sample of its own
+    def is_sample_complete(self) -> bool:
+        return not self.groups_games() or len(self.__deck_permutations) == self.get_num_permutations()
+
+    def groups_games(self) -> bool:
+        return self.__duplicate and self.uses_seat_permutation()
 
     def on_before_end_game(self, state: HLPokerState):
         # if we reached the showdown, we are going to reveal the cards to all players
@@ -1,4 +1,5 @@
 from games.hlpoker.action import HLPokerAction
+from games.hlpoker.card import Card
 from games.hlpoker.round import Round
 from games.state import State
 from phevaluator.evaluator import evaluate_cards
@@ -52,6 +53,10 @@ class HLPokerState(State):
         number of actions in the current round.
         """
         self.__winner = None
+        """
+        the read-only copy of the sequence given once the state is frozen, built on first use
+        """
+        self.__frozen_sequence = None
 
     def get_num_players(self):
         return self.__num_players
@@ -71,6 +76,8 @@ class HLPokerState(State):
         return True
 
     def update(self, action):
+        self.check_mutable("updated")
+
         # update sequence of actions
         self.__sequence.append(action)
 
@@ -162,7 +169,15 @@ class HLPokerState(State):
     def is_showdown(self):
         return self.__round == Round.Showdown
 
+    """
+    gets the actions played in the game; a frozen state is shared by several players, so it gives a read-only copy (a
+    tuple) instead of its own list, built once and shared by all the calls
+    """
     def get_sequence(self):
+        if self.is_frozen():
+            if self.__frozen_sequence is None:
+                self.__frozen_sequence = tuple(self.__sequence)
+            return self.__frozen_sequence
         return self.__sequence
 
     def get_current_round(self):
@@ -176,14 +191,26 @@ class HLPokerState(State):
     '''
     @staticmethod
     def evaluate_hand(cards):
-        return evaluate_cards(*[card.__str__() for card in cards])
+        return evaluate_cards(*[card.id for card in cards])
 
+    '''
+    get the evaluation of a group of card ids (see Card), lower is better
+    '''
+    @staticmethod
+    def evaluate_hand_ids(card_ids):
+        return evaluate_cards(*card_ids)
+
+    '''
+    computes the winner of the game, given the cards of each player and of the board, as Card or ids (see Card)
+    '''
     def compute_results(self, p0cards, p1cards, board_cards):
+        self.check_mutable("given results")
         if self.is_showdown():
 
-            # Helper function to convert cards to strings and evaluate
-            p0_score = HLPokerState.evaluate_hand(p0cards + board_cards)
-            p1_score = HLPokerState.evaluate_hand(p1cards + board_cards)
+            # the ids are the card ids of phevaluator, so they are evaluated as they are
+            board_ids = [card.id if isinstance(card, Card) else card for card in board_cards]
+            p0_score = evaluate_cards(*[card.id if isinstance(card, Card) else card for card in p0cards], *board_ids)
+            p1_score = evaluate_cards(*[card.id if isinstance(card, Card) else card for card in p1cards], *board_ids)
 
             if p0_score > p1_score:
                 self.__winner = 1
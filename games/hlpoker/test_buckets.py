@@ -0,0 +1,118 @@
+import os
+from itertools import combinations, permutations
+
+import numpy as np
+import pytest
+
+from games.hlpoker.buckets import NUM_EQUITY_BUCKETS, BucketTable, HandIndexer
+from games.hlpoker.card import CARDS, NUM_CARDS
+from games.hlpoker.players.always_call import AlwaysCallHLPokerPlayer
+from games.hlpoker.round import Round
+
+"""
+the number of hands of each round up to suit isomorphism, by number of board cards (Waugh, "A Fast and Optimal Hand
+Isomorphism Algorithm", 2013)
+"""
+NUM_HANDS = {3: 1286792, 4: 13960050, 5: 123156254}
+
+
+"""
+deals random hands of a round, as (private cards, board cards) ids
+"""
+def deal(board_size, num_hands, seed):
+    random = np.random.default_rng(seed)
+    for _ in range(num_hands):
+        cards = random.choice(NUM_CARDS, size=2 + board_size, replace=False).tolist()
+        yield cards[:2], cards[2:]
+
+
+"""
+renames the suits of cards
+"""
+def permute_suits(cards, permutation):
+    return [card & ~3 | permutation[card & 3] for card in cards]
+
+
+@pytest.mark.parametrize('board_size', sorted(NUM_HANDS))
+def test_size_is_number_of_isomorphism_classes(board_size):
+    assert len(HandIndexer.get(board_size)) == NUM_HANDS[board_size]
+
+
+@pytest.mark.parametrize('board_size', sorted(NUM_HANDS))
+def test_index_is_suit_and_order_invariant(board_size):
+    indexer = HandIndexer.get(board_size)
+    suit_permutations = list(permutations(range(4)))
+    random = np.random.default_rng(board_size)
+    for private_cards, board_cards in deal(board_size, 500, board_size):
+        index = indexer.index(private_cards, board_cards)
+        assert 0 <= index < len(indexer)
+        permutation = suit_permutations[random.integers(len(suit_permutations))]
+        assert indexer.index(permute_suits(private_cards[::-1], permutation),
+                             permute_suits(board_cards[::-1], permutation)) == index
+        assert indexer.index([CARDS[card] for card in private_cards], [CARDS[card] for card in board_cards]) == index
+
+
+@pytest.mark.parametrize('board_size', sorted(NUM_HANDS))
+def test_index_separates_private_and_board_cards(board_size):
+    indexer = HandIndexer.get(board_size)
+    for private_cards, board_cards in deal(board_size, 500, board_size + 10):
+        swapped_private, swapped_board = [board_cards[0], private_cards[1]], [private_cards[0]] + board_cards[1:]
+        # private cards of other ranks can't be a renaming of the suits
+        if sorted(card >> 2 for card in swapped_private) != sorted(card >> 2 for card in private_cards):
+            assert indexer.index(swapped_private, swapped_board) != indexer.index(private_cards, board_cards)
+
+
+def test_flop_indexes_are_a_bijection():
+    # every flop hand is dealt on one board of each class of boards up to suits; as the index is invariant to the
+    # suits and there are as many indexes as classes of hands, hitting every index makes it a bijection
+    indexer = HandIndexer.get(3)
+    seen = np.zeros(len(indexer), dtype=bool)
+    suit_permutations = list(permutations(range(4)))
+    boards = {min(tuple(sorted(permute_suits(board, permutation))) for permutation in suit_permutations)
+              for board in combinations(range(NUM_CARDS), 3)}
+    for board in boards:
+        rest = [card for card in range(NUM_CARDS) if card not in board]
+        seen[[indexer.index(private_cards, board) for private_cards in combinations(rest, 2)]] = True
+    assert seen.all()
+
+
+def test_invalid_board_size_raises():
+    with pytest.raises(ValueError):
+        HandIndexer.get(2)
+    with pytest.raises(ValueError):
+        BucketTable.get(0)
+
+
+@pytest.mark.skipif(not os.path.exists(BucketTable.get_default_path(3)), reason="the flop table is not built")
+def test_flop_buckets_are_suit_invariant():
+    table = BucketTable.get(3)
+    assert len(table) == NUM_HANDS[3]
+    for private_cards, board_cards in deal(3, 200, 0):
+        bucket = table.get_bucket(private_cards, board_cards)
+        assert 0 <= bucket < table.get_num_buckets()
+        assert table.get_bucket(permute_suits(private_cards, (3, 2, 1, 0)), permute_suits(board_cards, (3, 2, 1, 0))) \
+            == bucket
+    # the buckets are numbered from the weakest hands: a royal flush beats a 3 high
+    assert table.get_bucket((48, 44), (40, 36, 32)) > table.get_bucket((0, 5), (48, 45, 30))
+
+
+def test_write_and_read_round_trip(tmp_path):
+    path = str(tmp_path / 'buckets.bin')
+    buckets = np.arange(NUM_HANDS[3]) % 300
+    BucketTable.write(path, 3, 300, buckets)
+    table = BucketTable(path)
+    assert table.get_num_buckets() == 300 and table.get_board_size() == 3
+    private_cards, board_cards = next(deal(3, 1, 0))
+    assert table.get_bucket(private_cards, board_cards) == buckets[HandIndexer.get(3).index(private_cards,
+                                                                                           board_cards)]
+
+
+def test_turn_and_river_buckets_fall_back_to_equity():
+    player = AlwaysCallHLPokerPlayer('a')
+    player.start_new_game([CARDS[48], CARDS[49]])
+    player.event_show_board_cards([CARDS[0], CARDS[5], CARDS[30]], Round.Flop)
+    player.event_show_board_cards([CARDS[14]], Round.Turn)
+    assert player.get_bucket() == int(player.get_equity() * NUM_EQUITY_BUCKETS)
+    player.event_show_board_cards([CARDS[22]], Round.River)
+    assert player.get_bucket() == min(int(player.get_equity() * NUM_EQUITY_BUCKETS), NUM_EQUITY_BUCKETS - 1)
+    assert player.get_bucket() > NUM_EQUITY_BUCKETS // 2
@@ -0,0 +1,86 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+from phevaluator.evaluator import evaluate_cards
+
+from games.hlpoker.card import NUM_CARDS
+from games.hlpoker.equity import COMBO_INDEXES, COMBOS, EquityCalculator, HandEvaluator
+
+"""
+the turn and the river of the exact equity tests, as (private cards, board cards) ids
+"""
+BOARDS = [
+    ((48, 49), (0, 13, 26, 44)),
+    ((5, 9), (12, 16, 21, 33)),
+    ((50, 46), (51, 47, 3, 22, 30)),
+]
+
+
+"""
+gets the equity of a hand by enumerating every river and opponent hand with phevaluator, one hand at a time
+"""
+def get_brute_force_equity(private_cards, board_cards, weights=None):
+    dead = set(private_cards) | set(board_cards)
+    rivers = [()] if len(board_cards) == 5 else [(card,) for card in range(NUM_CARDS) if card not in dead]
+    total = 0.0
+    score = 0.0
+    for river in rivers:
+        board = tuple(board_cards) + river
+        value = evaluate_cards(*private_cards, *board)
+        for opponent in combinations(range(NUM_CARDS), 2):
+            if dead.intersection(opponent) or set(river).intersection(opponent):
+                continue
+            weight = 1.0 if weights is None else weights[COMBO_INDEXES[opponent]]
+            opponent_value = evaluate_cards(*opponent, *board)
+            total += weight
+            score += weight * (1.0 if value < opponent_value else 0.5 if value == opponent_value else 0.0)
+    return score / total
+
+
+def test_evaluator_matches_phevaluator():
+    random = np.random.default_rng(0)
+    hands = np.array([random.choice(NUM_CARDS, size=7, replace=False) for _ in range(5000)], dtype=np.int64)
+    # a few flushes and straight flushes, which the random hands rarely hold
+    hands[:4] = [[0, 4, 8, 12, 16, 1, 2], [48, 44, 40, 36, 32, 49, 50], [0, 8, 16, 24, 40, 1, 5],
+                 [3, 7, 11, 15, 51, 2, 1]]
+    values = HandEvaluator.get().evaluate(hands)
+    assert values.tolist() == [evaluate_cards(*hand) for hand in hands.tolist()]
+
+
+@pytest.mark.parametrize('private_cards, board_cards', BOARDS)
+def test_exact_equity_matches_brute_force(private_cards, board_cards):
+    equity = EquityCalculator().get_equity(private_cards, board_cards)
+    assert equity == pytest.approx(get_brute_force_equity(private_cards, board_cards), abs=1e-9)
+
+
+def test_exact_equity_against_range_matches_brute_force():
+    private_cards, board_cards = BOARDS[0]
+    weights = np.random.default_rng(1).random(len(COMBOS))
+    equity = EquityCalculator().get_equity(private_cards, board_cards, weights)
+    assert equity == pytest.approx(get_brute_force_equity(private_cards, board_cards, weights), abs=1e-9)
+
+
+def test_monte_carlo_equity_close_to_exact():
+    # the flop equity is the mean of the exact turn equities over the turn cards
+    private_cards, board_cards = (48, 49), (0, 13, 26)
+    calculator = EquityCalculator()
+    turns = [card for card in range(NUM_CARDS) if card not in private_cards + board_cards]
+    exact = np.mean([calculator.get_equity(private_cards, board_cards + (turn,)) for turn in turns])
+    equity = EquityCalculator(num_trials=50000, seed=0).get_equity(private_cards, board_cards)
+    assert equity == pytest.approx(exact, abs=0.01)
+
+
+def test_cache_is_per_hand():
+    calculator = EquityCalculator(seed=0)
+    first = calculator.get_equity((48, 49), [])
+    assert calculator.get_equity((49, 48), []) == first
+    calculator.get_equity((0, 5), [])
+    assert calculator.get_stats()['cache_hits'] == 1
+
+
+def test_range_without_hands_left_raises():
+    opponent_range = np.zeros(len(COMBOS))
+    opponent_range[COMBO_INDEXES[48, 49]] = 1.0
+    with pytest.raises(ValueError):
+        EquityCalculator().get_equity((48, 50), [], opponent_range)
@@ -0,0 +1,48 @@
+from itertools import combinations
+
+import pytest
+
+from games.hlpoker.card import NUM_CARDS
+from games.hlpoker.preflop import NUM_CLASSES, PreflopTable, get_class_hands, get_class_name, get_hand_class
+
+"""
+the classes, by name
+"""
+CLASSES = {get_class_name(hand_class): hand_class for hand_class in range(NUM_CLASSES)}
+
+"""
+the table is a Monte Carlo estimate (20000 trials a head-to-head equity), so it is compared to the published equities
+up to this tolerance
+"""
+TOLERANCE = 0.01
+
+
+def test_classes_partition_the_starting_hands():
+    hands = [tuple(sorted(hand)) for hand_class in range(NUM_CLASSES) for hand in get_class_hands(hand_class)]
+    assert sorted(hands) == list(combinations(range(NUM_CARDS), 2))
+    for hand_class in range(NUM_CLASSES):
+        for first, second in get_class_hands(hand_class):
+            assert get_hand_class((first, second)) == hand_class
+            assert get_hand_class((second, first)) == hand_class
+
+
+def test_class_names():
+    assert len(CLASSES) == NUM_CLASSES
+    assert get_hand_class((48, 49)) == CLASSES['AA']
+    assert get_hand_class((48, 44)) == CLASSES['AKs']
+    assert get_hand_class((44, 49)) == CLASSES['AKo']
+    assert get_hand_class((20, 1)) == CLASSES['72o']
+
+
+@pytest.mark.parametrize('name, equity', [('AA', 0.852), ('KK', 0.824), ('AKs', 0.670), ('22', 0.503),
+                                          ('72o', 0.346)])
+def test_equity_against_random_hand(name, equity):
+    assert PreflopTable.get().get_equity(CLASSES[name]) == pytest.approx(equity, abs=TOLERANCE)
+
+
+@pytest.mark.parametrize('name, other_name, equity', [('AA', 'KK', 0.819), ('AKo', 'QQ', 0.430),
+                                                      ('KK', 'AKo', 0.700)])
+def test_head_to_head_equity(name, other_name, equity):
+    table = PreflopTable.get()
+    assert table.get_head_to_head(CLASSES[name], CLASSES[other_name]) == pytest.approx(equity, abs=TOLERANCE)
+    assert table.get_head_to_head(CLASSES[other_name], CLASSES[name]) == pytest.approx(1 - equity, abs=TOLERANCE)
@@ -8,6 +8,9 @@ from games.minesweeper.state import MinesweeperState
 
 class HumanMinesweeperPlayer(MinesweeperPlayer):
 
+    # the actions are ignored
+    SUBSCRIBED_EVENTS = ('event_end_game', 'event_result')
+
     def __init__(self, name):
         super().__init__(name)
 
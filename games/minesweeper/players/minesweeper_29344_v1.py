@@ -5,6 +5,10 @@ from games.minesweeper.state import MinesweeperState
 from games.state import State
 
 class minesweeper_29344_v1(MinesweeperPlayer):
+
+    # the player does nothing with the events of the games
+    SUBSCRIBED_EVENTS = ()
+
     def __init__(self, name):
         super().__init__(name)
         self.simulations = 50
@@ -8,6 +8,9 @@ from games.state import State
 
 class RandomMinesweeperPlayer(MinesweeperPlayer):
 
+    # the player does nothing with the events of the games
+    SUBSCRIBED_EVENTS = ()
+
     def __init__(self, name):
         super().__init__(name)
 
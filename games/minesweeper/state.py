@@ -38,6 +38,11 @@ class MinesweeperState(State):
         self.__mines_hit = [0, 0]
         self.__has_winner = False
 
+        """
+        the read-only copy of the grid given once the state is frozen, built on first use
+        """
+        self.__frozen_grid = None
+
     def __place_mines(self):
         mines = set()
         while len(mines) < self.__num_mines:
@@ -45,7 +50,15 @@ class MinesweeperState(State):
             mines.add(mine)
         return mines
 
+    """
+    gets the grid; a frozen state is shared by several players, so it gives a read-only copy (a tuple of row tuples)
+    instead of its own grid, built once and shared by all the calls
+    """
     def get_grid(self):
+        if self.is_frozen():
+            if self.__frozen_grid is None:
+                self.__frozen_grid = tuple(tuple(row) for row in self.__grid)
+            return self.__frozen_grid
         return self.__grid
 
     def __count_neighbor_mines(self, row, col):
@@ -65,6 +78,7 @@ class MinesweeperState(State):
         return 2
 
     def update(self, action: MinesweeperAction):
+        self.check_mutable("updated")
         row, col = action.get_row(), action.get_col()
         self.__grid_players[row][col] = self.__acting_player
 
@@ -136,18 +150,19 @@ class MinesweeperState(State):
         return self.__acting_player
 
     def clone(self):
-        cloned_state = MinesweeperState(self.__num_rows, self.__num_cols)
+        # the constructor is skipped, it would build empty grids and place new mines only to be overwritten
+        cloned_state = MinesweeperState.__new__(MinesweeperState)
+        State.__init__(cloned_state)
         cloned_state.__num_rows = self.__num_rows
         cloned_state.__num_cols = self.__num_cols
         cloned_state.__num_mines = self.__num_mines
+        cloned_state.__grid = [row.copy() for row in self.__grid]
+        cloned_state.__grid_players = [row.copy() for row in self.__grid_players]
         cloned_state.__mines = self.__mines.copy()
         cloned_state.__acting_player = self.__acting_player
         cloned_state.__mines_hit = self.__mines_hit.copy()
         cloned_state.__has_winner = self.__has_winner
-        for row in range(0, self.__num_rows):
-            for col in range(0, self.__num_cols):
-                cloned_state.__grid[row][col] = self.__grid[row][col]
-                cloned_state.__grid_players[row][col] = self.__grid_players[row][col]
+        cloned_state.__frozen_grid = None
         return cloned_state
 
     def get_result(self, pos):
@@ -5,6 +5,25 @@ from games.state import State
 
 class Player(ABC):
 
+    """
+    By default, the game states given to the player are frozen snapshots shared with the other players, so they must
+    not be changed (use clone() to explore moves): play(), update() and the other methods that change them raise a
+    ValueError, and their grids and action sequences are given as read-only tuples.
+    Players that change the given states must set this to True to get their own mutable copy of each state.
+    """
+    REQUIRES_MUTABLE_STATE = False
+
+    """
+    The events a simulator can notify the player of
+    """
+    EVENTS = ('event_new_game', 'event_action', 'event_result', 'event_end_game')
+
+    """
+    The events the player consumes, among Player.EVENTS. The simulator never notifies the player of the other ones,
+    so the players whose event methods do nothing should only list the events they need.
+    """
+    SUBSCRIBED_EVENTS = EVENTS
+
     """
     :param name: name of the player (simply a text identifier for the player)
     """
@@ -35,6 +54,13 @@ class Player(ABC):
     def set_current_pos(self, new_pos):
         self.__current_pos = new_pos
 
+    """
+    retrieves the events the player consumes
+    """
+    @classmethod
+    def get_subscribed_events(cls) -> frozenset:
+        return frozenset(cls.SUBSCRIBED_EVENTS)
+
     """
     prints to the console the stats of the player
     """
@@ -0,0 +1,183 @@
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from array import array
+
+
+class ResultLog:
+    """
+    Stores the results of all games of a simulator in a compact columnar form: one array of scores per seat and one
+    array with the index of the seat permutation used in each game. The name of the player in each seat is recovered
+    from the permutation, so no per-game dictionaries are kept.
+
+    Once the log grows past the spill threshold, the columns are moved to files (one per column) and read back through
+    memory maps, so long runs keep a flat memory footprint. The files hold raw native-endian values and can be analysed
+    later, e.g. with numpy.memmap(path, dtype='f8') for the seat files and dtype='u2' for the permutation file. The
+    games still in memory are only written by flush(), so the simulators flush their log once a pairing is over.
+
+    The scores are stored as floats, but they are read back as ints as long as every score appended was an int, so
+    the results keep the type the games gave them.
+    """
+
+    SCORE_TYPE = 'd'
+    PERMUTATION_TYPE = 'H'
+
+    """
+    :param permutations: the names of the players by seat, for each seat permutation
+    :param spill_threshold: number of games kept in memory before the columns are moved to files (None to never spill)
+    :param spill_dir: directory for the column files (a temporary directory removed with the log if not given)
+    """
+    def __init__(self, permutations: list, spill_threshold: int = None, spill_dir: str = None):
+        self.__permutations = [list(names) for names in permutations]
+        self.__num_seats = len(self.__permutations[0])
+        self.__spill_threshold = spill_threshold
+        self.__spill_dir = spill_dir
+
+        # games that were not written to the column files yet
+        self.__scores = [array(ResultLog.SCORE_TYPE) for _ in range(self.__num_seats)]
+        self.__permutation_indexes = array(ResultLog.PERMUTATION_TYPE)
+
+        # number of games already written to the column files
+        self.__num_spilled = 0
+        self.__paths = None
+
+        # whether all the scores are ints, given back as such
+        self.__integer_scores = True
+
+    def __len__(self):
+        return self.__num_spilled + len(self.__permutation_indexes)
+
+    """
+    stores the result of a game
+    :param permutation: the index of the seat permutation of the game
+    :param seat_scores: the score of each seat
+    """
+    def append(self, permutation: int, seat_scores: list):
+        self.__permutation_indexes.append(permutation)
+        for seat in range(self.__num_seats):
+            self.__scores[seat].append(seat_scores[seat])
+            if not isinstance(seat_scores[seat], int):
+                self.__integer_scores = False
+
+        if self.__spill_threshold is not None and len(self.__permutation_indexes) >= self.__spill_threshold:
+            self.flush()
+
+    """
+    appends all the games of another log with the same seat permutations
+    """
+    def extend(self, other):
+        assert self.__permutations == other.__permutations, "Can only extend a log with the same seat permutations"
+        permutation_indexes, scores = other.get_columns()
+        self.__integer_scores = self.__integer_scores and other.__integer_scores
+        self.__permutation_indexes.extend(permutation_indexes)
+        for seat in range(self.__num_seats):
+            self.__scores[seat].extend(scores[seat])
+
+        if self.__spill_threshold is not None and len(self.__permutation_indexes) >= self.__spill_threshold:
+            self.flush()
+
+    """
+    writes the games kept in memory to the column files (a log without a spill threshold keeps all its games in memory)
+    """
+    def flush(self):
+        if self.__spill_threshold is None or len(self.__permutation_indexes) == 0:
+            return
+
+        if self.__paths is None:
+            self.__create_files()
+
+        columns = [self.__permutation_indexes] + self.__scores
+        for path, column in zip(self.__paths, columns):
+            with open(path, 'ab') as file:
+                column.tofile(file)
+
+        self.__num_spilled += len(self.__permutation_indexes)
+        self.__scores = [array(ResultLog.SCORE_TYPE) for _ in range(self.__num_seats)]
+        self.__permutation_indexes = array(ResultLog.PERMUTATION_TYPE)
+
+    def __create_files(self):
+        if self.__spill_dir is None:
+            directory = tempfile.mkdtemp(prefix='results-')
+            weakref.finalize(self, shutil.rmtree, directory, True)
+        else:
+            directory = self.__spill_dir
+            os.makedirs(directory, exist_ok=True)
+
+        self.__paths = [os.path.join(directory, 'permutation.u2')] + \
+                       [os.path.join(directory, f'seat{seat}.f8') for seat in range(self.__num_seats)]
+
+        # start from empty files, a previous run may have used the same directory (each log of a run gets its own)
+        for path in self.__paths:
+            open(path, 'wb').close()
+
+    """
+    gets the paths of the column files (permutation first, then one per seat), or None if the log never spilled
+    """
+    def get_paths(self):
+        return None if self.__paths is None else list(self.__paths)
+
+    """
+    gets the whole log as in-memory arrays: (permutation indexes, [scores of each seat])
+    """
+    def get_columns(self):
+        permutation_indexes = array(ResultLog.PERMUTATION_TYPE)
+        scores = [array(ResultLog.SCORE_TYPE) for _ in range(self.__num_seats)]
+
+        if self.__num_spilled > 0:
+            with open(self.__paths[0], 'rb') as file:
+                permutation_indexes.fromfile(file, self.__num_spilled)
+            for seat in range(self.__num_seats):
+                with open(self.__paths[seat + 1], 'rb') as file:
+                    scores[seat].fromfile(file, self.__num_spilled)
+
+        permutation_indexes.extend(self.__permutation_indexes)
+        for seat in range(self.__num_seats):
+            scores[seat].extend(self.__scores[seat])
+        return permutation_indexes, scores
+
+    def __iter_spilled(self):
+        files = [open(path, 'rb') for path in self.__paths]
+        maps = [mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) for file in files]
+        views = [memoryview(maps[0]).cast(ResultLog.PERMUTATION_TYPE)] + \
+                [memoryview(seat_map).cast(ResultLog.SCORE_TYPE) for seat_map in maps[1:]]
+        try:
+            permutation_indexes, scores = views[0], views[1:]
+            for game in range(self.__num_spilled):
+                yield permutation_indexes[game], [seat_scores[game] for seat_scores in scores]
+        finally:
+            # the views must be released before the maps can be closed
+            for view in views:
+                view.release()
+            for seat_map in maps:
+                seat_map.close()
+            for file in files:
+                file.close()
+
+    def __iter_columns(self):
+        if self.__num_spilled > 0:
+            yield from self.__iter_spilled()
+        for game in range(len(self.__permutation_indexes)):
+            yield self.__permutation_indexes[game], [seat_scores[game] for seat_scores in self.__scores]
+
+    """
+    lazily iterates over the results of all games as {player name: score} dictionaries
+    """
+    def __iter__(self):
+        for permutation, seat_scores in self.__iter_columns():
+            if self.__integer_scores:
+                seat_scores = [int(score) for score in seat_scores]
+            yield dict(zip(self.__permutations[permutation], seat_scores))
+
+    # the column files belong to this log, so a pickled log (e.g. sent back by a worker) carries its values instead
+    # and spills to a temporary directory of its own if needed
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        permutation_indexes, scores = self.get_columns()
+        state['_ResultLog__permutation_indexes'] = permutation_indexes
+        state['_ResultLog__scores'] = scores
+        state['_ResultLog__num_spilled'] = 0
+        state['_ResultLog__paths'] = None
+        state['_ResultLog__spill_dir'] = None
+        return state
@@ -3,6 +3,12 @@ from abc import ABC, abstractmethod
 
 class State(ABC):
 
+    def __init__(self):
+        """
+        a frozen state is a read-only snapshot that may be shared by several players
+        """
+        self.__frozen = False
+
     """
     Retrieve the number of players
     """
@@ -53,17 +59,41 @@ class State(ABC):
     :returns: True if the action ends up being performed
     """
     def play(self, action) -> bool:
+        self.check_mutable("played")
         if not self.validate_action(action):
             return False
         self.update(action)
         return True
 
     """
-    copies the current game state
+    copies the current game state. The copy is never frozen
     """
     def clone(self):
         pass
 
+    """
+    Turns the state into a read-only snapshot, after which play(), update() and every other method that changes the
+    state are rejected
+    :returns: the state itself
+    """
+    def freeze(self):
+        self.__frozen = True
+        return self
+
+    """
+    Returns true if the state is a read-only snapshot
+    """
+    def is_frozen(self) -> bool:
+        return self.__frozen
+
+    """
+    Raises an error if the state is a read-only snapshot; called first by every method that changes the state
+    :param operation: what was done to the state, for the error message
+    """
+    def check_mutable(self, operation: str = "changed"):
+        if self.__frozen:
+            raise ValueError(f"A frozen state can't be {operation}, use clone() to get a mutable copy")
+
     """
     Retrieves the game result for a player in a given position
     :param pos: position of the player in the game [0, num_players[
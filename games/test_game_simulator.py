@@ -0,0 +1,46 @@
+import random
+import statistics
+
+import pytest
+
+from games.hlpoker.players.always_call import AlwaysCallHLPokerPlayer
+from games.hlpoker.players.random import RandomHLPokerPlayer
+from games.hlpoker.simulator import HLPokerSimulator
+
+
+"""
+creates a simulator of a random player against a player that always calls, and plays a number of games with it
+"""
+def play(num_games):
+    simulator = HLPokerSimulator([RandomHLPokerPlayer('a'), AlwaysCallHLPokerPlayer('b')])
+    for _ in range(num_games):
+        simulator.run_simulation()
+        simulator.change_player_positions()
+    return simulator
+
+
+def test_merged_chunks_match_a_single_pass():
+    random.seed(0)
+    simulator = play(30)
+    for num_games in (0, 1, 45, 12):
+        simulator.merge_results(play(num_games))
+
+    results = list(simulator.get_results())
+    stats = simulator.get_score_stats()
+    assert simulator.get_num_games() == len(results) == 88
+    for name in ('a', 'b'):
+        scores = [result[name] for result in results]
+        assert stats[name]['samples'] == 88
+        assert stats[name]['total'] == sum(scores)
+        assert stats[name]['mean'] == pytest.approx(statistics.fmean(scores))
+        assert stats[name]['variance'] == pytest.approx(statistics.variance(scores))
+        assert stats[name]['stderr'] == pytest.approx((statistics.variance(scores) / 88) ** 0.5)
+
+
+def test_merge_into_an_empty_simulator():
+    random.seed(1)
+    simulator = play(0)
+    chunk = play(20)
+    simulator.merge_results(chunk)
+    assert simulator.get_score_stats() == chunk.get_score_stats()
+    assert list(simulator.get_results()) == list(chunk.get_results())
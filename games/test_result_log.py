@@ -0,0 +1,68 @@
+import os
+import pickle
+
+import numpy as np
+
+from games.result_log import ResultLog
+
+"""
+the seat permutations of a two player game
+"""
+PERMUTATIONS = [['a', 'b'], ['b', 'a']]
+
+
+"""
+fills a log with games of alternating seat permutations
+"""
+def fill(log, num_games, integer_scores=True):
+    for game in range(num_games):
+        score = game % 5 - 2
+        if not integer_scores:
+            score /= 2
+        log.append(game % 2, [score, -score])
+    return log
+
+
+def test_spilled_files_match_results(tmp_path):
+    log = fill(ResultLog(PERMUTATIONS, 4, str(tmp_path)), 10)
+    log.flush()
+    assert len(log) == 10
+
+    paths = log.get_paths()
+    assert [os.path.basename(path) for path in paths] == ['permutation.u2', 'seat0.f8', 'seat1.f8']
+    permutation_indexes = np.fromfile(paths[0], dtype='u2')
+    seat_scores = [np.fromfile(path, dtype='f8') for path in paths[1:]]
+    assert len(permutation_indexes) == 10
+
+    reloaded = [dict(zip(PERMUTATIONS[permutation], [scores[game] for scores in seat_scores]))
+                for game, permutation in enumerate(permutation_indexes)]
+    assert reloaded == list(log)
+
+
+def test_flush_without_spill_threshold_keeps_games_in_memory():
+    log = fill(ResultLog(PERMUTATIONS), 10)
+    log.flush()
+    assert log.get_paths() is None
+    assert len(log) == 10
+
+
+def test_scores_keep_their_type(tmp_path):
+    results = list(fill(ResultLog(PERMUTATIONS, 3, str(tmp_path / 'ints')), 7))
+    assert all(type(score) is int for result in results for score in result.values())
+    assert results[0] == {'a': -2, 'b': 2}
+
+    results = list(fill(ResultLog(PERMUTATIONS, 3, str(tmp_path / 'floats')), 7, integer_scores=False))
+    assert all(type(score) is float for result in results for score in result.values())
+    assert results[0] == {'a': -1.0, 'b': 1.0}
+
+
+def test_extend_and_pickle_keep_all_games(tmp_path):
+    log = fill(ResultLog(PERMUTATIONS, 4, str(tmp_path)), 6)
+    other = fill(ResultLog(PERMUTATIONS, 4), 5)
+    expected = list(log) + list(other)
+
+    log.extend(other)
+    assert list(log) == expected
+    copy = pickle.loads(pickle.dumps(log))
+    assert copy.get_paths() is None
+    assert list(copy) == expected
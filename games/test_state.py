@@ -0,0 +1,69 @@
+import pytest
+
+from games.connect4.action import Connect4Action
+from games.connect4.bitboard_state import Connect4BitboardState
+from games.connect4.state import Connect4State
+from games.hlpoker.action import HLPokerAction
+from games.hlpoker.card import CARDS
+from games.hlpoker.state import HLPokerState
+from games.minesweeper.action import MinesweeperAction
+from games.minesweeper.state import MinesweeperState
+
+
+@pytest.mark.parametrize('state_type', [Connect4State, Connect4BitboardState])
+def test_frozen_connect4_state_rejects_changes(state_type):
+    state = state_type()
+    state.update(Connect4Action(3))
+    snapshot = state.clone().freeze()
+
+    with pytest.raises(ValueError):
+        snapshot.play(Connect4Action(3))
+    with pytest.raises(ValueError):
+        snapshot.update(Connect4Action(3))
+    with pytest.raises(ValueError):
+        snapshot.adjudicate(None)
+
+    grid = snapshot.get_grid()
+    assert grid is snapshot.get_grid()
+    assert grid == tuple(tuple(row) for row in state.get_grid())
+    assert not snapshot.is_finished()
+
+    # a clone of a snapshot is mutable again
+    copy = snapshot.clone()
+    copy.update(Connect4Action(3))
+    assert copy.get_grid()[-2][3] == 1
+    assert snapshot.get_grid()[-2][3] == Connect4State.EMPTY_CELL
+
+
+def test_frozen_minesweeper_state_rejects_changes():
+    snapshot = MinesweeperState().freeze()
+    with pytest.raises(ValueError):
+        snapshot.update(MinesweeperAction(0, 0))
+    assert snapshot.get_grid() is snapshot.get_grid()
+
+    copy = snapshot.clone()
+    copy.update(MinesweeperAction(0, 0))
+    assert copy.get_grid()[0][0] != MinesweeperState.EMPTY_CELL
+    assert snapshot.get_grid()[0][0] == MinesweeperState.EMPTY_CELL
+
+
+def test_frozen_hlpoker_state_rejects_changes():
+    state = HLPokerState(2)
+    state.update(HLPokerAction.CALL)
+    snapshot = state.clone().freeze()
+    with pytest.raises(ValueError):
+        snapshot.update(HLPokerAction.RAISE)
+    with pytest.raises(ValueError):
+        snapshot.compute_results([0, 1], [2, 3], [4, 5, 6, 7, 8])
+    assert snapshot.get_sequence() is snapshot.get_sequence()
+    assert snapshot.get_sequence() == (HLPokerAction.CALL,)
+
+
+def test_hlpoker_results_accept_cards_and_ids():
+    for cards in [CARDS[48:50], CARDS[44:46], CARDS[0:5]], [[48, 49], [44, 45], [0, 1, 2, 3, 4]]:
+        state = HLPokerState(2)
+        while not state.is_showdown():
+            state.update(HLPokerAction.CALL)
+        # the aces kick higher than the kings on a board of four twos
+        state.compute_results(*cards)
+        assert state.get_result(0) > 0 > state.get_result(1)
@@ -1,49 +1,295 @@
 import argparse
+import ast
+import inspect
 import itertools
+import math
+import os
+import random
 from collections import namedtuple, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 
 from constants import AVAILABLE_GAME_TYPES, AVAILABLE_PLAYER_TYPES
+from ratings import BradleyTerryRatings
+
+"""
+maximum number of iterations played to break the tie of a pairing whose simulator groups games (see run_tie_break)
+"""
+MAX_GROUPED_TIE_BREAK_ITERATIONS = 1000
 
 def run_simulation(game_settings):
     removed_players = []
 
-    while len(game_settings['players']) > 1:
-        scores = defaultdict(int)
-        match_results = defaultdict(dict)
+    # a single pool is shared by all elimination rounds, so workers are only spawned once
+    executor = ProcessPoolExecutor(max_workers=game_settings['workers']) if game_settings['workers'] > 1 else None
 
-        for player1, player2 in itertools.combinations(game_settings['players'], 2):
-            simulator = game_settings['game']([player1, player2])
-            print(f"Simulation: {player1.get_name()} VS {player2.get_name()}")
+    # the simulators of the pairings already played, reused by the next elimination rounds
+    results_cache = {} if game_settings['reuse_results'] else None
 
-            names = {player1.get_name(): player1, player2.get_name(): player2}
+    try:
+        if game_settings['tournament'] == 'ratings':
+            run_rating_tournament(game_settings, executor)
+            return
 
-            # Run initial iterations with progress bar
-            for _ in tqdm(range(game_settings['num_iterations']), desc="Running iterations"):
-                run_game_iteration(simulator, game_settings['seat_permutation'])
+        while len(game_settings['players']) > 1:
+            scores = defaultdict(int)
+            match_results = defaultdict(dict)
 
-            # Run additional iterations if there's a draw
-            while check_draw(simulator):
-                run_game_iteration(simulator, game_settings['seat_permutation'])
+            pairings = list(itertools.combinations(game_settings['players'], 2))
+            for player1, player2, simulator in run_pairings(game_settings, pairings, executor, results_cache):
+                names = {player1.get_name(): player1, player2.get_name(): player2}
 
-            update_scores(scores, simulator, names)
+                update_scores(scores, simulator, names)
 
-            # Update match results for cross table
-            update_match_results(match_results, simulator, player1, player2)
+                # Update match results for cross table
+                update_match_results(match_results, simulator, player1, player2)
 
-            simulator.print_stats()
+                simulator.print_stats()
 
-        # Print cross table and leaderboard before removing a player
-        print_cross_table(match_results)
-        print_leaderboard(scores)
+            # Print cross table and leaderboard before removing a player
+            print_cross_table(match_results)
+            print_leaderboard(scores)
 
-        removed_player = remove_worst_player(game_settings['players'], scores)
-        removed_players.insert(0, removed_player)
+            removed_player = remove_worst_player(game_settings['players'], scores, match_results)
+            removed_players.insert(0, removed_player)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     last_remaining_player = game_settings['players'][0]
     removed_players.insert(0, last_remaining_player)
     print_leaderboard(removed_players, final=True)
 
+"""
+Runs a tournament that keeps Bradley-Terry ratings of the players and spends the game budget, in batches of
+iterations, on the neighbours in the ranking whose order is the least certain instead of playing every pairing.
+It stops once the budget is spent or the order of all neighbours is settled with the given confidence.
+"""
+def run_rating_tournament(game_settings, executor=None):
+    players = {player.get_name(): player for player in game_settings['players']}
+    ratings = BradleyTerryRatings(list(players))
+    batch_settings = dict(game_settings, num_iterations=game_settings['rating_batch'])
+    budget = game_settings['rating_budget'] or game_settings['num_iterations'] * len(players)
+
+    # the first round chains all players, so the ratings of all players are connected
+    names = list(players)
+    pairings = list(zip(names, names[1:]))
+    played_iterations = 0
+    rating_round = 1
+
+    while len(pairings) > 0 and played_iterations < budget:
+        print(f"Rating round {rating_round}: " + ", ".join(f"{name1} VS {name2}" for name1, name2 in pairings))
+        player_pairings = [(players[name1], players[name2]) for name1, name2 in pairings]
+        for player1, player2, simulator in run_pairings(batch_settings, player_pairings, executor, print_headers=False):
+            wins, draws, losses = count_outcomes(simulator, player1)
+            ratings.add_games(player1.get_name(), player2.get_name(), wins, draws, losses)
+            # the sequential test may have settled the pairing before the end of the batch
+            games_per_iteration = simulator.num_players() if game_settings['seat_permutation'] else 1
+            played_iterations += simulator.get_num_games() // games_per_iteration
+        rating_round += 1
+
+        ratings.fit()
+        pairings = ratings.select_pairings(game_settings['rating_pairings'] or max(len(players) // 2, 1),
+                                           game_settings['rating_confidence'])
+
+    print(f"Played {played_iterations} of {budget} iterations")
+    print_rating_leaderboard(players, ratings, game_settings['rating_confidence'])
+
+"""
+Counts the games won, drawn and lost by a player in a simulator
+"""
+def count_outcomes(simulator, player):
+    wins = draws = losses = 0
+    for result in simulator.get_results():
+        score = result[player.get_name()]
+        if score > 0:
+            wins += 1
+        elif score < 0:
+            losses += 1
+        else:
+            draws += 1
+    return wins, draws, losses
+
+"""
+Runs every pairing and yields (player1, player2, simulator) in the same order as the given pairings, with all their
+results written to the result files if they spill to files.
+Pairings found in the results cache reuse the simulator of an earlier round and only play the top-up iterations.
+Without an executor the pairings run one after another in this process, with a progress bar per pairing.
+With an executor the iterations of each pairing are split in chunks (a single chunk per pairing unless a chunk size
+is set) and all the chunks are queued in the pool, so idle workers keep picking up the remaining chunks of any pairing.
+The chunks are merged back in order and the stats are only printed once all pairings are done, so the output does not
+depend on the completion order.
+"""
+def run_pairings(game_settings, pairings, executor=None, results_cache=None, print_headers=True):
+    simulators = []
+    iterations = []
+    headers = []
+    for player1, player2 in pairings:
+        key = get_pairing_key(player1, player2)
+        header = f"Simulation: {player1.get_name()} VS {player2.get_name()}"
+        if results_cache is not None and key in results_cache:
+            simulators.append(results_cache[key])
+            # a pairing already settled by the sequential test doesn't need more iterations
+            iterations.append(0 if is_settled(game_settings, simulators[-1]) else game_settings['top_up_iterations'])
+            headers.append(header + " (reused results)")
+        else:
+            simulators.append(create_simulator(game_settings, player1, player2))
+            iterations.append(game_settings['num_iterations'])
+            headers.append(header)
+            if results_cache is not None:
+                results_cache[key] = simulators[-1]
+
+    if executor is None:
+        for (player1, player2), simulator, num_iterations, header in zip(pairings, simulators, iterations, headers):
+            if print_headers:
+                print(header)
+            run_iterations(game_settings, simulator, num_iterations)
+            simulator.flush_results()
+            if game_settings['player_stats']:
+                print_player_stats(simulator.get_players())
+            yield player1, player2, simulator
+        return
+
+    # the players list is not needed by the workers, each task gets its own copy of both players
+    worker_settings = {key: value for key, value in game_settings.items() if key != 'players'}
+
+    futures = {}
+    chunks = []
+    # the players of the merged chunks, whose stats are printed with their pairing
+    chunk_players = [[] for _ in pairings]
+    for index, ((player1, player2), num_iterations) in enumerate(zip(pairings, iterations)):
+        # with the sequential test, the pairings are split in chunks so they can stop early
+        chunk_size = game_settings['chunk_size'] or \
+            (game_settings['sprt_min_iterations'] if game_settings['sprt'] else max(num_iterations, 1))
+        starts = range(0, num_iterations, chunk_size)
+        chunks.append([None] * len(starts))
+        for chunk, start in enumerate(starts):
+            chunk_iterations = min(chunk_size, num_iterations - start)
+            # every chunk gets its own random seed, drawn here so the streams only depend on the parent's state
+            future = executor.submit(run_chunk, worker_settings, player1, player2, chunk_iterations,
+                                     random.getrandbits(64))
+            futures[future] = (index, chunk, chunk_iterations)
+
+    # the chunks of each pairing are merged in order as soon as they are available,
+    # and the remaining chunks of a pairing are cancelled once the sequential test settles it
+    merged_chunks = [0] * len(pairings)
+    settled = [False] * len(pairings)
+    with tqdm(total=sum(iterations), desc="Running iterations") as progress:
+        for future in as_completed(futures):
+            index, chunk, chunk_iterations = futures[future]
+            progress.update(chunk_iterations)
+            if settled[index]:
+                continue
+
+            chunks[index][chunk] = future.result()
+            player1, player2 = pairings[index]
+            progress.set_postfix_str(f"{player1.get_name()} VS {player2.get_name()}")
+
+            while merged_chunks[index] < len(chunks[index]) and chunks[index][merged_chunks[index]] is not None:
+                simulators[index].merge_results(chunks[index][merged_chunks[index]])
+                if game_settings['player_stats']:
+                    chunk_players[index].append(chunks[index][merged_chunks[index]].get_players())
+                chunks[index][merged_chunks[index]] = None
+                merged_chunks[index] += 1
+                if is_settled(game_settings, simulators[index]):
+                    settled[index] = True
+                    for other_future, (other_index, _, _) in futures.items():
+                        if other_index == index:
+                            other_future.cancel()
+                    break
+
+    for (player1, player2), simulator, header, merged_players in zip(pairings, simulators, headers, chunk_players):
+        if print_headers:
+            print(header)
+        run_tie_break(game_settings, simulator)
+        simulator.flush_results()
+        for players in merged_players:
+            print_player_stats(players)
+        yield player1, player2, simulator
+
+"""
+Prints the stats of the players of a simulator (see Player.print_stats), such as the search stats of the connect 4
+players. Without workers the players of the pairings are the players of the tournament, so their stats add up over all
+their pairings so far; with workers each chunk plays with its own copies of the players, which print their own stats.
+"""
+def print_player_stats(players):
+    for player in players:
+        player.print_stats()
+
+"""
+Gets the key of a pairing in the results cache, which doesn't depend on the order of the players
+"""
+def get_pairing_key(player1, player2):
+    return frozenset((player1.get_name(), player2.get_name()))
+
+"""
+Plays a number of iterations of a pairing in this process, followed by the tie-break iterations.
+With the sequential test the iterations stop as soon as the pairing is settled.
+"""
+def run_iterations(game_settings, simulator, num_iterations):
+    # Run initial iterations with progress bar
+    for _ in tqdm(range(num_iterations), desc="Running iterations", disable=num_iterations == 0):
+        if is_settled(game_settings, simulator):
+            break
+        run_game_iteration(simulator, game_settings['seat_permutation'])
+
+    run_tie_break(game_settings, simulator)
+
+"""
+Plays additional iterations of a pairing while it is a draw.
+With the sequential test the number of iterations is already capped, so an undecided pairing is kept as it is.
+The rating tournament counts draws as such, so it never breaks ties either.
+Simulators that group games (e.g. the duplicate deals of hlpoker) play at most MAX_GROUPED_TIE_BREAK_ITERATIONS more
+groups: their groups cancel out exactly between players that always play the same way, so the tie might never break.
+A pairing still tied after them is recorded as a draw, and remove_worst_player resolves the tie if it has to.
+"""
+def run_tie_break(game_settings, simulator):
+    if game_settings['sprt'] or game_settings['tournament'] == 'ratings':
+        return
+    if not simulator.groups_games():
+        while check_draw(simulator):
+            run_game_iteration(simulator, game_settings['seat_permutation'])
+        return
+
+    for _ in range(MAX_GROUPED_TIE_BREAK_ITERATIONS):
+        if not check_draw(simulator):
+            return
+        run_game_iteration(simulator, game_settings['seat_permutation'])
+    if check_draw(simulator):
+        names = " VS ".join(player.get_name() for player in simulator.get_players())
+        print(f"{names} is still a draw after {MAX_GROUPED_TIE_BREAK_ITERATIONS} tie-break iterations, "
+              f"recorded as a draw")
+
+"""
+Plays a chunk of iterations of a pairing in a worker process and returns the simulator holding its results
+"""
+def run_chunk(game_settings, player1, player2, num_iterations, seed):
+    random.seed(seed)
+    # the chunk results are sent back to the parent, only the parent's simulator writes to the results directory
+    simulator = create_simulator(game_settings, player1, player2, results_dir=False)
+    for _ in range(num_iterations):
+        run_game_iteration(simulator, game_settings['seat_permutation'])
+    return simulator
+
+"""
+Creates the simulator of a pairing with the game options, and its results spilled to disk if set in the game settings.
+Each simulator of a pairing created during a run (a rating batch, or an elimination round without --reuse-results)
+gets a directory of its own: <NAME1>-vs-<NAME2> for the first one, then <NAME1>-vs-<NAME2>-2 and so on.
+"""
+def create_simulator(game_settings, player1, player2, results_dir=True):
+    simulator = game_settings['game']([player1, player2], **game_settings['game_options'])
+    simulator.set_seat_permutation(game_settings['seat_permutation'])
+    if game_settings['results_spill'] > 0:
+        directory = None
+        if results_dir and game_settings['results_dir'] is not None:
+            name = f"{player1.get_name()}-vs-{player2.get_name()}"
+            game_settings['results_batches'][name] += 1
+            if game_settings['results_batches'][name] > 1:
+                name += f"-{game_settings['results_batches'][name]}"
+            directory = os.path.join(game_settings['results_dir'], name)
+        simulator.set_results_spill(game_settings['results_spill'], directory)
+    return simulator
+
 def run_game_iteration(simulator, seat_permutation):
     simulator.run_simulation()
     if seat_permutation:
@@ -58,15 +304,63 @@ def check_draw(simulator):
         return True  # It's a draw
     return False  # Not a draw
 
+"""
+Wald's sequential probability ratio test on the scores of the first player, with a normal model where the
+standard deviation is estimated from the samples played so far (games, or groups of games for simulators that group
+them, e.g. the duplicate deals of hlpoker):
+    - H0, the second player is better: mean score = -effect * standard deviation
+    - H1, the first player is better: mean score = effect * standard deviation
+Returns 1 once H1 is accepted, -1 once H0 is accepted and 0 while the test is undecided.
+"""
+def get_sprt_decision(game_settings, simulator):
+    stats = simulator.get_score_stats()[simulator.get_players()[0].get_name()]
+    games_per_iteration = simulator.num_players() if game_settings['seat_permutation'] else 1
+    if stats['games'] < game_settings['sprt_min_iterations'] * games_per_iteration or stats['mean'] == 0:
+        return 0
+
+    # all games with the same (non-zero) score leave no doubt about the winner
+    if stats['variance'] == 0:
+        return 1 if stats['mean'] > 0 else -1
+
+    # the log-likelihood ratio of H1 over H0 and its bounds (with the same error rate for both hypotheses)
+    log_likelihood_ratio = \
+        2 * game_settings['sprt_effect'] * stats['samples'] * stats['mean'] / stats['variance'] ** 0.5
+    bound = math.log((1 - game_settings['sprt_alpha']) / game_settings['sprt_alpha'])
+    if log_likelihood_ratio >= bound:
+        return 1
+    if log_likelihood_ratio <= -bound:
+        return -1
+    return 0
+
+"""
+Checks if the sequential test (when enabled) already settled the winner of a pairing
+"""
+def is_settled(game_settings, simulator):
+    return game_settings['sprt'] and get_sprt_decision(game_settings, simulator) != 0
+
 def update_scores(scores, simulator, names):
     # Update global scores for each player
     global_scores = simulator.get_global_score()
     for player_name, score in global_scores.items():
         scores[names[player_name]] += score
 
-def remove_worst_player(players, scores):
-    # Find the player with the lowest score
-    lowest_score_player = min(players, key=lambda player: scores[player])
+"""
+Removes the player with the lowest score. A tie for the lowest score (e.g. a pairing of duplicate deals that stayed a
+draw) is resolved explicitly, so it doesn't depend on the order of the players: the tied player with the lowest score
+in the games against the other tied players is removed, then the first one by name
+"""
+def remove_worst_player(players, scores, match_results):
+    lowest_score = min(scores[player] for player in players)
+    tied_players = [player for player in players if scores[player] == lowest_score]
+    tied_names = {player.get_name() for player in tied_players}
+    tied_scores = {player: sum(score for opponent, score in match_results[player.get_name()].items()
+                               if opponent in tied_names)
+                   for player in tied_players}
+
+    lowest_score_player = min(tied_players, key=lambda player: (tied_scores[player], player.get_name()))
+    if len(tied_players) > 1:
+        print(f"{', '.join(sorted(tied_names))} are tied with a score of {lowest_score}, "
+              f"{lowest_score_player.get_name()} is removed")
     players.remove(lowest_score_player)
     return lowest_score_player
 
@@ -100,6 +394,28 @@ def print_leaderboard(players, final=False):
 
     print("=" * 60 + "\n")
 
+def print_rating_leaderboard(players, ratings, confidence):
+    print("\n" + "=" * 60)
+    print("{:^40}".format("Rating Leaderboard"))
+    print("=" * 60)
+
+    for position, name in enumerate(ratings.get_ranking(), start=1):
+        player = players[name]
+        print("{:2}. {:<40} {:>5.0f} ± {:<4.0f}".format(position, f"{name} ({player.__class__.__name__})",
+                                                       ratings.get_rating(name),
+                                                       ratings.get_confidence_interval(name, confidence)))
+
+    print("=" * 60 + "\n")
+
+"""
+Reads the value of a game or player option as a python literal, or as a string if it is not one
+"""
+def parse_option_value(value):
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
 def main():
     # Define a namedtuple for a Player
     Player = namedtuple('Player', ['name', 'type'])
@@ -118,12 +434,140 @@ def main():
     parser.add_argument('--num-iterations', type=int, default=10000,
                         help='Number of iterations in the simulation. Defaults to 10000.')
 
+    # Number of worker processes (default: 1)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes used to run pairings in parallel. 0 uses all cores. Defaults to 1.')
+
+    # Number of iterations per chunk (default: 0, a single chunk per pairing)
+    parser.add_argument('--chunk-size', type=int, default=0,
+                        help='Split the iterations of each pairing in chunks of this size, run by any idle worker. '
+                             'Only used with more than one worker. Defaults to 0 (a single chunk per pairing).')
+
+    # Number of game results kept in memory per pairing (default: 0, never spill)
+    parser.add_argument('--results-spill', type=int, default=0,
+                        help='Move the game results of a pairing to memory-mapped files once it holds this many games. '
+                             'Defaults to 0 (results are always kept in memory).')
+
+    # Directory for the spilled game results (default: temporary directory)
+    parser.add_argument('--results-dir', default=None,
+                        help='Directory where the spilled game results of each pairing are kept for later analysis. '
+                             'Defaults to a temporary directory removed at the end of the run.')
+
+    # Print the stats of the players after each pairing (default: False)
+    parser.add_argument('--player-stats', action=argparse.BooleanOptionalAction, default=False,
+                        help='Print the stats of the players (e.g. nodes per second, cutoffs and playouts per second '
+                             'of the connect 4 players) after each pairing. Defaults to False.')
+
+    # Reuse the results of pairings across elimination rounds (default: False)
+    parser.add_argument('--reuse-results', action=argparse.BooleanOptionalAction, default=False,
+                        help='Reuse the results of each pairing in the next elimination rounds instead of playing it '
+                             'again. Defaults to False.')
+
+    # Number of iterations added to reused pairings (default: 0)
+    parser.add_argument('--top-up-iterations', type=int, default=0,
+                        help='Number of iterations played again by a reused pairing in each new elimination round. '
+                             'Defaults to 0.')
+
+    # Tournament format (default: elimination)
+    parser.add_argument('--tournament', choices=['elimination', 'ratings'], default='elimination',
+                        help='Tournament format: elimination plays every pairing and removes the worst player in each '
+                             'round, ratings spends the game budget on the pairings that most reduce the uncertainty '
+                             'of a Bradley-Terry ranking. Defaults to elimination.')
+
+    # Game budget of the rating tournament (default: 0, the number of iterations times the number of players)
+    parser.add_argument('--rating-budget', type=int, default=0,
+                        help='Total number of iterations of the rating tournament. Defaults to 0 (the number of '
+                             'iterations times the number of players).')
+
+    # Iterations per scheduled pairing of the rating tournament (default: 100)
+    parser.add_argument('--rating-batch', type=int, default=100,
+                        help='Number of iterations played by each pairing scheduled by the rating tournament. '
+                             'Defaults to 100.')
+
+    # Pairings per round of the rating tournament (default: 0, half the number of players)
+    parser.add_argument('--rating-pairings', type=int, default=0,
+                        help='Maximum number of pairings scheduled in each round of the rating tournament. '
+                             'Defaults to 0 (half the number of players).')
+
+    # Confidence of the ratings (default: 0.95)
+    parser.add_argument('--rating-confidence', type=float, default=0.95,
+                        help='Confidence level of the rating intervals. The rating tournament stops once all '
+                             'neighbours in the ranking are separated at this level. Defaults to 0.95.')
+
+    # Sequential probability ratio test (default: False)
+    parser.add_argument('--sprt', action='store_true', default=False,
+                        help='Stop each pairing as soon as a sequential probability ratio test settles the winner. '
+                             'The number of iterations becomes the maximum per pairing. Defaults to False.')
+
+    # Error rate of the sequential test (default: 0.05)
+    parser.add_argument('--sprt-alpha', type=float, default=0.05,
+                        help='Probability of the sequential test picking the wrong winner. Defaults to 0.05.')
+
+    # Effect size of the sequential test (default: 0.1)
+    parser.add_argument('--sprt-effect', type=float, default=0.1,
+                        help='Smallest difference in mean score per game, in standard deviations, that the sequential '
+                             'test tells apart. Defaults to 0.1.')
+
+    # Minimum number of iterations before the sequential test may stop a pairing (default: 50)
+    parser.add_argument('--sprt-min-iterations', type=int, default=50,
+                        help='Minimum number of iterations before the sequential test can stop a pairing. '
+                             'Defaults to 50.')
+
+    # Options of the game simulator
+    parser.add_argument('--game-option', action='append', nargs=2, metavar=('NAME', 'VALUE'), default=[],
+                        help='Set an option of the game simulator, e.g. --game-option bitboard True for connect4. '
+                             'The value is read as a python literal, or as a string if it is not one. With '
+                             '--game-option duplicate True for hlpoker, a tied pairing plays at most '
+                             f'{MAX_GROUPED_TIE_BREAK_ITERATIONS} tie-break iterations, as two players that always '
+                             'play the same way tie every deck.')
+
+    # Options of the players
+    parser.add_argument('--player-option', action='append', nargs=3, metavar=('PLAYER', 'NAME', 'VALUE'), default=[],
+                        help='Set an option of a player, by the player name, e.g. --player-option A time_budget 0.5. '
+                             'The value is read as a python literal, or as a string if it is not one.')
+
     # Player argument. This should be specified at least twice.
     parser.add_argument('--player', action='append', nargs=2, metavar=('NAME', 'TYPE'),
                         help='Add a player with a name and type. Requires two values. This option should be specified at least twice.')
 
     args = parser.parse_args()
 
+    if args.workers < 0:
+        parser.error('The number of workers must be 0 or over.')
+
+    if args.chunk_size < 0:
+        parser.error('The chunk size must be 0 or over.')
+
+    if args.top_up_iterations < 0:
+        parser.error('The number of top-up iterations must be 0 or over.')
+
+    if args.rating_budget < 0:
+        parser.error('The rating budget must be 0 or over.')
+
+    if args.rating_batch < 1:
+        parser.error('The rating batch must be 1 or over.')
+
+    if args.rating_pairings < 0:
+        parser.error('The number of rating pairings must be 0 or over.')
+
+    if not 0 < args.rating_confidence < 1:
+        parser.error('The rating confidence must be between 0 and 1.')
+
+    if not 0 < args.sprt_alpha < 0.5:
+        parser.error('The sequential test error rate must be between 0 and 0.5.')
+
+    if args.sprt_effect <= 0:
+        parser.error('The sequential test effect size must be over 0.')
+
+    if args.sprt_min_iterations < 1:
+        parser.error('The minimum number of iterations of the sequential test must be 1 or over.')
+
+    if args.results_spill < 0:
+        parser.error('The results spill threshold must be 0 or over.')
+
+    if args.results_dir is not None and args.results_spill == 0:
+        parser.error('--results-dir requires --results-spill.')
+
     # Check if at least two players are provided
     if args.player is None or len(args.player) < 2:
         parser.error('At least two --player arguments are required.')
@@ -134,6 +578,22 @@ def main():
     except KeyError:
         parser.error(f"No player types available for the game '{args.game}'.")
 
+    # Parse the game options, which must be parameters of the simulator of the game
+    game_type = AVAILABLE_GAME_TYPES[args.game]
+    game_parameters = inspect.signature(game_type.__init__).parameters
+    game_options = {}
+    for name, value in args.game_option:
+        if name not in game_parameters or name in ('self', 'players'):
+            parser.error(f"Game '{args.game}' has no option '{name}'.")
+        game_options[name] = parse_option_value(value)
+
+    player_names = {name for name, _ in args.player}
+    player_options = defaultdict(dict)
+    for player_name, name, value in args.player_option:
+        if player_name not in player_names:
+            parser.error(f"Option '{name}' set for unknown player '{player_name}'.")
+        player_options[player_name][name] = parse_option_value(value)
+
     used_names = set()
 
     players = []
@@ -153,14 +613,39 @@ def main():
         if player_class is None:
             parser.error(f"Player type '{type_name}' is not available for game '{args.game}'.")
 
+        # Parse the player options, which must be parameters of the player class
+        player_parameters = inspect.signature(player_class.__init__).parameters
+        for option in player_options[name]:
+            if option not in player_parameters or option in ('self', 'name'):
+                parser.error(f"Player type '{type_name}' has no option '{option}'.")
+
         # Create a new player instance
-        players.append(player_class(name))
+        players.append(player_class(name, **player_options[name]))
 
     # Your logic to build the object with these arguments
     game_settings = {
-        'game': AVAILABLE_GAME_TYPES[args.game],
+        'game': game_type,
+        'game_options': game_options,
         'seat_permutation': args.seat_permutation,
         'num_iterations': args.num_iterations,
+        'workers': args.workers or os.cpu_count(),
+        'chunk_size': args.chunk_size,
+        'results_spill': args.results_spill,
+        'results_dir': args.results_dir,
+        # the number of result directories of each pairing created so far, shared by all rounds and batches
+        'results_batches': defaultdict(int),
+        'reuse_results': args.reuse_results,
+        'player_stats': args.player_stats,
+        'top_up_iterations': args.top_up_iterations,
+        'tournament': args.tournament,
+        'rating_budget': args.rating_budget,
+        'rating_batch': args.rating_batch,
+        'rating_pairings': args.rating_pairings,
+        'rating_confidence': args.rating_confidence,
+        'sprt': args.sprt,
+        'sprt_alpha': args.sprt_alpha,
+        'sprt_effect': args.sprt_effect,
+        'sprt_min_iterations': args.sprt_min_iterations,
         'players': players
     }
 
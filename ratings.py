@@ -0,0 +1,160 @@
+import math
+from collections import defaultdict
+from statistics import NormalDist
+
+
+class BradleyTerryRatings:
+    """
+    Bradley-Terry ratings of a pool of players, fitted from the outcome of the games between them.
+    Every player also gets a few virtual draws against a reference player of rating 0, which keeps the ratings finite
+    for players that won or lost all their games.
+    Ratings and their uncertainty are reported in Elo points, relative to the average of the pool.
+    """
+
+    INITIAL_RATING = 1500
+    ELO_SCALE = 400 / math.log(10)
+    PRIOR_GAMES = 2
+
+    def __init__(self, names: list):
+        self.__names = list(names)
+        self.__index = {name: i for i, name in enumerate(self.__names)}
+
+        """
+        points won by each player against each opponent (a draw is worth half a point) and number of games
+        """
+        self.__points = defaultdict(float)
+        self.__games = defaultdict(float)
+
+        """
+        strength (log of the Bradley-Terry parameter) and covariance of the strengths, updated by fit()
+        """
+        self.__strengths = [0.0] * len(self.__names)
+        self.__covariance = [[0.0] * len(self.__names) for _ in self.__names]
+        self.fit()
+
+    """
+    adds the outcome of some games between two players
+    :param wins: games won by the first player
+    :param draws: games drawn
+    :param losses: games lost by the first player
+    """
+    def add_games(self, name1, name2, wins: int, draws: int, losses: int):
+        i, j = self.__index[name1], self.__index[name2]
+        self.__points[(i, j)] += wins + draws / 2
+        self.__points[(j, i)] += losses + draws / 2
+        self.__games[(i, j)] += wins + draws + losses
+        self.__games[(j, i)] += wins + draws + losses
+
+    """
+    fits the ratings with the minorization-maximization algorithm (Hunter, 2004) and updates their covariance
+    """
+    def fit(self, max_iterations: int = 1000, tolerance: float = 1e-9):
+        num_players = len(self.__names)
+        gammas = [math.exp(strength) for strength in self.__strengths]
+
+        for _ in range(max_iterations):
+            max_change = 0.0
+            for i in range(num_players):
+                # the virtual draws against the reference player, whose gamma is 1
+                points = BradleyTerryRatings.PRIOR_GAMES / 2
+                denominator = BradleyTerryRatings.PRIOR_GAMES / (gammas[i] + 1)
+                for j in range(num_players):
+                    games = self.__games[(i, j)]
+                    if games > 0:
+                        points += self.__points[(i, j)]
+                        denominator += games / (gammas[i] + gammas[j])
+                new_gamma = points / denominator
+                max_change = max(max_change, abs(math.log(new_gamma / gammas[i])))
+                gammas[i] = new_gamma
+            if max_change < tolerance:
+                break
+
+        self.__strengths = [math.log(gamma) for gamma in gammas]
+        self.__covariance = BradleyTerryRatings.__invert(self.__get_information())
+
+    # the Fisher information matrix of the strengths
+    def __get_information(self):
+        num_players = len(self.__names)
+        information = [[0.0] * num_players for _ in range(num_players)]
+        for i in range(num_players):
+            # the virtual draws against the reference player
+            p = BradleyTerryRatings.__win_probability(self.__strengths[i], 0.0)
+            information[i][i] += BradleyTerryRatings.PRIOR_GAMES * p * (1 - p)
+            for j in range(num_players):
+                games = self.__games[(i, j)]
+                if i != j and games > 0:
+                    p = BradleyTerryRatings.__win_probability(self.__strengths[i], self.__strengths[j])
+                    information[i][i] += games * p * (1 - p)
+                    information[i][j] -= games * p * (1 - p)
+        return information
+
+    @staticmethod
+    def __win_probability(strength1, strength2):
+        return 1 / (1 + math.exp(strength2 - strength1))
+
+    # inverts a (positive definite) matrix with Gauss-Jordan elimination
+    @staticmethod
+    def __invert(matrix):
+        size = len(matrix)
+        augmented = [row.copy() + [1.0 if i == j else 0.0 for j in range(size)] for i, row in enumerate(matrix)]
+        for col in range(size):
+            pivot = max(range(col, size), key=lambda row: abs(augmented[row][col]))
+            augmented[col], augmented[pivot] = augmented[pivot], augmented[col]
+            pivot_value = augmented[col][col]
+            augmented[col] = [value / pivot_value for value in augmented[col]]
+            for row in range(size):
+                if row != col and augmented[row][col] != 0:
+                    factor = augmented[row][col]
+                    augmented[row] = [value - factor * pivot for value, pivot in zip(augmented[row], augmented[col])]
+        return [row[size:] for row in augmented]
+
+    """
+    gets the rating of a player, in Elo points
+    """
+    def get_rating(self, name):
+        average = sum(self.__strengths) / len(self.__strengths)
+        strength = self.__strengths[self.__index[name]] - average
+        return BradleyTerryRatings.INITIAL_RATING + BradleyTerryRatings.ELO_SCALE * strength
+
+    """
+    gets the half-width of the confidence interval of the rating of a player, in Elo points
+    """
+    def get_confidence_interval(self, name, confidence: float = 0.95):
+        # variance of the strength minus the average strength of the pool
+        i = self.__index[name]
+        num_players = len(self.__names)
+        row_sum = sum(self.__covariance[i])
+        total_sum = sum(sum(row) for row in self.__covariance)
+        variance = self.__covariance[i][i] - 2 * row_sum / num_players + total_sum / num_players ** 2
+
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return z * BradleyTerryRatings.ELO_SCALE * max(variance, 0.0) ** 0.5
+
+    """
+    gets how many standard deviations apart the strengths of two players are.
+    Low values mean the order between both players is still uncertain.
+    """
+    def get_separation(self, name1, name2):
+        i, j = self.__index[name1], self.__index[name2]
+        variance = self.__covariance[i][i] + self.__covariance[j][j] - 2 * self.__covariance[i][j]
+        return abs(self.__strengths[i] - self.__strengths[j]) / max(variance, 1e-12) ** 0.5
+
+    """
+    gets the names of the players, from the highest to the lowest rating
+    """
+    def get_ranking(self):
+        return sorted(self.__names, key=lambda name: self.__strengths[self.__index[name]], reverse=True)
+
+    """
+    selects the pairings that most reduce the uncertainty of the ranking: the neighbours in the ranking whose order is
+    the least certain, skipping the ones that are already separated with the given confidence
+    :param max_pairings: maximum number of pairings to select
+    :returns: list of (name1, name2), empty once the whole ranking is settled
+    """
+    def select_pairings(self, max_pairings: int, confidence: float = 0.95):
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        ranking = self.get_ranking()
+        neighbours = [(self.get_separation(name1, name2), name1, name2)
+                      for name1, name2 in zip(ranking, ranking[1:])]
+        neighbours = sorted(neighbour for neighbour in neighbours if neighbour[0] < z)
+        return [(name1, name2) for _, name1, name2 in neighbours[:max_pairings]]
@@ -0,0 +1,124 @@
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from games.hlpoker.players.always_call import AlwaysCallHLPokerPlayer
+from games.hlpoker.players.always_fold import AlwaysFoldHLPokerPlayer
+from games.hlpoker.players.always_raise import AlwaysRaiseHLPokerPlayer
+from games.hlpoker.players.random import RandomHLPokerPlayer
+from games.hlpoker.simulator import HLPokerSimulator
+from main import MAX_GROUPED_TIE_BREAK_ITERATIONS, get_sprt_decision, remove_worst_player, run_pairings
+
+"""
+gets the settings of a run of hlpoker between a random player and a player that always calls, with the defaults of
+main() for the settings not given
+"""
+def get_game_settings(**settings):
+    game_settings = {
+        'game': HLPokerSimulator,
+        'game_options': {},
+        'seat_permutation': True,
+        'num_iterations': 100,
+        'workers': 1,
+        'chunk_size': 0,
+        'results_spill': 0,
+        'results_dir': None,
+        'results_batches': defaultdict(int),
+        'reuse_results': False,
+        'player_stats': False,
+        'top_up_iterations': 0,
+        'tournament': 'elimination',
+        'rating_budget': 0,
+        'rating_batch': 100,
+        'rating_pairings': 0,
+        'rating_confidence': 0.95,
+        'sprt': False,
+        'sprt_alpha': 0.05,
+        'sprt_effect': 0.1,
+        'sprt_min_iterations': 50,
+        'players': [RandomHLPokerPlayer('a'), AlwaysCallHLPokerPlayer('b')]
+    }
+    game_settings.update(settings)
+    return game_settings
+
+
+"""
+reads the results spilled to a directory back, as {player name: score} dictionaries
+"""
+def read_results(directory, names):
+    permutation_indexes = np.fromfile(os.path.join(directory, 'permutation.u2'), dtype='u2')
+    seat_scores = [np.fromfile(os.path.join(directory, f'seat{seat}.f8'), dtype='f8') for seat in range(len(names))]
+    permutations = [names, names[::-1]]
+    return [dict(zip(permutations[permutation], [scores[game] for scores in seat_scores]))
+            for game, permutation in enumerate(permutation_indexes)]
+
+
+def test_pairing_results_are_all_written(tmp_path):
+    game_settings = get_game_settings(num_iterations=150, results_spill=100, results_dir=str(tmp_path))
+    player1, player2 = game_settings['players']
+    for _player1, _player2, simulator in run_pairings(game_settings, [(player1, player2)], print_headers=False):
+        assert simulator.get_num_games() >= 300
+        assert read_results(str(tmp_path / 'a-vs-b'), ['a', 'b']) == list(simulator.get_results())
+
+
+def test_pairings_played_again_write_to_new_directories(tmp_path):
+    game_settings = get_game_settings(num_iterations=10, results_spill=100, results_dir=str(tmp_path))
+    player1, player2 = game_settings['players']
+    simulators = []
+    for _ in range(2):
+        for _player1, _player2, simulator in run_pairings(game_settings, [(player1, player2)], print_headers=False):
+            simulators.append(simulator)
+
+    assert sorted(os.listdir(tmp_path)) == ['a-vs-b', 'a-vs-b-2']
+    assert read_results(str(tmp_path / 'a-vs-b'), ['a', 'b']) == list(simulators[0].get_results())
+    assert read_results(str(tmp_path / 'a-vs-b-2'), ['a', 'b']) == list(simulators[1].get_results())
+
+
+def test_tied_duplicate_pairing_stops_tie_break():
+    # two players that always call tie every deck
+    players = [AlwaysCallHLPokerPlayer('a'), AlwaysCallHLPokerPlayer('b')]
+    game_settings = get_game_settings(num_iterations=5, game_options={'duplicate': True}, players=players)
+    for _player1, _player2, simulator in run_pairings(game_settings, [tuple(players)], print_headers=False):
+        assert simulator.get_global_score() == {'a': 0, 'b': 0}
+        assert simulator.get_num_games() == 2 * (5 + MAX_GROUPED_TIE_BREAK_ITERATIONS)
+
+
+def test_tied_players_are_removed_by_head_to_head_then_name():
+    players = [AlwaysCallHLPokerPlayer(name) for name in 'bac']
+    scores = {players[0]: 0, players[1]: 0, players[2]: 5}
+    match_results = {'a': {'b': 0, 'c': -5}, 'b': {'a': 0, 'c': 5}, 'c': {'a': 5, 'b': -5}}
+    assert remove_worst_player(list(players), scores, match_results).get_name() == 'a'
+    assert remove_worst_player(list(reversed(players)), scores, match_results).get_name() == 'a'
+
+    match_results = {'a': {'b': 1, 'c': -6}, 'b': {'a': -1, 'c': 6}, 'c': {'a': 6, 'b': -6}}
+    assert remove_worst_player(list(players), scores, match_results).get_name() == 'b'
+
+
+def test_duplicate_without_seat_permutation_samples_every_game():
+    simulator = HLPokerSimulator([RandomHLPokerPlayer('a'), AlwaysCallHLPokerPlayer('b')], duplicate=True)
+    simulator.set_seat_permutation(False)
+    for _ in range(10):
+        simulator.run_simulation()
+    assert simulator.get_score_stats()['a']['samples'] == 10
+    assert not simulator.groups_games()
+
+
+def test_sprt_stops_a_one_sided_pairing_early():
+    # a player that always raises wins most hands against one that always folds
+    players = [AlwaysRaiseHLPokerPlayer('a'), AlwaysFoldHLPokerPlayer('b')]
+    game_settings = get_game_settings(num_iterations=1000, sprt=True, players=players)
+    for pairing, decision in ((players, 1), (players[::-1], -1)):
+        for _player1, _player2, simulator in run_pairings(game_settings, [tuple(pairing)], print_headers=False):
+            assert get_sprt_decision(game_settings, simulator) == decision
+            assert simulator.get_num_games() == 2 * game_settings['sprt_min_iterations']
+
+
+def test_sprt_waits_for_the_minimum_iterations():
+    simulator = HLPokerSimulator([AlwaysRaiseHLPokerPlayer('a'), AlwaysFoldHLPokerPlayer('b')])
+    game_settings = get_game_settings(sprt=True)
+    for _ in range(game_settings['sprt_min_iterations'] - 1):
+        simulator.run_simulation()
+        simulator.change_player_positions()
+        simulator.run_simulation()
+    assert get_sprt_decision(game_settings, simulator) == 0
@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+from ratings import BradleyTerryRatings
+
+"""
+the Elo ratings of the players of the tests, relative to their average
+"""
+ELO_RATINGS = {'a': 300, 'b': 100, 'c': -50, 'd': -350}
+
+
+"""
+adds the expected outcome of a number of games between every two players, given their Elo ratings
+"""
+def add_expected_games(ratings, elo_ratings, num_games):
+    names = list(elo_ratings)
+    for i, name1 in enumerate(names):
+        for name2 in names[i + 1:]:
+            p = 1 / (1 + 10 ** ((elo_ratings[name2] - elo_ratings[name1]) / 400))
+            ratings.add_games(name1, name2, round(num_games * p), 0, num_games - round(num_games * p))
+
+
+def test_fit_recovers_known_ratings():
+    ratings = BradleyTerryRatings(list(ELO_RATINGS))
+    add_expected_games(ratings, ELO_RATINGS, 100000)
+    ratings.fit()
+    assert ratings.get_ranking() == ['a', 'b', 'c', 'd']
+    for name, elo_rating in ELO_RATINGS.items():
+        # the virtual draws pull the ratings slightly towards the average
+        assert ratings.get_rating(name) == pytest.approx(BradleyTerryRatings.INITIAL_RATING + elo_rating, abs=2)
+        assert ratings.get_confidence_interval(name) < 10
+
+
+def test_more_games_narrow_the_confidence_intervals():
+    few, many = BradleyTerryRatings(list(ELO_RATINGS)), BradleyTerryRatings(list(ELO_RATINGS))
+    add_expected_games(few, ELO_RATINGS, 100)
+    add_expected_games(many, ELO_RATINGS, 10000)
+    few.fit()
+    many.fit()
+    for name in ELO_RATINGS:
+        # the interval shrinks with the square root of the number of games
+        assert many.get_confidence_interval(name) == pytest.approx(few.get_confidence_interval(name) / 10, rel=0.1)
+    assert many.get_separation('b', 'c') > few.get_separation('b', 'c')
+
+
+def test_unplayed_pool_is_unsettled():
+    ratings = BradleyTerryRatings(['a', 'b', 'c'])
+    assert all(ratings.get_rating(name) == BradleyTerryRatings.INITIAL_RATING for name in 'abc')
+    assert len(ratings.select_pairings(5)) == 2
+
+    # players that won or lost every game still get finite ratings
+    ratings.add_games('a', 'b', 10, 0, 0)
+    ratings.fit()
+    assert math.isfinite(ratings.get_rating('b'))
+    assert ratings.get_rating('a') > ratings.get_rating('c') > ratings.get_rating('b')